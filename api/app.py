@@ -1,13 +1,41 @@
-from fastapi import FastAPI, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Optional
+from pydantic import BaseModel, Field
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional, Tuple
+import base64
+import binascii
+import hashlib
+import html
+import json
 import sqlite3
 import os
+import time
+import unicodedata
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성. 없으면 표준 json으로 직렬화한다
+    orjson = None
+
+from .cache import TTLCache
+from .db_pool import ConnectionPool
+from .executor import BoundedExecutor, Overloaded
+from .ingest_csv import ensure_db, table_exists
+from . import metrics
+from .metrics import SlowQueryLog, logger, phase
+from .fuzzy import FuzzyIndexHolder
+from .normalize import search_form
+from .suggest import SuggestIndexHolder
 
 APP_DIR = os.path.dirname(os.path.abspath(__file__))
-DB_PATH = os.path.join(APP_DIR, "books.db")
+DB_PATH = os.getenv("BOOKS_DB_PATH", os.path.join(APP_DIR, "books.db"))
+
+# orjson이 있으면 모든 JSON 응답을 orjson으로 직렬화한다 (표준 json보다 수 배 빠름)
+FastJSONResponse = ORJSONResponse if orjson is not None else JSONResponse
 
-app = FastAPI(title="Book Search API", version="1.0.0")
+app = FastAPI(title="Book Search API", version="1.0.0", default_response_class=FastJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -17,78 +45,892 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-def get_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+# trigram 토크나이저는 3글자 미만 검색어를 색인으로 찾을 수 없다. 두 글자 검색어는 바이그램 색인(books_bigram)으로 찾는다
+FTS_MIN_TERM_LENGTH = 3
+BIGRAM_TERM_LENGTH = 2
+
+# bm25 컬럼 가중치: title, author, publisher, description, search_key
+BM25_WEIGHTS = "10.0, 5.0, 2.0, 1.0, 4.0"
+
+# /search 가 돌려줄 수 있는 도서 필드 (fields= 로 고른다. id는 항상 포함)
+SEARCH_FIELDS = ("id", "title", "author", "publisher", "category", "publish_date", "description")
+
+# snippet=true 일 때 설명 발췌 길이(글자 수, trigram 토큰 하나가 대략 한 글자)와 강조 표시.
+# 발췌는 HTML로 그려지므로 본문은 이스케이프하고 강조 태그만 그대로 둔다
+SNIPPET_LENGTH = 64
+SNIPPET_MARK = ("<mark>", "</mark>")
+SNIPPET_ELLIPSIS = "…"
+# FTS5 snippet()이 강조 위치에 넣는 자리 표시 문자 (사용자 영역 문자). 이스케이프한 뒤 SNIPPET_MARK로 바꾼다
+SNIPPET_SENTINEL = ("\ue000", "\ue001")
+
+# count=estimate 일 때 이 건수까지만 세고 "N+" 로 표시한다
+COUNT_ESTIMATE_CAP = 1000
+
+
+# 캐시 키에는 항상 DB의 data_version이 들어가므로 재적재 후에는 이전 항목이 자연히 쓰이지 않는다
+# (data_version, 정규화된 검색어, 카테고리) → 정확한 전체 건수. 같은 검색의 페이지 이동 시 다시 세지 않는다
+count_cache = TTLCache(maxsize=2048, ttl=300)
+# (data_version, 검색 조건) → /search 응답
+search_cache = TTLCache(
+    maxsize=int(os.getenv("SEARCH_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("SEARCH_CACHE_TTL", "300")),
+)
+# 브라우저/CDN이 응답을 재사용할 수 있는 시간(초)
+SEARCH_CACHE_MAX_AGE = int(os.getenv("SEARCH_CACHE_MAX_AGE", "60"))
+
+# /suggest 자동완성 색인 (data_version이 바뀌면 다시 만든다. 설명만 바뀐 description_version은 보지 않는다)
+# 색인이 이미 있으면 다시 만드는 일은 풀 밖의 연결로 백그라운드에서 한다 (db_pool은 아래에서 만든다)
+suggest_index = SuggestIndexHolder(connect=lambda: db_pool.connect_unpooled())
+# 결과가 없을 때 오타를 고쳐 다시 찾는 어휘 색인. 교정에 쓰는 시간 한도(ms), 0이면 끔
+fuzzy_index = FuzzyIndexHolder(connect=lambda: db_pool.connect_unpooled())
+FUZZY_BUDGET_MS = float(os.getenv("FUZZY_BUDGET_MS", "30"))
+
+
+# 하이브리드 검색: 어휘/벡터 후보를 각각 이만큼 가져와 RRF로 합친다
+HYBRID_CANDIDATES = int(os.getenv("HYBRID_CANDIDATES", "100"))
+# 하이브리드 검색으로 넘겨볼 수 있는 최대 결과 수 (page * size). 넘으면 400 (후보 조회량의 상한)
+HYBRID_MAX_RESULTS = int(os.getenv("HYBRID_MAX_RESULTS", "500"))
+RRF_K = 60
+# 벡터 검색이 이 시간(ms) 안에 끝나지 않으면 어휘 검색 결과만 돌려준다
+HYBRID_VECTOR_BUDGET_MS = int(os.getenv("HYBRID_VECTOR_BUDGET_MS", "300"))
+# POST /semantic-search/batch 한 번에 받을 수 있는 질의 수
+SEMANTIC_BATCH_MAX_QUERIES = int(os.getenv("SEMANTIC_BATCH_MAX_QUERIES", "10000"))
+# 벡터 검색 전용 스레드 (요청 스레드가 어휘 검색을 하는 동안 병렬로 실행). 실행·대기 중인 벡터 검색이
+# VECTOR_MAX_PENDING개를 넘으면 새로 넣지 않고 어휘 결과만 돌려준다 (늦은 작업이 쌓여 모든 요청이 한도를 넘지 않게)
+VECTOR_SEARCH_WORKERS = int(os.getenv("VECTOR_SEARCH_WORKERS", "4"))
+vector_executor = BoundedExecutor(
+    max_workers=VECTOR_SEARCH_WORKERS,
+    max_pending=int(os.getenv("VECTOR_MAX_PENDING", str(VECTOR_SEARCH_WORKERS * 2))),
+    thread_name_prefix="vector-search",
+)
+
+
+db_pool = ConnectionPool(
+    DB_PATH,
+    max_size=int(os.getenv("DB_POOL_SIZE", "8")),
+    mmap_size=int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    cache_size_kb=int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024))),
+    # 1이면 읽기 연결을 immutable로 연다 (잠금/변경 감지 없음, 재적재를 보려면 재시작해야 함)
+    immutable=os.getenv("SQLITE_IMMUTABLE", "0").lower() in ("1", "true", "yes"),
+)
+
+# /search 조회 전용 스레드. 풀 연결 수만큼 동시에 실행하고, 대기까지 포함해 SEARCH_MAX_PENDING개를 넘으면 503
+search_executor = BoundedExecutor(
+    max_workers=int(os.getenv("SEARCH_WORKERS", os.getenv("DB_POOL_SIZE", "8"))),
+    max_pending=int(os.getenv("SEARCH_MAX_PENDING", "64")),
+)
+
+
+# 이 시간(ms) 이상 걸린 조회는 EXPLAIN QUERY PLAN과 함께 SLOW_QUERY_LOG 파일(JSON lines)에 남긴다 (0이면 끔)
+slow_query_log = SlowQueryLog(
+    path=os.getenv("SLOW_QUERY_LOG") or None,
+    threshold_ms=float(os.getenv("SLOW_QUERY_MS", "200")),
+)
+
+
+# 기동 단계별 소요 시간(초). /health 에서 확인할 수 있다
+startup_report = {}
+
+# 기동 시 임베딩 모델을 미리 읽고 더미 인코딩까지 마쳐 첫 시맨틱 검색 요청이 멈추지 않게 한다
+SEMANTIC_WARMUP = os.getenv("SEMANTIC_WARMUP", "0").lower() in ("1", "true", "yes")
+
+
+@app.middleware("http")
+async def timing_middleware(request: Request, call_next):
+    """요청별 단계 시간을 Server-Timing 헤더로 보내고 지연 시간 히스토그램에 기록한다"""
+    started = time.perf_counter()
+    timings, token = metrics.start_request()
+    try:
+        response = await call_next(request)
+    finally:
+        metrics.end_request(token)
+    total = time.perf_counter() - started
+    response.headers["Server-Timing"] = timings.server_timing(total)
+    # 경로 대신 라우트 템플릿을 레이블로 써서 시계열 수가 늘어나지 않게 한다
+    route = request.scope.get("route")
+    metrics.REQUEST_DURATION.observe(
+        total, method=request.method, path=getattr(route, "path", "unmatched"), status=response.status_code
+    )
+    return response
+
+
+def preload(warm_up_model: bool = True) -> None:
+    """스키마 적용, 자동완성 색인, 임베딩 모델 로드. 멀티 프로세스 실행기(api/serve.py)는 fork 전에 호출한다
+
+    startup_report는 매번 새로 채워 마지막 preload에서 실제로 한 일만 담는다.
+    """
+    startup_report.clear()
+    started = time.perf_counter()
+    # FTS 색인 등 스키마를 최신 상태로 맞춘다 (이미 적용된 경우 아무 작업도 하지 않음)
+    if os.path.exists(DB_PATH):
+        ensure_db(DB_PATH)
+        db_pool.enable_wal()
+        if db_pool.immutable:
+            db_pool.checkpoint_wal()
+        db_pool.warmup(int(os.getenv("DB_POOL_WARMUP", "2")))
+    startup_report["database_seconds"] = round(time.perf_counter() - started, 3)
+
+    if os.path.exists(DB_PATH):
+        with db_pool.connection() as conn:
+            data_version = get_catalog_version(conn)
+            # 다시 preload 할 때 data_version이 그대로면 색인을 재사용하므로 새로 만든 경우에만 시간을 기록한다
+            previous = suggest_index.index
+            index = suggest_index.get(conn, data_version, wait=True)
+            if index is not previous:
+                startup_report["suggest_index_seconds"] = round(index.build_seconds, 3)
+            if FUZZY_BUDGET_MS > 0:
+                previous = fuzzy_index.index
+                index = fuzzy_index.get(conn, data_version, wait=True)
+                if index is not previous:
+                    startup_report["fuzzy_index_seconds"] = round(index.build_seconds, 3)
+
+    if SEMANTIC_WARMUP:
+        from .semantic_search import get_search_engine
+
+        engine = get_search_engine(warm_up=warm_up_model)
+        startup_report["model_load_seconds"] = round(engine.load_seconds, 3)
+        if engine.warmup_seconds is not None:
+            startup_report["model_warmup_seconds"] = round(engine.warmup_seconds, 3)
+
+    startup_report["total_seconds"] = round(time.perf_counter() - started, 3)
+    print(f"Startup complete: {startup_report}")
+
+
+@app.on_event("startup")
+def startup():
+    # 같은 프로세스에서 앱이 다시 시작되면(테스트, --reload) 이전 shutdown에서 닫은 스레드 풀을 새로 연다
+    search_executor.start()
+    vector_executor.start()
+    # api/serve.py 마스터가 fork 전에 preload()를 마쳤으면 app.state.preloaded가 켜져 있다
+    if not getattr(app.state, "preloaded", False):
+        preload()
+        return
+    # fork 전에 preload()를 마친 워커: 연결은 fork 뒤에 새로 만들고, 모델 워밍업(추론 스레드 생성)도 여기서 한다
+    if os.path.exists(DB_PATH):
+        db_pool.warmup(int(os.getenv("DB_POOL_WARMUP", "2")))
+    if SEMANTIC_WARMUP:
+        from .semantic_search import get_search_engine
+
+        get_search_engine(warm_up=True)
+    print(f"Worker {os.getpid()} ready")
+
+
+@app.on_event("shutdown")
+def shutdown():
+    search_executor.shutdown()
+    db_pool.close()
+    vector_executor.shutdown()
+
+
+def is_bigram_term(term: str) -> bool:
+    """바이그램 색인으로 찾을 수 있는 두 글자 단어 (문장 부호가 섞이면 토큰이 달라지므로 제외)"""
+    return len(term) == BIGRAM_TERM_LENGTH and term.isalnum()
+
+
+def build_fts_query(q: str) -> Optional[str]:
+    """검색어 중 3글자 이상인 단어를 FTS5 MATCH 식으로 변환. 그런 단어가 없으면 None
+
+    단어별 일치(AND) 또는 정규화 검색 키(search_key) 일치. 검색 키 쪽은 띄어쓰기·문장 부호를 지운 질의로
+    찾으므로 "파이썬프로그래밍" 과 "파이썬 프로그래밍", "Karunatilaka, Shehan" 과 "Shehan Karunatilaka",
+    초성 입력이 서로 일치한다. 짧은 단어는 run_search가 이 후보 안에서 따로 거른다.
+    """
+    terms = [term for term in q.split() if len(term) >= FTS_MIN_TERM_LENGTH]
+    if not terms:
+        return None
+    # 각 단어를 문구로 감싸 특수문자를 무력화하고, 공백으로 이어 AND 조건으로 만든다
+    match = " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+    key = search_form(q)
+    if len(key) >= FTS_MIN_TERM_LENGTH:
+        match = f'({match}) OR (search_key : "{key}")'
+    return match
+
+
+def build_bigram_query(q: str) -> Optional[str]:
+    """두 글자 단어를 books_bigram MATCH 식(토큰별 AND)으로 변환. 그런 단어가 없으면 None"""
+    terms = [term.lower() for term in q.split() if is_bigram_term(term)]
+    if not terms:
+        return None
+    return " ".join(f'"{term}"' for term in dict.fromkeys(terms))
+
+
+def sort_key(sort: str, rank_sql: Optional[str]) -> Tuple[str, bool]:
+    """sort 모드별 (정렬 키 SQL, 내림차순 여부). 동순위는 항상 books.id로 구분한다"""
+    if sort == "title":
+        return "books.title COLLATE NOCASE", False
+    if sort == "author":
+        return "books.author COLLATE NOCASE", False
+    if sort == "relevance" and rank_sql:
+        return rank_sql, False
+    # date, 그리고 검색어가 없거나 색인을 쓸 수 없는 relevance는 최신순
+    return "books.publish_date", True
+
+
+def encode_cursor(sort: str, key, book_id: int) -> str:
+    payload = json.dumps({"s": sort, "k": key, "id": book_id}, ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[object, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        key, book_id = payload["k"], int(payload["id"])
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="잘못된 cursor 값입니다")
+    if payload.get("s") != sort:
+        raise HTTPException(status_code=400, detail="cursor가 현재 정렬 기준과 맞지 않습니다")
+    return key, book_id
+
+
+def normalize_query(q: Optional[str]) -> str:
+    """NFC 정규화(자모가 풀린 입력을 음절로)와 공백 접기"""
+    return " ".join(unicodedata.normalize("NFC", q or "").split())
+
+
+def category_filter(category: str) -> Tuple[str, str]:
+    """카테고리 조건 (컬럼, 값). 숫자 1자리는 KDC 주류, 2자리는 강목, 그 외는 청구기호 전체 일치"""
+    category = category.strip()
+    if category.isdigit() and len(category) == 1:
+        return "kdc_class", category
+    if category.isdigit() and len(category) == 2:
+        return "kdc_division", category
+    return "category", category
+
+
+def parse_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """fields= 값("title,author")을 SEARCH_FIELDS 순서의 컬럼 목록으로 바꾼다. 생략하면 전체"""
+    if not fields:
+        return SEARCH_FIELDS
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(SEARCH_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"알 수 없는 필드입니다: {', '.join(sorted(unknown))}")
+    return tuple(f for f in SEARCH_FIELDS if f == "id" or f in requested)
+
+
+def make_snippet(text: Optional[str], terms: List[str], length: int = SNIPPET_LENGTH) -> Optional[str]:
+    """FTS5 snippet()과 같은 모양의 발췌. 첫 일치 위치 주변 length 글자를 자르고 검색어를 강조한다 (HTML 이스케이프)"""
+    if not text:
+        return None
+    lowered = text.lower()
+    terms = [t.lower() for t in terms if t]
+    hits = [i for i in (lowered.find(t) for t in terms) if i >= 0]
+    start = max(min(hits) - length // 4, 0) if hits else 0
+    end = min(start + length, len(text))
+    excerpt = text[start:end]
+
+    if terms:
+        # 긴 검색어부터 찾아 겹치는 강조를 피한다
+        marked, pos = [], 0
+        lowered_excerpt = excerpt.lower()
+        ordered = sorted(set(terms), key=len, reverse=True)
+        plain_start = 0
+        while pos < len(excerpt):
+            term = next((t for t in ordered if lowered_excerpt.startswith(t, pos)), None)
+            if term:
+                marked.append(html.escape(excerpt[plain_start:pos]))
+                marked.append(SNIPPET_MARK[0] + html.escape(excerpt[pos:pos + len(term)]) + SNIPPET_MARK[1])
+                pos += len(term)
+                plain_start = pos
+            else:
+                pos += 1
+        marked.append(html.escape(excerpt[plain_start:]))
+        excerpt = "".join(marked)
+    else:
+        excerpt = html.escape(excerpt)
+    return (SNIPPET_ELLIPSIS if start > 0 else "") + excerpt + (SNIPPET_ELLIPSIS if end < len(text) else "")
+
+
+def render_fts_snippet(snippet: Optional[str]) -> Optional[str]:
+    """FTS5 snippet() 결과(자리 표시 문자로 강조)를 이스케이프한 HTML로 바꾼다"""
+    if not snippet:
+        return None
+    escaped = html.escape(snippet)
+    return escaped.replace(SNIPPET_SENTINEL[0], SNIPPET_MARK[0]).replace(SNIPPET_SENTINEL[1], SNIPPET_MARK[1])
+
+
+def project_items(items: List[Dict], columns: Tuple[str, ...], snippet: bool, q: str) -> List[Dict]:
+    """이미 읽은 도서 목록(하이브리드 결과 등)에 fields/snippet을 적용한다"""
+    dropped = [c for c in SEARCH_FIELDS if c not in columns]
+    for item in items:
+        if snippet:
+            item["snippet"] = make_snippet(item.get("description"), q.split())
+        for column in dropped:
+            item.pop(column, None)
+    return items
+
+
+def count_facets(conn: sqlite3.Connection, from_sql: str, where_sql: str, params: list) -> list:
+    """현재 검색어에 대한 KDC 주류별 건수를 한 번의 집계로 구한다"""
+    facet_sql = f"""
+        SELECT books.kdc_class AS kdc_class, COUNT(*) AS count
+        FROM {from_sql}
+        WHERE {where_sql}
+        GROUP BY books.kdc_class
+        ORDER BY books.kdc_class
+    """
+    return [dict(r) for r in timed_fetchall(conn, "facets", facet_sql, params)]
+
+
+def semantic_where(category: Optional[str]) -> Optional[Dict]:
+    """category_filter와 같은 규칙의 ChromaDB 메타데이터 필터"""
+    if not category:
+        return None
+    column, value = category_filter(category)
+    return {column: value}
+
+
+def load_search_engine():
+    """시맨틱 검색 엔진. 의존성(sentence-transformers, chromadb)이 없으면 ImportError"""
+    from .semantic_search import get_search_engine
+
+    return get_search_engine()
+
+
+def vector_search(q: str, category: Optional[str], n_results: int) -> List[Dict]:
+    return load_search_engine().semantic_search(q, n_results=n_results, where=semantic_where(category))
+
+
+def add_recommendation_reasons(items: List[Dict], q: str) -> None:
+    from .semantic_search import SemanticSearchEngine
+
+    for item in items:
+        item["recommendation_reason"] = SemanticSearchEngine.get_recommendation_reason(item, q)
+
+
+def reciprocal_rank_fusion(result_lists: List[List[Dict]], k: int = RRF_K) -> List[Dict]:
+    """여러 순위 목록을 RRF 점수(sum 1 / (k + 순위))로 합친다. 같은 도서는 id로 묶는다"""
+    scores = {}
+    books = {}
+    for results in result_lists:
+        for rank, book in enumerate(results, start=1):
+            book_id = int(book["id"])
+            scores[book_id] = scores.get(book_id, 0.0) + 1.0 / (k + rank)
+            merged = books.setdefault(book_id, {})
+            for key, value in book.items():
+                if value is not None or key not in merged:
+                    merged[key] = value
+    fused = sorted(books.values(), key=lambda b: (-scores[int(b["id"])], int(b["id"])))
+    for book in fused:
+        book["id"] = int(book["id"])
+        book["rrf_score"] = scores[book["id"]]
+        book.setdefault("similarity_score", None)
+    return fused
+
+
+def check_hybrid_params(sort: str, page: int, size: int, cursor: Optional[str], count: str, facets: bool) -> None:
+    """mode=hybrid 가 지원하지 않는 조건과 후보 상한을 넘는 페이지는 조용히 무시하지 않고 400으로 거절한다"""
+    unsupported = []
+    if sort != "relevance":
+        unsupported.append("sort")
+    if cursor:
+        unsupported.append("cursor")
+    if count != "exact":
+        unsupported.append("count")
+    if facets:
+        unsupported.append("facets")
+    if unsupported:
+        raise HTTPException(
+            status_code=400, detail=f"mode=hybrid 에서는 쓸 수 없는 조건입니다: {', '.join(unsupported)}"
+        )
+    if page * size > HYBRID_MAX_RESULTS:
+        raise HTTPException(
+            status_code=400, detail=f"mode=hybrid 는 앞쪽 {HYBRID_MAX_RESULTS}건까지만 볼 수 있습니다 (page * size)"
+        )
+
+
+def run_hybrid_search(
+    conn: sqlite3.Connection,
+    q: str,
+    category: Optional[str],
+    page: int,
+    size: int,
+    data_version: str,
+    started: float,
+    columns: Tuple[str, ...] = SEARCH_FIELDS,
+    snippet: bool = False,
+) -> dict:
+    """어휘(FTS/BM25) 검색과 벡터 검색을 동시에 실행해 RRF로 합친다 (page * size 상한은 check_hybrid_params가 확인)"""
+    candidates = min(max(HYBRID_CANDIDATES, page * size), max(HYBRID_CANDIDATES, HYBRID_MAX_RESULTS))
+    fallback = None
+    vector_future = None
+    if q:
+        # 벡터 검색 스레드에서도 이 요청의 단계 시간(embedding, vector)이 기록된다 (submit이 context를 넘긴다)
+        try:
+            vector_future = vector_executor.submit(vector_search, q, category, candidates)
+        except Overloaded:
+            fallback = "vector_busy"
+
+    lexical = run_search(conn, q, category, "relevance", 1, candidates, None, "none", data_version)["items"]
+
+    vector = []
+    if vector_future is not None:
+        remaining = HYBRID_VECTOR_BUDGET_MS / 1000 - (time.perf_counter() - started)
+        try:
+            vector = vector_future.result(timeout=max(remaining, 0))
+        except FutureTimeoutError:
+            # 아직 시작하지 않았으면 대기열에서 뺀다. 이미 실행 중이면 끝날 때까지 VECTOR_MAX_PENDING에 포함된다
+            vector_future.cancel()
+            fallback = "vector_timeout"
+        except ImportError:
+            fallback = "vector_unavailable"
+        except Exception:
+            logger.exception("벡터 검색 오류 (q=%r)", q)
+            fallback = "vector_error"
+
+    if fallback:
+        fused = lexical
+        for book in fused:
+            book["similarity_score"] = None
+    else:
+        fused = reciprocal_rank_fusion([lexical, vector])
+
+    offset = (page - 1) * size
+    items = fused[offset:offset + size]
+    if not fallback:
+        add_recommendation_reasons(items, q)
+    # 두 결과를 합친 뒤라 SQL에서 고르지 못한 필드는 여기서 뺀다
+    project_items(items, columns, snippet, q)
+
+    return {
+        "total": len(fused),
+        "total_capped": len(fused) >= candidates,
+        "page": page,
+        "size": size,
+        "items": items,
+        "next_cursor": None,
+        "mode": "hybrid",
+        "fallback": fallback,
+    }
+
+
+def timed_fetchall(conn: sqlite3.Connection, phase_name: str, sql: str, params: list, tuples: bool = False) -> list:
+    """조회 시간을 요청의 phase_name 단계로 기록하고, 느린 조회는 실행 계획과 함께 남긴다"""
+    started = time.perf_counter()
+    cur = conn.cursor()
+    if tuples:
+        cur.row_factory = None
+    rows = cur.execute(sql, params).fetchall()
+    elapsed = time.perf_counter() - started
+    metrics.record(phase_name, elapsed)
+    slow_query_log.check(conn, phase_name, sql, params, elapsed)
+    return rows
+
+
+def get_catalog_version(conn: sqlite3.Connection) -> str:
+    """도서 구성(제목/저자 등)의 버전. 자동완성/오타 교정 색인은 설명 보강으로는 다시 만들지 않는다"""
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'data_version'").fetchone()
+    except sqlite3.OperationalError:
+        # 아직 마이그레이션되지 않은 DB
+        return "0"
+    return row[0] if row else "0"
+
+
+def get_data_version(conn: sqlite3.Connection) -> str:
+    """검색 응답 캐시/ETag용 버전. 설명이 바뀌면 검색 결과도 바뀌므로 description_version을 함께 넣는다"""
+    try:
+        versions = dict(
+            conn.execute("SELECT key, value FROM meta WHERE key IN ('data_version', 'description_version')")
+        )
+    except sqlite3.OperationalError:
+        return "0"
+    return f"{versions.get('data_version', '0')}.{versions.get('description_version', '0')}"
+
+
+def make_etag(data_version: str, cache_key: tuple) -> str:
+    digest = hashlib.sha1(repr(cache_key).encode("utf-8")).hexdigest()[:16]
+    return f'W/"{data_version}-{digest}"'
+
+
+def count_results(
+    conn: sqlite3.Connection, from_sql: str, where_sql: str, params: list, mode: str, cache_key
+) -> Tuple[Optional[int], bool]:
+    """검색 결과 건수와 상한 도달 여부를 반환. mode=none 이면 (None, False)"""
+    total = count_cache.get(cache_key)
+    if total is not None:
+        return total, False
+    if mode == "none":
+        return None, False
+
+    if mode == "estimate":
+        # 상한+1 건까지만 읽고 멈춘다
+        estimate_sql = (
+            f"SELECT COUNT(*) FROM (SELECT 1 FROM {from_sql} WHERE {where_sql} LIMIT ?)"
+        )
+        total = timed_fetchall(conn, "count", estimate_sql, params + [COUNT_ESTIMATE_CAP + 1])[0][0]
+        if total > COUNT_ESTIMATE_CAP:
+            return COUNT_ESTIMATE_CAP, True
+    else:
+        count_sql = f"SELECT COUNT(*) as cnt FROM {from_sql} WHERE {where_sql}"
+        total = timed_fetchall(conn, "count", count_sql, params)[0][0]
+
+    # 상한에 걸리지 않은 건수는 정확한 값이므로 estimate 결과도 캐시한다
+    count_cache.set(cache_key, total)
+    return total, False
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    return {
+        "status": "ok",
+        "pid": os.getpid(),
+        "db_pool": db_pool.stats(),
+        "search_cache": search_cache.stats(),
+        "count_cache": count_cache.stats(),
+        "search_executor": search_executor.stats(),
+        "vector_executor": vector_executor.stats(),
+        "suggest_index": suggest_index.stats(),
+        "fuzzy_index": fuzzy_index.stats(),
+        "startup": startup_report,
+    }
+
+def run_search(
+    conn: sqlite3.Connection,
+    q: str,
+    category: Optional[str],
+    sort: str,
+    page: int,
+    size: int,
+    cursor: Optional[str],
+    count: str,
+    data_version: str,
+    facets: bool = False,
+    columns: Tuple[str, ...] = SEARCH_FIELDS,
+    snippet: bool = False,
+) -> dict:
+    from_sql = "books"
+    where_clauses = ["1=1"]
+    params = []
+    fts_query = None
+    rank_sql = None
+
+    if q:
+        # 3글자 이상 단어는 trigram 색인(books_fts), 두 글자 단어는 바이그램 색인(books_bigram)으로 찾고,
+        # 어느 색인으로도 찾을 수 없는 단어(한 글자 등)만 색인으로 고른 후보 안에서 LIKE로 거른다
+        fts_query = build_fts_query(q) if table_exists(conn, "books_fts") else None
+        bigram_query = build_bigram_query(q) if table_exists(conn, "books_bigram") else None
+        residual = []
+        residual_params = []
+        if fts_query:
+            from_sql = "books JOIN books_fts ON books_fts.rowid = books.id"
+            where_clauses.append("books_fts MATCH ?")
+            params.append(fts_query)
+            rank_sql = f"bm25(books_fts, {BM25_WEIGHTS})"
+            if bigram_query:
+                residual.append("books.id IN (SELECT rowid FROM books_bigram WHERE books_bigram MATCH ?)")
+                residual_params.append(bigram_query)
+        elif bigram_query:
+            from_sql = "books JOIN books_bigram ON books_bigram.rowid = books.id"
+            where_clauses.append("books_bigram MATCH ?")
+            params.append(bigram_query)
+            rank_sql = "bm25(books_bigram)"
+
+        for term in q.split():
+            if (fts_query and len(term) >= FTS_MIN_TERM_LENGTH) or (bigram_query and is_bigram_term(term)):
+                continue
+            like = f"%{term}%"
+            residual.append(
+                "(books.title LIKE ? OR books.author LIKE ? OR books.publisher LIKE ? OR books.description LIKE ?)"
+            )
+            residual_params.extend([like, like, like, like])
+
+        if residual:
+            clause = " AND ".join(residual)
+            # 정규화 검색 키 일치 (띄어쓰기/초성 입력). 색인 후보가 있으면 그 안에서만 비교한다.
+            # "C#" → "c" 처럼 문장 부호를 지워 짧아진 키는 거의 모든 행과 일치하므로 쓰지 않는다
+            key = search_form(q)
+            if len(key) >= FTS_MIN_TERM_LENGTH:
+                clause = f"(({clause}) OR books.search_key LIKE ?)"
+                residual_params.append(f"%{key}%")
+            where_clauses.append(clause)
+            params.extend(residual_params)
+
+    # 패싯은 카테고리 조건을 빼고 집계한다
+    facet_counts = None
+    if facets:
+        facet_counts = count_facets(conn, from_sql, " AND ".join(where_clauses), params)
+        # 패싯 합계로 전체 건수를 알 수 있으면 COUNT 쿼리를 따로 실행하지 않는다
+        by_class = {f["kdc_class"]: f["count"] for f in facet_counts}
+        count_key = (data_version, q.lower(), category)
+        if not category:
+            count_cache.set(count_key, sum(by_class.values()))
+        elif category.strip().isdigit() and len(category.strip()) == 1:
+            count_cache.set(count_key, by_class.get(category.strip(), 0))
+
+    if category:
+        column, value = category_filter(category)
+        where_clauses.append(f"books.{column} = ?")
+        params.append(value)
+
+    where_sql = " AND ".join(where_clauses)
+
+    key_sql, descending = sort_key(sort, rank_sql)
+    direction = "DESC" if descending else "ASC"
+    order_sql = f"ORDER BY {key_sql} {direction}, books.id {direction}"
+
+    # total count
+    total, total_capped = count_results(
+        conn, from_sql, where_sql, params, count, (data_version, q.lower(), category)
+    )
+
+    # pagination: cursor가 있으면 마지막 정렬 키 다음부터 읽고(keyset), 없으면 page로 OFFSET
+    page_where_sql = where_sql
+    page_params = list(params)
+    offset = (page - 1) * size
+    if cursor:
+        last_key, last_id = decode_cursor(cursor, sort)
+        op = "<" if descending else ">"
+        page_where_sql += f" AND {key_sql} {op}= ? AND ({key_sql} {op} ? OR books.id {op} ?)"
+        page_params.extend([last_key, last_key, last_id])
+        offset = 0
+
+    # 요청한 컬럼만 읽는다. 발췌는 FTS 검색이면 snippet()으로, 아니면 설명을 읽어 직접 만든다
+    select_columns = list(columns)
+    select_sql = [f"books.{c}" for c in columns]
+    python_snippet = snippet and not fts_query
+    if snippet and fts_query:
+        select_columns.append("snippet")
+        select_sql.append(
+            f"snippet(books_fts, 3, '{SNIPPET_SENTINEL[0]}', '{SNIPPET_SENTINEL[1]}', '{SNIPPET_ELLIPSIS}', {SNIPPET_LENGTH})"
+        )
+    elif python_snippet and "description" not in columns:
+        select_sql.append("books.description")
+    query_sql = f"""
+        SELECT {", ".join(select_sql)}, {key_sql} AS sort_key
+        FROM {from_sql}
+        WHERE {page_where_sql}
+        {order_sql}
+        LIMIT ? OFFSET ?
+    """
+    # 다음 페이지 존재 여부를 알기 위해 한 건 더 읽는다. sqlite3.Row를 거치지 않고 튜플에서 바로 dict를 만든다
+    fetched = timed_fetchall(conn, "fetch", query_sql, page_params + [size + 1, offset], tuples=True)
+
+    next_cursor = None
+    if len(fetched) > size:
+        fetched = fetched[:size]
+        # id는 항상 첫 컬럼, 정렬 키는 마지막 컬럼
+        next_cursor = encode_cursor(sort, fetched[-1][-1], fetched[-1][0])
+    with phase("rows"):
+        rows = [dict(zip(select_columns, r)) for r in fetched]
+        if python_snippet:
+            description_index = len(columns) if "description" not in columns else columns.index("description")
+            terms = q.split()
+            for row, r in zip(rows, fetched):
+                row["snippet"] = make_snippet(r[description_index], terms)
+        elif snippet:
+            for row in rows:
+                row["snippet"] = render_fts_snippet(row["snippet"])
+
+    result = {
+        "total": total,
+        "total_capped": total_capped,
+        "page": page,
+        "size": size,
+        "items": rows,
+        "next_cursor": next_cursor,
+    }
+    if facet_counts is not None:
+        result["facets"] = facet_counts
+    return result
+
+
+def fuzzy_search(
+    conn: sqlite3.Connection,
+    q: str,
+    category: Optional[str],
+    sort: str,
+    page: int,
+    size: int,
+    cursor: Optional[str],
+    count: str,
+    data_version: str,
+    facets: bool,
+    columns: Tuple[str, ...],
+    snippet: bool,
+) -> Optional[dict]:
+    """결과가 없을 때 오타를 고친 질의로 다시 찾는다. 고칠 단어가 없거나 고쳐도 결과가 없으면 None"""
+    index = fuzzy_index.get(conn, get_catalog_version(conn))
+    with phase("fuzzy"):
+        corrected = index.correct(q, FUZZY_BUDGET_MS / 1000)
+    if not corrected:
+        return None
+    result = run_search(conn, corrected, category, sort, page, size, cursor, count, data_version, facets, columns, snippet)
+    if not result["items"]:
+        return None
+    result["corrected_query"] = corrected
+    return result
+
+
+def execute_search(
+    q: str,
+    category: Optional[str],
+    sort: str,
+    page: int,
+    size: int,
+    cursor: Optional[str],
+    count: str,
+    facets: bool,
+    mode: str,
+    cache_key: tuple,
+    started: float,
+    columns: Tuple[str, ...] = SEARCH_FIELDS,
+    snippet: bool = False,
+) -> Tuple[str, dict]:
+    """search_executor 스레드에서 실행. (data_version, 결과)를 반환"""
+    acquire_started = time.perf_counter()
+    with db_pool.connection() as conn:
+        metrics.record("connection", time.perf_counter() - acquire_started)
+        data_version = get_data_version(conn)
+        result = search_cache.get((data_version,) + cache_key)
+        if result is None:
+            if mode == "hybrid":
+                result = run_hybrid_search(
+                    conn, q, category, page, size, data_version, started, columns, snippet
+                )
+            else:
+                result = run_search(
+                    conn, q, category, sort, page, size, cursor, count, data_version, facets, columns, snippet
+                )
+                if q and not result["items"] and not result["total"] and FUZZY_BUDGET_MS > 0:
+                    result = fuzzy_search(
+                        conn, q, category, sort, page, size, cursor, count, data_version, facets, columns, snippet
+                    ) or result
+            # 벡터 검색이 빠진 대체 결과는 캐시하지 않는다
+            if not result.get("fallback"):
+                search_cache.set((data_version,) + cache_key, result)
+    return data_version, result
+
 
 @app.get("/search")
-def search(
+async def search(
+    request: Request,
     q: Optional[str] = Query(default="", description="검색어"),
     category: Optional[str] = Query(default=None, description="카테고리"),
     sort: str = Query(default="relevance", pattern="^(relevance|title|author|date)$"),
     page: int = Query(default=1, ge=1),
     size: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = Query(default=None, description="이전 응답의 next_cursor"),
+    count: str = Query(default="exact", pattern="^(exact|estimate|none)$", description="전체 건수 계산 방식"),
+    facets: bool = Query(default=False, description="KDC 주류별 건수 포함 여부"),
+    mode: str = Query(default="lexical", pattern="^(lexical|hybrid)$", description="검색 방식"),
+    fields: Optional[str] = Query(default=None, description="쉼표로 구분한 반환 필드 (예: title,author). 생략하면 전체"),
+    snippet: bool = Query(default=False, description="검색어를 강조한 설명 발췌(snippet) 포함 여부"),
 ):
-        # category 필터링 로직 수정
-    if category:
-        # category = ? 대신 LIKE ? 와 %를 사용하여 '해당 숫자로 시작하는' 모든 데이터를 찾습니다.
-        base_query += " AND category LIKE ?"
-        params.append(f'{category}%')
-    
-    conn = get_connection()
+    started = time.perf_counter()
+    q = normalize_query(q)
+    columns = parse_fields(fields)
+    if mode == "hybrid":
+        check_hybrid_params(sort, page, size, cursor, count, facets)
+    cache_key = (q.lower(), category, sort, cursor or page, size, count, facets, mode, columns, snippet)
+
+    # 조회는 전용 스레드 풀에서 실행하고, 같은 조건의 동시 요청은 한 번만 실행한다
     try:
-        where_clauses = ["1=1"]
-        params = []
-
-        if q:
-            like = f"%{q}%"
-            where_clauses.append("(title LIKE ? OR author LIKE ? OR publisher LIKE ? OR description LIKE ?)")
-            params.extend([like, like, like, like])
-
-        if category:
-            where_clauses.append("category = ?")
-            params.append(category)
-
-        where_sql = " AND ".join(where_clauses)
-
-        if sort == "title":
-            order_sql = "ORDER BY title COLLATE NOCASE ASC"
-        elif sort == "author":
-            order_sql = "ORDER BY author COLLATE NOCASE ASC"
-        elif sort == "date":
-            order_sql = "ORDER BY publish_date DESC"
-        else:
-            # relevance 대용: 최신순을 기본으로 사용
-            order_sql = "ORDER BY publish_date DESC"
-
-        # total count
-        count_sql = f"SELECT COUNT(*) as cnt FROM books WHERE {where_sql}"
-        cur = conn.execute(count_sql, params)
-        total = cur.fetchone()[0]
-
-        # pagination
-        offset = (page - 1) * size
-        query_sql = f"""
-            SELECT id, title, author, publisher, category, publish_date, description
-            FROM books
-            WHERE {where_sql}
-            {order_sql}
-            LIMIT ? OFFSET ?
-        """
-        query_params = params + [size, offset]
-        cur = conn.execute(query_sql, query_params)
-        rows = [dict(r) for r in cur.fetchall()]
-
-        return {
-            "total": total,
-            "page": page,
-            "size": size,
-            "items": rows,
-        }
-    finally:
-        conn.close()
\ No newline at end of file
+        data_version, result = await search_executor.run(
+            cache_key, execute_search,
+            q, category, sort, page, size, cursor, count, facets, mode, cache_key, started, columns, snippet,
+        )
+    except Overloaded:
+        raise HTTPException(
+            status_code=503, detail="검색 요청이 많습니다. 잠시 후 다시 시도하세요", headers={"Retry-After": "1"}
+        )
+
+    if result.get("fallback"):
+        headers = {"Cache-Control": "no-store"}
+    else:
+        etag = make_etag(data_version, cache_key)
+        headers = {"ETag": etag, "Cache-Control": f"public, max-age={SEARCH_CACHE_MAX_AGE}"}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+    # 직렬화 시간을 따로 재기 위해 응답을 직접 만든다
+    with phase("serialize"):
+        return FastJSONResponse(result, headers=headers)
+
+
+@app.get("/metrics")
+def prometheus_metrics():
+    """Prometheus text 형식의 지연 시간 히스토그램과 풀/캐시 상태"""
+    pool = db_pool.stats()
+    executor = search_executor.stats()
+    vector = vector_executor.stats()
+    gauges = {
+        "search_executor_pending": executor["pending"],
+        "search_executor_rejected_total": executor["rejected"],
+        "search_executor_coalesced_total": executor["coalesced"],
+        "vector_executor_pending": vector["pending"],
+        "vector_executor_rejected_total": vector["rejected"],
+        "slow_queries_total": slow_query_log.count,
+    }
+    for name, value in pool.items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            gauges[f"db_pool_{name}"] = value
+    for cache_name, cache in (("search_cache", search_cache), ("count_cache", count_cache)):
+        for name, value in cache.stats().items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                gauges[f"{cache_name}_{name}"] = value
+    return PlainTextResponse(metrics.render_metrics(gauges), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/suggest")
+def suggest(
+    response: Response,
+    q: str = Query(..., min_length=1, description="입력 중인 검색어 (초성만 입력해도 된다)"),
+    size: int = Query(default=10, ge=1, le=50),
+    kind: Optional[str] = Query(default=None, alias="type", pattern="^(title|author)$"),
+):
+    """제목/저자 자동완성"""
+    with db_pool.connection() as conn:
+        index = suggest_index.get(conn, get_catalog_version(conn))
+    response.headers["Cache-Control"] = f"public, max-age={SEARCH_CACHE_MAX_AGE}"
+    return {"q": q, "items": index.suggest(q, limit=size, kind=kind)}
+
+
+@app.get("/semantic-search")
+def semantic_search(
+    q: str = Query(..., min_length=1, description="검색어"),
+    category: Optional[str] = Query(default=None, description="카테고리"),
+    page: int = Query(default=1, ge=1),
+    size: int = Query(default=20, ge=1, le=100),
+):
+    q = normalize_query(q)
+    try:
+        books = vector_search(q, category, page * size)
+    except ImportError:
+        raise HTTPException(status_code=503, detail="시맨틱 검색을 사용할 수 없습니다")
+
+    offset = (page - 1) * size
+    items = books[offset:offset + size]
+    add_recommendation_reasons(items, q)
+    return {
+        "total": len(books),
+        "page": page,
+        "size": size,
+        "items": items,
+    }
+
+
+class SemanticBatchRequest(BaseModel):
+    queries: List[str] = Field(..., min_length=1, max_length=SEMANTIC_BATCH_MAX_QUERIES, description="검색어 목록")
+    category: Optional[str] = Field(default=None, description="카테고리")
+    size: int = Field(default=20, ge=1, le=100, description="질의당 결과 수")
+    reasons: bool = Field(default=False, description="추천 이유 포함 여부")
+
+
+@app.post("/semantic-search/batch")
+def semantic_search_batch(body: SemanticBatchRequest):
+    """여러 검색어를 한 번에 시맨틱 검색 (추천 사전 계산, 질의 로그 재생/평가용)"""
+    queries = [normalize_query(q) for q in body.queries]
+    try:
+        engine = load_search_engine()
+    except ImportError:
+        raise HTTPException(status_code=503, detail="시맨틱 검색을 사용할 수 없습니다")
+    started = time.perf_counter()
+    results = engine.semantic_search_batch(queries, n_results=body.size, where=semantic_where(body.category))
+
+    if body.reasons:
+        for q, items in zip(queries, results):
+            add_recommendation_reasons(items, q)
+    return {
+        "count": len(queries),
+        "took_ms": round((time.perf_counter() - started) * 1000, 1),
+        "results": [{"q": q, "items": items} for q, items in zip(queries, results)],
+    }
@@ -0,0 +1,177 @@
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+from urllib.parse import quote
+
+
+def readonly_uri(db_path: str, immutable: bool = False) -> str:
+    """읽기 전용 연결 URI. immutable이면 잠금과 변경 감지를 하지 않는다 (서빙 중 파일이 바뀌지 않을 때만)"""
+    uri = f"file:{quote(db_path)}?mode=ro"
+    return uri + "&immutable=1" if immutable else uri
+
+
+class ConnectionPool:
+    """읽기 전용 SQLite 연결 풀
+
+    요청마다 파일을 열고 스키마를 파싱하는 대신, 설정이 끝난 연결을 재사용한다.
+    각 연결은 prepared statement 캐시(cached_statements)를 가지므로 같은 SQL은 다시 컴파일하지 않는다.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_size: int = 8,
+        timeout: float = 10.0,
+        mmap_size: int = 256 * 1024 * 1024,
+        cache_size_kb: int = 64 * 1024,
+        cached_statements: int = 256,
+        immutable: bool = False,
+    ):
+        self.db_path = db_path
+        # immutable=1 연결은 WAL 파일을 읽지 않으므로, 연결 전에 checkpoint_wal()로 WAL을 본 파일에 합쳐 둔다
+        self.immutable = immutable
+        self.max_size = max_size
+        self.timeout = timeout
+        self.mmap_size = mmap_size
+        self.cache_size_kb = cache_size_kb
+        self.cached_statements = cached_statements
+
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._size = 0
+        self._stats = {
+            "created": 0,
+            "checkouts": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "timeouts": 0,
+        }
+
+    def enable_wal(self) -> None:
+        """WAL 모드는 DB 파일에 기록되므로 쓰기 가능한 연결로 한 번만 설정한다"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+        finally:
+            conn.close()
+
+    def checkpoint_wal(self) -> None:
+        """WAL에 남은 변경을 본 파일에 옮기고 WAL을 비운다"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            readonly_uri(self.db_path, self.immutable),
+            uri=True,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        # 음수는 KiB 단위
+        conn.execute(f"PRAGMA cache_size=-{int(self.cache_size_kb)}")
+        conn.execute("PRAGMA query_only=ON")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        # 스키마를 미리 읽어 첫 요청에서 파싱 비용이 들지 않게 한다
+        conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        return conn
+
+    def connect_unpooled(self) -> sqlite3.Connection:
+        """풀과 별개인 같은 설정의 연결 (색인 재구축처럼 오래 걸리는 백그라운드 작업용). 호출한 쪽이 닫는다"""
+        return self._connect()
+
+    def warmup(self, count: int) -> None:
+        """연결을 미리 count개 만들어 둔다"""
+        conns = []
+        for _ in range(min(count, self.max_size)):
+            with self._lock:
+                if self._size >= self.max_size:
+                    break
+                self._size += 1
+            conns.append(self._new_connection())
+        for conn in conns:
+            self._idle.put(conn)
+
+    def _new_connection(self) -> sqlite3.Connection:
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._lock:
+                self._size -= 1
+            raise
+        with self._lock:
+            self._stats["created"] += 1
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._size < self.max_size
+            if can_create:
+                self._size += 1
+        if can_create:
+            return self._new_connection()
+
+        # 풀이 가득 찼으면 반납될 때까지 기다린다
+        started = time.perf_counter()
+        try:
+            conn = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            with self._lock:
+                self._stats["timeouts"] += 1
+            raise TimeoutError("SQLite connection pool exhausted")
+        with self._lock:
+            self._stats["waits"] += 1
+            self._stats["wait_seconds"] += time.perf_counter() - started
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._acquire()
+        with self._lock:
+            self._stats["checkouts"] += 1
+        try:
+            yield conn
+        finally:
+            # 읽기 전용이지만 열린 트랜잭션이 남아 있으면 WAL 체크포인트를 막으므로 정리한다
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._size -= 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            size = self._size
+        idle = self._idle.qsize()
+        stats.update(
+            {
+                "max_size": self.max_size,
+                "immutable": self.immutable,
+                "size": size,
+                "idle": idle,
+                "in_use": size - idle,
+                "wait_seconds": round(stats["wait_seconds"], 6),
+            }
+        )
+        return stats
@@ -0,0 +1,135 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """맥락 텍스트 임베딩을 디스크에 보관하는 캐시
+
+    키는 (모델 이름, 텍스트)의 해시이고, 벡터는 모델별 디렉터리의 vectors.bin에 고정 길이 행으로
+    이어 붙이며, 키 → 행 번호 색인은 같은 디렉터리의 SQLite 파일에 둔다.
+    모델마다 디렉터리가 다르므로 모델을 바꾸면 자동으로 새 캐시를 쓴다.
+    """
+
+    def __init__(self, cache_dir: str, model_name: str, dtype: str = "float16"):
+        self.model_name = model_name
+        self.dtype = np.dtype(dtype)
+        slug = re.sub(r"[^A-Za-z0-9._-]+", "_", model_name)
+        self.dir = os.path.join(cache_dir, slug)
+        os.makedirs(self.dir, exist_ok=True)
+        self.vectors_path = os.path.join(self.dir, "vectors.bin")
+
+        # 엔진은 기동 스레드에서 만들어져 요청 스레드에서 쓰이므로 잠금으로 직렬화한다
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(os.path.join(self.dir, "index.db"), check_same_thread=False)
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS entries (hash TEXT PRIMARY KEY, row INTEGER NOT NULL);
+            """
+        )
+        self.dim = self._get_meta("dim")
+        if self.dim is not None:
+            self.dim = int(self.dim)
+        stored_dtype = self._get_meta("dtype")
+        if stored_dtype is not None:
+            self.dtype = np.dtype(stored_dtype)
+
+        self.hits = 0
+        self.misses = 0
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def key(self, text: str) -> str:
+        return hashlib.sha1(f"{self.model_name}\x1f{text}".encode("utf-8")).hexdigest()
+
+    def _row_count(self) -> int:
+        if self.dim is None or not os.path.exists(self.vectors_path):
+            return 0
+        return os.path.getsize(self.vectors_path) // (self.dim * self.dtype.itemsize)
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """저장된 키의 float32 벡터를 반환 (없는 키는 결과에 없음)"""
+        with self._lock:
+            return self._get_many(keys)
+
+    def _get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        if self.dim is None or not keys:
+            self.misses += len(keys)
+            return {}
+
+        rows = {}
+        # SQLite 변수 개수 제한을 넘지 않도록 나눠서 조회
+        for start in range(0, len(keys), 500):
+            part = keys[start:start + 500]
+            placeholders = ",".join("?" * len(part))
+            rows.update(
+                self.conn.execute(
+                    f"SELECT hash, row FROM entries WHERE hash IN ({placeholders})", part
+                ).fetchall()
+            )
+
+        found = {}
+        if rows:
+            matrix = np.memmap(
+                self.vectors_path, dtype=self.dtype, mode="r", shape=(self._row_count(), self.dim)
+            )
+            for key, row in rows.items():
+                found[key] = np.asarray(matrix[row], dtype=np.float32)
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, keys: List[str], vectors: np.ndarray) -> None:
+        with self._lock:
+            self._put_many(keys, vectors)
+
+    def _put_many(self, keys: List[str], vectors: np.ndarray) -> None:
+        if not keys:
+            return
+        vectors = np.asarray(vectors)
+        if self.dim is None:
+            self.dim = int(vectors.shape[1])
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [("model", self.model_name), ("dim", str(self.dim)), ("dtype", self.dtype.name)],
+            )
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match cache ({self.dim})")
+
+        # 파일 끝에 이어 쓰고, 그 다음에 색인을 커밋한다. 중간에 중단되면 색인 없는 행만 남는다
+        first_row = self._row_count()
+        row_bytes = self.dim * self.dtype.itemsize
+        if os.path.exists(self.vectors_path) and os.path.getsize(self.vectors_path) != first_row * row_bytes:
+            # 쓰다 만 행이 있으면 잘라내 행 경계를 맞춘다
+            os.truncate(self.vectors_path, first_row * row_bytes)
+        with open(self.vectors_path, "ab") as f:
+            f.write(np.ascontiguousarray(vectors, dtype=self.dtype).tobytes())
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO entries (hash, row) VALUES (?, ?)",
+            [(key, first_row + i) for i, key in enumerate(keys)],
+        )
+        self.conn.commit()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            count = self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {
+            "model": self.model_name,
+            "entries": count,
+            "dim": self.dim,
+            "dtype": self.dtype.name,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
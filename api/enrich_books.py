@@ -0,0 +1,262 @@
+import argparse
+import asyncio
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional
+
+from .ingest_csv import DB_PATH, bump_data_version, ensure_db
+from .normalize import build_bigram_key
+from .yes24_api import Yes24BookAPI
+from .yes24_client import AsyncYes24Client
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+LEDGER_PATH = os.path.join(APP_DIR, "enrichment.db")
+
+# 진행 원장: book_key별 처리 결과. books.db를 다시 적재해도 book_key가 같으면 다시 가져오지 않는다
+LEDGER_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS ledger.enrichment (
+    book_key TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    link TEXT,
+    description TEXT,
+    table_of_contents TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL
+);
+"""
+
+# 다시 시도하지 않는 상태 (error는 max_attempts까지 재시도)
+FINAL_STATUSES = {"done", "not_found", "no_description"}
+
+MISSING_SQL = """
+SELECT b.id, b.book_key, b.title, b.author, b.publisher,
+       e.status, e.description AS ledger_description, e.table_of_contents, e.attempts
+FROM books b
+LEFT JOIN ledger.enrichment e ON e.book_key = b.book_key
+WHERE (b.description IS NULL OR b.description = '') AND b.id > ?
+ORDER BY b.id
+LIMIT ?
+"""
+
+LEDGER_UPSERT_SQL = """
+INSERT INTO ledger.enrichment (book_key, status, link, description, table_of_contents, error, attempts, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, 1, ?)
+ON CONFLICT(book_key) DO UPDATE SET
+    status = excluded.status, link = excluded.link, description = excluded.description,
+    table_of_contents = excluded.table_of_contents, error = excluded.error,
+    attempts = attempts + 1, updated_at = excluded.updated_at
+"""
+
+# 그 사이 CSV 적재로 설명이 채워졌으면 덮어쓰지 않는다. 두 글자 검색용 바이그램 토큰도 설명을 넣어 다시 만든다
+UPDATE_DESCRIPTION_SQL = (
+    "UPDATE books SET description = ?1, bigram_key = bigram_key_of(title, author, publisher, ?1, search_key) "
+    "WHERE id = ?2 AND (description IS NULL OR description = '')"
+)
+
+# 검색 결과 제목이 이 비율 이상 비슷해야 같은 도서로 본다
+MIN_TITLE_SIMILARITY = 0.6
+
+
+# 파서는 작업 프로세스마다 하나씩 만든다
+_parser: Optional[Yes24BookAPI] = None
+
+
+def _get_parser(base_url: str) -> Yes24BookAPI:
+    global _parser
+    if _parser is None:
+        _parser = Yes24BookAPI()
+    _parser.base_url = base_url
+    return _parser
+
+
+def parse_search_page(body: bytes, base_url: str, max_results: int = 10) -> List[Dict]:
+    return _get_parser(base_url).parse_search_page(body, max_results)
+
+
+def parse_detail_page(body: bytes, base_url: str) -> Dict:
+    return _get_parser(base_url).parse_detail_page(body)
+
+
+def _normalize(text: Optional[str]) -> str:
+    return re.sub(r"[\W_]+", "", (text or "").lower())
+
+
+def match_score(book: Dict, candidate: Dict) -> float:
+    """로컬 도서와 검색 결과가 같은 책일 가능성 (0~1.2)"""
+    title = _normalize(book.get("title"))
+    other = _normalize(candidate.get("title"))
+    if not title or not other:
+        return 0.0
+    # Yes24 제목에는 부제가 붙는 경우가 많다
+    if other.startswith(title) or title.startswith(other):
+        score = 0.9
+    else:
+        score = SequenceMatcher(None, title, other).ratio()
+    publisher = _normalize(book.get("publisher"))
+    if publisher and publisher == _normalize(candidate.get("publisher")):
+        score += 0.2
+    return score
+
+
+def pick_match(book: Dict, candidates: List[Dict]) -> Optional[Dict]:
+    scored = [(match_score(book, c), i) for i, c in enumerate(candidates) if c.get("link")]
+    if not scored:
+        return None
+    score, index = max(scored, key=lambda x: (x[0], -x[1]))
+    return candidates[index] if score >= MIN_TITLE_SIMILARITY else None
+
+
+async def enrich_book(client: AsyncYes24Client, parse_pool, book: Dict) -> Dict:
+    """검색 → 일치하는 도서 선택 → 상세 페이지에서 설명/목차 추출. 예외는 status='error'로 돌려준다"""
+    loop = asyncio.get_running_loop()
+    result = {
+        "id": book["id"], "book_key": book["book_key"], "status": "error",
+        "link": None, "description": None, "table_of_contents": None, "error": None,
+    }
+    try:
+        body = await client.fetch(*client.search_request(book["title"]))
+        candidates = await loop.run_in_executor(parse_pool, parse_search_page, body, client.base_url)
+        match = pick_match(book, candidates)
+        if match is None:
+            result["status"] = "not_found"
+            return result
+        result["link"] = match["link"]
+
+        body = await client.fetch(match["link"])
+        detail = await loop.run_in_executor(parse_pool, parse_detail_page, body, client.base_url)
+        result["description"] = detail.get("description") or None
+        result["table_of_contents"] = detail.get("table_of_contents") or None
+        result["status"] = "done" if result["description"] or result["table_of_contents"] else "no_description"
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+def write_batch(conn: sqlite3.Connection, results: List[Dict], reapplied: List[tuple]) -> int:
+    """원장 기록과 books 갱신을 한 트랜잭션으로 반영하고 갱신된 도서 수를 반환"""
+    now = time.time()
+    updates = list(reapplied)
+    for r in results:
+        if r["status"] == "done":
+            # 설명이 없으면 목차라도 넣어 검색/임베딩에 쓰이게 한다
+            updates.append((r["description"] or r["table_of_contents"], r["id"]))
+    with conn:
+        conn.executemany(
+            LEDGER_UPSERT_SQL,
+            [
+                (r["book_key"], r["status"], r["link"], r["description"], r["table_of_contents"], r["error"], now)
+                for r in results
+            ],
+        )
+        updated = sum(conn.execute(UPDATE_DESCRIPTION_SQL, u).rowcount for u in updates)
+    return updated
+
+
+async def enrich_books(
+    db_path: str = DB_PATH,
+    ledger_path: str = LEDGER_PATH,
+    batch_size: int = 100,
+    limit: Optional[int] = None,
+    max_attempts: int = 3,
+    workers: int = 2,
+    client: Optional[AsyncYes24Client] = None,
+) -> Dict[str, int]:
+    """설명이 비어 있는 도서를 Yes24 상세 페이지로 채운다
+
+    batch_size건씩 동시에 가져오고(동시성/속도 제한은 client) 한 트랜잭션으로 기록한다.
+    원장에 결과가 있는 도서는 다시 요청하지 않으므로 중단 후 같은 명령으로 이어서 실행할 수 있다.
+    설명만 바뀌므로 data_version(도서 구성)은 그대로 두고, 끝날 때(중단되어도) description_version만 한 번 올린다.
+    """
+    ensure_db(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.create_function("bigram_key_of", 5, build_bigram_key, deterministic=True)
+    conn.execute("ATTACH DATABASE ? AS ledger", (ledger_path,))
+    conn.executescript(LEDGER_SCHEMA_SQL)
+
+    own_client = client is None
+    client = client or AsyncYes24Client()
+    parse_pool = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+    counts = {"fetched": 0, "updated": 0, "reapplied": 0, "not_found": 0, "errors": 0, "skipped": 0}
+    started = time.perf_counter()
+    try:
+        last_id = 0
+        while limit is None or counts["fetched"] < limit:
+            rows = conn.execute(MISSING_SQL, (last_id, batch_size)).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1]["id"]
+
+            todo = []
+            reapplied = []
+            for row in rows:
+                if row["status"] == "done":
+                    # 원장에는 있는데 books에 없는 경우(재적재 후) 네트워크 없이 다시 채운다
+                    reapplied.append((row["ledger_description"] or row["table_of_contents"], row["id"]))
+                elif row["status"] in FINAL_STATUSES or (row["attempts"] or 0) >= max_attempts:
+                    counts["skipped"] += 1
+                elif limit is None or counts["fetched"] + len(todo) < limit:
+                    todo.append(dict(row))
+
+            results = await asyncio.gather(*(enrich_book(client, parse_pool, book) for book in todo))
+            updated = write_batch(conn, results, reapplied)
+
+            counts["fetched"] += len(todo)
+            counts["reapplied"] += len(reapplied)
+            counts["updated"] += updated
+            counts["not_found"] += sum(r["status"] == "not_found" for r in results)
+            counts["errors"] += sum(r["status"] == "error" for r in results)
+            elapsed = time.perf_counter() - started
+            print(
+                f"Fetched: {counts['fetched']}, Updated: {counts['updated']}, Not found: {counts['not_found']}, "
+                f"Errors: {counts['errors']} ({counts['fetched'] / elapsed:.1f} books/sec)"
+            )
+    finally:
+        if counts["updated"]:
+            # 배치마다 올리면 API 캐시가 작업 내내 계속 비워지므로 한 번만 올린다
+            with conn:
+                bump_data_version(conn, "description_version")
+        if parse_pool is not None:
+            parse_pool.shutdown()
+        if own_client:
+            await client.aclose()
+        conn.close()
+
+    print(f"Done: {counts}")
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill missing book descriptions from Yes24 detail pages")
+    parser.add_argument("--db", default=DB_PATH, help="Path to books.db")
+    parser.add_argument("--ledger", default=LEDGER_PATH, help="Path to the progress ledger database")
+    parser.add_argument("--batch-size", type=int, default=100, help="Books fetched and committed per batch")
+    parser.add_argument("--limit", type=int, default=None, help="Fetch at most this many books")
+    parser.add_argument("--max-attempts", type=int, default=3, help="Give up on a book after this many errors")
+    parser.add_argument("--workers", type=int, default=2, help="HTML parser processes (0 = parse in threads)")
+    parser.add_argument("--concurrency", type=int, default=None, help="Concurrent requests (default: YES24_CONCURRENCY)")
+    parser.add_argument("--rate", type=float, default=None, help="Requests per second (default: YES24_RATE_PER_SEC)")
+    args = parser.parse_args()
+
+    async def run():
+        async with AsyncYes24Client(concurrency=args.concurrency, rate_per_sec=args.rate) as client:
+            await enrich_books(
+                db_path=args.db,
+                ledger_path=args.ledger,
+                batch_size=args.batch_size,
+                limit=args.limit,
+                max_attempts=args.max_attempts,
+                workers=args.workers,
+                client=client,
+            )
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
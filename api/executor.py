@@ -0,0 +1,96 @@
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, Optional
+
+
+class Overloaded(Exception):
+    """대기 중인 작업이 한도를 넘어 새 작업을 받지 않음"""
+
+
+class BoundedExecutor:
+    """async 핸들러에서 블로킹 작업(SQLite 조회)을 돌리는 전용 스레드 풀
+
+    - 실행 중 + 대기 중인 작업이 max_pending개를 넘으면 Overloaded를 던져 대기열이 끝없이 늘지 않게 한다
+    - 같은 키의 작업이 이미 진행 중이면 새로 실행하지 않고 그 결과를 함께 기다린다 (single-flight)
+
+    run()은 이벤트 루프 스레드에서, submit()은 아무 스레드에서나 호출할 수 있다. 대기 건수는 작업 스레드의
+    완료 콜백에서도 바뀌므로 잠금으로 보호한다.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, thread_name_prefix: str = "search"):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.thread_name_prefix = thread_name_prefix
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._stats = {"submitted": 0, "coalesced": 0, "rejected": 0}
+        self.start()
+
+    def start(self) -> None:
+        """스레드 풀을 (다시) 만든다. shutdown() 뒤 같은 프로세스에서 앱이 다시 시작될 때 startup에서 호출한다"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.thread_name_prefix)
+
+    async def run(self, key: Hashable, fn: Callable, *args):
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._stats["coalesced"] += 1
+            # 기다리던 요청이 취소되어도 공유 작업은 계속 진행한다
+            return await asyncio.shield(inflight)
+
+        self._reserve()
+        # 요청의 contextvars(단계별 시간 기록 등)를 작업 스레드에서도 볼 수 있게 복사해 실행한다
+        context = contextvars.copy_context()
+        future = asyncio.get_running_loop().run_in_executor(self._executor, context.run, fn, *args)
+        self._inflight[key] = future
+
+        def done(_):
+            self._release()
+            self._inflight.pop(key, None)
+
+        future.add_done_callback(done)
+        return await asyncio.shield(future)
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """블로킹 코드에서 쓰는 제출. 한도를 넘으면 대기열에 넣지 않고 바로 Overloaded
+
+        시간 한도를 넘긴 호출자는 future.cancel()로 아직 시작하지 않은 작업을 대기열에서 뺄 수 있다.
+        """
+        self._reserve()
+        try:
+            future = self._executor.submit(contextvars.copy_context().run, fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def _reserve(self) -> None:
+        if self._executor is None:
+            raise RuntimeError("executor is shut down (call start() first)")
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._stats["rejected"] += 1
+                raise Overloaded(f"{self._pending} tasks pending")
+            self._pending += 1
+            self._stats["submitted"] += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats.update({"max_workers": self.max_workers, "max_pending": self.max_pending, "pending": self._pending})
+        return stats
+
+    def shutdown(self) -> None:
+        """대기 중인 작업을 취소하고 스레드 풀을 닫는다. start()로 다시 열 수 있다"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,148 @@
+import sqlite3
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from .normalize import canonical_author, compact, search_form, search_words, to_jamo
+from .suggest import SuggestIndexHolder
+
+# 어휘에 넣는 단어의 최소 길이(글자). 한 글자 단어는 오타 교정 후보로 쓰기에 너무 흔하다
+MIN_TERM_LENGTH = 2
+# 띄어쓰기 없이 입력한 제목도 교정할 수 있도록 이 길이 이하의 제목은 통째로도 어휘에 넣는다
+MAX_COMPACT_TITLE_LENGTH = 16
+
+
+def max_distance(length: int) -> int:
+    """자모 길이별 허용 편집 거리. 두 음절 단어(자모 4~6개)는 한 글자만 틀려도 다른 낱말이 되기 쉬워 1로 둔다"""
+    if length <= 6:
+        return 1
+    if length <= 12:
+        return 2
+    return 3
+
+
+def bigrams(jamo: str) -> List[str]:
+    """앞뒤 표시를 붙인 자모 바이그램 ("^ㅍ", "ㅍㅏ", ..., "ㅓ$")"""
+    padded = f"^{jamo}$"
+    return [padded[i:i + 2] for i in range(len(padded) - 1)]
+
+
+def bounded_levenshtein(a: str, b: str, limit: int) -> int:
+    """편집 거리. limit을 넘는 것이 확실해지면 limit + 1을 반환한다"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        best = i
+        for j, cb in enumerate(b, 1):
+            cost = previous[j - 1] + (ca != cb)
+            value = min(previous[j] + 1, current[j - 1] + 1, cost)
+            current.append(value)
+            best = min(best, value)
+        if best > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class FuzzyIndex:
+    """오타 교정용 어휘 색인
+
+    정규화한 제목 단어, 짧은 제목 전체(띄어쓰기 없이), 저자 이름(두 어순)을 어휘로 모으고 각 어휘의
+    자모 바이그램 역색인을 만든다. 질의 단어가 어휘에 없으면 바이그램을 많이 공유하는 후보만 골라
+    자모 편집 거리로 확인해, 가장 가깝고(동률이면 더 흔한) 어휘로 바꾼다.
+    """
+
+    def __init__(self, rows, data_version: Optional[str] = None):
+        started = time.perf_counter()
+        self.data_version = data_version
+        counts: Dict[str, int] = {}
+        for title, author in rows:
+            terms = {w for w in search_words(title) if len(w) >= MIN_TERM_LENGTH}
+            title_form = search_form(title)
+            if MIN_TERM_LENGTH <= len(title_form) <= MAX_COMPACT_TITLE_LENGTH:
+                terms.add(title_form)
+            canonical = canonical_author(author)
+            if canonical:
+                # 이름 전체(두 어순)와 이름을 이루는 단어 각각
+                terms.add(compact(canonical))
+                terms.add(compact(" ".join(reversed(canonical.split()))))
+                terms.update(w for w in canonical.split() if len(w) >= MIN_TERM_LENGTH)
+            for term in terms:
+                counts[term] = counts.get(term, 0) + 1
+
+        self.terms = list(counts)
+        self.counts = [counts[t] for t in self.terms]
+        self.term_ids = {t: i for i, t in enumerate(self.terms)}
+        self.jamo = [to_jamo(t) for t in self.terms]
+        postings: Dict[str, array] = {}
+        for i, jamo in enumerate(self.jamo):
+            for gram in set(bigrams(jamo)):
+                posting = postings.get(gram)
+                if posting is None:
+                    posting = postings[gram] = array("i")
+                posting.append(i)
+        self.postings = postings
+        self.build_seconds = time.perf_counter() - started
+
+    @classmethod
+    def from_db(cls, conn: sqlite3.Connection, data_version: Optional[str] = None) -> "FuzzyIndex":
+        return cls(conn.execute("SELECT title, author FROM books"), data_version)
+
+    def closest(self, term: str, deadline: float) -> Optional[str]:
+        """term과 가장 가까운 어휘. 후보가 없거나 deadline을 넘기면 그때까지 찾은 것 (없으면 None)"""
+        jamo = to_jamo(term)
+        limit = max_distance(len(jamo))
+        grams = set(bigrams(jamo))
+        # 편집 한 번은 바이그램을 최대 두 개 바꾸므로, 이만큼은 공유해야 후보가 된다
+        required = max(1, len(grams) - 2 * limit)
+
+        shared: Dict[int, int] = {}
+        # 드문 바이그램부터 세어 흔한 바이그램의 긴 목록은 마감 시간이 남을 때만 훑는다
+        for gram in sorted(grams, key=lambda g: len(self.postings.get(g, ()))):
+            for i in self.postings.get(gram, ()):
+                shared[i] = shared.get(i, 0) + 1
+            if time.perf_counter() > deadline:
+                break
+
+        best: Optional[Tuple[int, int, int]] = None  # (거리, -빈도, 어휘 번호)
+        candidates = sorted((i for i, n in shared.items() if n >= required), key=lambda i: -shared[i])
+        for position, i in enumerate(candidates):
+            if position % 64 == 0 and time.perf_counter() > deadline:
+                break
+            distance = bounded_levenshtein(jamo, self.jamo[i], limit if best is None else min(limit, best[0]))
+            if distance <= limit:
+                key = (distance, -self.counts[i], i)
+                if best is None or key < best:
+                    best = key
+        return self.terms[best[2]] if best is not None else None
+
+    def correct(self, q: str, budget_seconds: float) -> Optional[str]:
+        """어휘에 없는 단어를 가장 가까운 어휘로 바꾼 질의. 바꿀 단어가 없으면 None"""
+        deadline = time.perf_counter() + budget_seconds
+        words = search_words(q)
+        corrected = []
+        changed = False
+        for word in words:
+            replacement = None
+            if word not in self.term_ids and len(word) >= MIN_TERM_LENGTH:
+                replacement = self.closest(word, deadline)
+            corrected.append(replacement or word)
+            changed = changed or (replacement is not None and replacement != word)
+        return " ".join(corrected) if changed else None
+
+    def stats(self) -> Dict:
+        return {
+            "data_version": self.data_version,
+            "terms": len(self.terms),
+            "bigrams": len(self.postings),
+            "build_seconds": round(self.build_seconds, 3),
+        }
+
+
+class FuzzyIndexHolder(SuggestIndexHolder):
+    """data_version이 바뀌면 오타 교정 색인을 다시 만든다 (SuggestIndexHolder와 같은 규칙)"""
+
+    name = "Fuzzy"
+    index_class = FuzzyIndex
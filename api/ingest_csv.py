@@ -1,89 +1,536 @@
 import argparse
 import csv
+import hashlib
 import os
 import sqlite3
-from typing import Dict
+from typing import Dict, Iterator, Optional, Tuple
+
+try:
+    from .normalize import build_bigram_key, build_search_key
+except ImportError:  # python api/ingest_csv.py 로 직접 실행한 경우 (api/ 가 sys.path 첫 항목)
+    from normalize import build_bigram_key, build_search_key
 
 APP_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(APP_DIR, "books.db")
 
-SCHEMA_SQL = """
-CREATE TABLE IF NOT EXISTS books (
+BOOKS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS {table} (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     title TEXT,
     author TEXT,
     publisher TEXT,
     category TEXT,
     publish_date TEXT,
-    description TEXT
+    description TEXT,
+    kdc_class TEXT,
+    kdc_division TEXT,
+    search_key TEXT,
+    bigram_key TEXT,
+    book_key TEXT,
+    content_hash TEXT
 );
+"""
+
+SCHEMA_SQL = BOOKS_TABLE_SQL.format(table="books") + """
 CREATE INDEX IF NOT EXISTS idx_books_title ON books(title);
 CREATE INDEX IF NOT EXISTS idx_books_author ON books(author);
 CREATE INDEX IF NOT EXISTS idx_books_publisher ON books(publisher);
 CREATE INDEX IF NOT EXISTS idx_books_category ON books(category);
 CREATE INDEX IF NOT EXISTS idx_books_publish_date ON books(publish_date);
+-- 제목/저자순 정렬은 NOCASE 비교를 사용하므로 키셋 페이지네이션용 인덱스를 따로 둔다
+CREATE INDEX IF NOT EXISTS idx_books_title_nocase ON books(title COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_books_author_nocase ON books(author COLLATE NOCASE);
+-- data_version: books 데이터(도서 구성, 제목/저자 등)가 바뀔 때마다 증가. API 캐시와 자동완성 색인 무효화에 사용한다
+-- description_version: 설명 보강(enrich_books)처럼 설명만 바뀌었을 때 증가. 검색 응답 캐시만 무효화한다
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('data_version', '0');
+INSERT OR IGNORE INTO meta (key, value) VALUES ('description_version', '0');
+"""
+
+# 기존 DB에 없을 수 있는 컬럼. ensure_db가 ALTER TABLE로 추가한다
+BOOKS_MIGRATION_COLUMNS = {
+    "kdc_class": "TEXT",
+    "kdc_division": "TEXT",
+    "search_key": "TEXT",
+    "bigram_key": "TEXT",
+    "book_key": "TEXT",
+    "content_hash": "TEXT",
+}
+
+# 추가된 컬럼에 대한 인덱스는 컬럼이 생긴 뒤에 만든다
+MIGRATION_INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS idx_books_kdc_class ON books(kdc_class);
+CREATE INDEX IF NOT EXISTS idx_books_kdc_division ON books(kdc_division);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_books_book_key ON books(book_key);
+"""
+
+# 전문 검색용 FTS5 인덱스 (books 테이블을 content로 사용하는 external content 방식)
+# trigram 토크나이저는 띄어쓰기/형태소와 무관하게 3글자 단위로 잘라 한국어 부분 일치를 지원한다.
+# search_key는 적재 시 만든 정규화 검색 키(띄어쓰기 없는 제목, 두 어순의 저자 이름, 초성)다.
+# trigram은 3글자 미만 검색어를 찾지 못하므로, 두 글자 검색어는 적재 시 만든 바이그램 토큰(bigram_key)을
+# 단어 단위로 색인한 books_bigram에서 찾는다. 토큰 일치만 보므로 위치 정보 없이(detail=none) 작게 만든다.
+FTS_SCHEMA_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+    title, author, publisher, description, search_key,
+    content='books', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS books_fts_ai AFTER INSERT ON books BEGIN
+    INSERT INTO books_fts(rowid, title, author, publisher, description, search_key)
+    VALUES (new.id, new.title, new.author, new.publisher, new.description, new.search_key);
+END;
+CREATE TRIGGER IF NOT EXISTS books_fts_ad AFTER DELETE ON books BEGIN
+    INSERT INTO books_fts(books_fts, rowid, title, author, publisher, description, search_key)
+    VALUES ('delete', old.id, old.title, old.author, old.publisher, old.description, old.search_key);
+END;
+CREATE TRIGGER IF NOT EXISTS books_fts_au AFTER UPDATE OF title, author, publisher, description, search_key ON books BEGIN
+    INSERT INTO books_fts(books_fts, rowid, title, author, publisher, description, search_key)
+    VALUES ('delete', old.id, old.title, old.author, old.publisher, old.description, old.search_key);
+    INSERT INTO books_fts(rowid, title, author, publisher, description, search_key)
+    VALUES (new.id, new.title, new.author, new.publisher, new.description, new.search_key);
+END;
+CREATE VIRTUAL TABLE IF NOT EXISTS books_bigram USING fts5(
+    bigram_key, content='books', content_rowid='id', tokenize='unicode61 remove_diacritics 0', detail='none'
+);
+CREATE TRIGGER IF NOT EXISTS books_bigram_ai AFTER INSERT ON books BEGIN
+    INSERT INTO books_bigram(rowid, bigram_key) VALUES (new.id, new.bigram_key);
+END;
+CREATE TRIGGER IF NOT EXISTS books_bigram_ad AFTER DELETE ON books BEGIN
+    INSERT INTO books_bigram(books_bigram, rowid, bigram_key) VALUES ('delete', old.id, old.bigram_key);
+END;
+CREATE TRIGGER IF NOT EXISTS books_bigram_au AFTER UPDATE OF bigram_key ON books BEGIN
+    INSERT INTO books_bigram(books_bigram, rowid, bigram_key) VALUES ('delete', old.id, old.bigram_key);
+    INSERT INTO books_bigram(rowid, bigram_key) VALUES (new.id, new.bigram_key);
+END;
+"""
+
+# FTS 컬럼 구성이 바뀌면 기존 색인과 트리거를 지우고 FTS_SCHEMA_SQL로 다시 만든다
+DROP_FTS_SQL = """
+DROP TRIGGER IF EXISTS books_fts_ai;
+DROP TRIGGER IF EXISTS books_fts_ad;
+DROP TRIGGER IF EXISTS books_fts_au;
+DROP TABLE IF EXISTS books_fts;
 """
 
 INSERT_SQL = (
-    "INSERT INTO books (title, author, publisher, category, publish_date, description) "
-    "VALUES (?, ?, ?, ?, ?, ?)"
+    "INSERT INTO books (title, author, publisher, category, publish_date, description, "
+    "kdc_class, kdc_division, search_key, bigram_key, book_key, content_hash) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
 )
 
-def ensure_db():
-    conn = sqlite3.connect(DB_PATH)
+UPDATE_SQL = (
+    "UPDATE books SET title = ?, author = ?, publisher = ?, category = ?, publish_date = ?, "
+    "description = ?, kdc_class = ?, kdc_division = ?, search_key = ?, bigram_key = ?, book_key = ?, content_hash = ? "
+    "WHERE id = ?"
+)
+
+# 전체 재적재(기본/--fast/--rebuild) 때 이미 있는 도서(같은 book_key)는 기존 id를 그대로 넣고
+# (커서, 벡터 색인, 보강 원장이 id로 도서를 가리키므로), 새 도서만 id를 새로 받는다 (id가 NULL이면 새 id)
+INSERT_WITH_ID_SQL = INSERT_SQL.replace("INSERT INTO books (", "INSERT INTO books (id, ", 1).replace("VALUES (", "VALUES (?, ", 1)
+
+# 재구축(--rebuild) 시 데이터를 먼저 채우는 그림자 테이블
+SHADOW_TABLE = "books_shadow"
+SHADOW_INSERT_SQL = INSERT_WITH_ID_SQL.replace("INSERT INTO books (", f"INSERT INTO {SHADOW_TABLE} (", 1)
+
+
+def existing_book_ids(conn: sqlite3.Connection) -> Dict[str, int]:
+    """book_key → 지금 books에 있는 id. 전체 재적재가 같은 도서에 같은 id를 다시 주는 데 쓴다"""
+    if not table_exists(conn, "books"):
+        return {}
+    return dict(conn.execute("SELECT book_key, id FROM books WHERE book_key IS NOT NULL"))
+
+# 그림자 테이블을 books로 바꿔 끼우는 스크립트. executescript는 실행 전에 열린 트랜잭션을
+# 커밋하므로 BEGIN/COMMIT까지 한 스크립트에 넣어 교체 전체를 하나의 트랜잭션으로 만든다.
+# WAL 모드에서는 교체와 인덱스/FTS 구축이 커밋되기 전까지 읽기 요청이 이전 데이터를 그대로 본다.
+SWAP_SQL = f"""
+BEGIN IMMEDIATE;
+DROP TABLE IF EXISTS books_fts;
+DROP TABLE IF EXISTS books_bigram;
+DROP TABLE books;
+ALTER TABLE {SHADOW_TABLE} RENAME TO books;
+{SCHEMA_SQL}
+{MIGRATION_INDEX_SQL}
+{FTS_SCHEMA_SQL}
+INSERT INTO books_fts(books_fts) VALUES ('rebuild');
+INSERT INTO books_bigram(books_bigram) VALUES ('rebuild');
+UPDATE meta SET value = CAST(CAST(value AS INTEGER) + 1 AS TEXT) WHERE key = 'data_version';
+COMMIT;
+"""
+
+# CSV에서 읽는 필드 (INSERT_SQL 앞부분과 같은 순서)
+BOOK_FIELDS = ("title", "author", "publisher", "category", "publish_date", "description")
+
+# 도서를 식별하는 필드. 설명(description)만 바뀐 행은 같은 도서의 갱신으로 본다
+IDENTITY_FIELD_COUNT = 5  # title, author, publisher, category, publish_date
+
+
+def kdc_codes(category: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """청구기호(예: '843.6. K3마')에서 KDC 주류(8)와 강목(84)을 추출. 숫자로 시작하지 않으면 None"""
+    category = (category or "").strip()
+    if not category[:1].isdigit():
+        return None, None
+    division = category[:2] if category[1:2].isdigit() else None
+    return category[0], division
+
+
+def _digest(values) -> str:
+    return hashlib.sha1("\x1f".join(v or "" for v in values).encode("utf-8")).hexdigest()
+
+
+class BookKeyer:
+    """행마다 (book_key, content_hash)를 만든다
+
+    book_key는 식별 필드의 해시이며, 같은 식별 필드를 가진 행(복본)은 등장 순서 번호로 구분한다.
+    """
+
+    def __init__(self):
+        self._occurrences = {}
+
+    def __call__(self, fields) -> Tuple[str, str]:
+        identity = _digest(fields[:IDENTITY_FIELD_COUNT])
+        n = self._occurrences.get(identity, 0)
+        self._occurrences[identity] = n + 1
+        book_key = identity if n == 0 else f"{identity}#{n}"
+        return book_key, _digest(fields)
+
+
+def split_sql(script: str) -> list:
+    """SQL 스크립트를 문장 단위로 나눈다 (트리거 본문의 ';'도 올바르게 처리)"""
+    statements = []
+    current = ""
+    for line in script.splitlines(keepends=True):
+        current += line
+        if sqlite3.complete_statement(current):
+            statements.append(current.strip())
+            current = ""
+    return statements
+
+
+def table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type IN ('table', 'view') AND name = ?", (name,)
+    ).fetchone()
+    return row is not None
+
+
+def ensure_columns(conn: sqlite3.Connection, table: str, columns: Dict[str, str]) -> list:
+    """없는 컬럼을 추가하고, 새로 추가한 컬럼 이름 목록을 반환"""
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    added = []
+    for name, col_type in columns.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {col_type}")
+            added.append(name)
+    return added
+
+
+def bump_data_version(conn: sqlite3.Connection, key: str = "data_version") -> None:
+    conn.execute("UPDATE meta SET value = CAST(CAST(value AS INTEGER) + 1 AS TEXT) WHERE key = ?", (key,))
+
+
+def ensure_db(db_path: str = DB_PATH):
+    conn = sqlite3.connect(db_path)
     try:
         conn.executescript(SCHEMA_SQL)
+        added = ensure_columns(conn, "books", BOOKS_MIGRATION_COLUMNS)
+        if "kdc_class" in added or "kdc_division" in added:
+            conn.create_function("kdc_class_of", 1, lambda c: kdc_codes(c)[0], deterministic=True)
+            conn.create_function("kdc_division_of", 1, lambda c: kdc_codes(c)[1], deterministic=True)
+            conn.execute(
+                "UPDATE books SET kdc_class = kdc_class_of(category), "
+                "kdc_division = kdc_division_of(category)"
+            )
+        if "book_key" in added:
+            keyer = BookKeyer()
+            rows = conn.execute(
+                "SELECT id, title, author, publisher, category, publish_date, description "
+                "FROM books ORDER BY id"
+            ).fetchall()
+            conn.executemany(
+                "UPDATE books SET book_key = ?, content_hash = ? WHERE id = ?",
+                [keyer(row[1:]) + (row[0],) for row in rows],
+            )
+        # search_key가 없는 행(컬럼 추가 직후, 다른 경로로 넣은 행)은 여기서 채운다
+        conn.create_function("search_key_of", 2, build_search_key, deterministic=True)
+        conn.execute("UPDATE books SET search_key = search_key_of(title, author) WHERE search_key IS NULL")
+        conn.create_function("bigram_key_of", 5, build_bigram_key, deterministic=True)
+        conn.execute(
+            "UPDATE books SET bigram_key = bigram_key_of(title, author, publisher, description, search_key) "
+            "WHERE bigram_key IS NULL"
+        )
+        conn.executescript(MIGRATION_INDEX_SQL)
+        # 이전 컬럼 구성(search_key 없음)의 FTS 색인은 다시 만든다
+        if table_exists(conn, "books_fts"):
+            fts_columns = {row[1] for row in conn.execute("PRAGMA table_info(books_fts)")}
+            if "search_key" not in fts_columns:
+                conn.executescript(DROP_FTS_SQL)
+        # 기존 DB에 FTS 테이블이 새로 추가되는 경우 이미 적재된 행으로 색인을 채운다
+        missing = [name for name in ("books_fts", "books_bigram") if not table_exists(conn, name)]
+        conn.executescript(FTS_SCHEMA_SQL)
+        for name in missing:
+            conn.execute(f"INSERT INTO {name}({name}) VALUES ('rebuild')")
         conn.commit()
     finally:
         conn.close()
 
 
+def iter_csv_rows(
+    csv_path: str,
+    delimiter: str,
+    field_map: Dict[str, str],
+    encoding: str = "utf-8-sig",
+) -> Iterator[tuple]:
+    """CSV를 읽어 INSERT_SQL 순서의 튜플로 돌려준다"""
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"CSV not found: {csv_path}")
+
+    keyer = BookKeyer()
+    with open(csv_path, "r", encoding=encoding, newline="") as f:
+        # DictReader는 행마다 dict를 만들므로, 헤더에서 컬럼 위치만 구해 리스트에서 바로 꺼낸다
+        reader = csv.reader(f, delimiter=delimiter)
+        header = next(reader, [])
+        missing = [src for src in field_map.values() if src not in header]
+        if missing:
+            raise ValueError(f"CSV header missing required columns: {missing}")
+
+        positions = [header.index(field_map[name]) for name in BOOK_FIELDS]
+        width = max(positions) + 1
+        for row in reader:
+            if len(row) < width:
+                row.extend([""] * (width - len(row)))
+            fields = tuple(row[i].strip() for i in positions)
+            search_key = build_search_key(fields[0], fields[1])
+            bigram_key = build_bigram_key(fields[0], fields[1], fields[2], fields[5], search_key)
+            yield fields + kdc_codes(fields[3]) + (search_key, bigram_key) + keyer(fields)
+
+
 def load_csv(
     csv_path: str,
     delimiter: str,
     field_map: Dict[str, str],
     encoding: str = "utf-8-sig",
     batch_size: int = 5000,
+    db_path: str = DB_PATH,
 ):
     if not os.path.exists(csv_path):
         raise FileNotFoundError(f"CSV not found: {csv_path}")
 
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(db_path)
     try:
+        # DELETE는 AUTOINCREMENT 시퀀스를 되돌리지 않으므로 새 도서의 id는 예전 id와 겹치지 않는다
+        existing = existing_book_ids(conn)
         conn.execute("DELETE FROM books")
         conn.commit()
 
-        with open(csv_path, "r", encoding=encoding, newline="") as f:
-            reader = csv.DictReader(f, delimiter=delimiter)
-            missing = [src for src in field_map.values() if src not in reader.fieldnames]
-            if missing:
-                raise ValueError(f"CSV header missing required columns: {missing}")
-
-            buffer = []
-            total = 0
-            for row in reader:
-                title = (row.get(field_map["title"], "") or "").strip()
-                author = (row.get(field_map["author"], "") or "").strip()
-                publisher = (row.get(field_map["publisher"], "") or "").strip()
-                category = (row.get(field_map["category"], "") or "").strip()
-                publish_date = (row.get(field_map["publish_date"], "") or "").strip()
-                description = (row.get(field_map["description"], "") or "").strip()
-
-                buffer.append((title, author, publisher, category, publish_date, description))
-                if len(buffer) >= batch_size:
-                    conn.executemany(INSERT_SQL, buffer)
-                    conn.commit()
-                    total += len(buffer)
-                    print(f"Inserted: {total}")
-                    buffer.clear()
-
-            if buffer:
-                conn.executemany(INSERT_SQL, buffer)
+        buffer = []
+        total = 0
+        kept = 0
+        for row in iter_csv_rows(csv_path, delimiter, field_map, encoding):
+            book_id = existing.get(row[-2])
+            kept += book_id is not None
+            buffer.append((book_id,) + row)
+            if len(buffer) >= batch_size:
+                conn.executemany(INSERT_WITH_ID_SQL, buffer)
                 conn.commit()
                 total += len(buffer)
                 print(f"Inserted: {total}")
+                buffer.clear()
+
+        if buffer:
+            conn.executemany(INSERT_WITH_ID_SQL, buffer)
+            conn.commit()
+            total += len(buffer)
+            print(f"Inserted: {total}")
+        print(f"{kept} kept their id, {total - kept} new.")
+
+        bump_data_version(conn)
+        conn.commit()
+        print("Done.")
+    finally:
+        conn.close()
+
+
+def load_csv_fast(
+    csv_path: str,
+    delimiter: str,
+    field_map: Dict[str, str],
+    encoding: str = "utf-8-sig",
+    db_path: str = DB_PATH,
+) -> int:
+    """대량 적재 전용 경로
+
+    인덱스와 FTS 트리거를 내린 상태에서 전체를 한 트랜잭션으로 적재하고, 끝난 뒤 인덱스와
+    FTS 색인을 한 번에 만든 다음 ANALYZE로 통계를 갱신한다. WAL 모드이므로 커밋 전까지
+    읽기 요청은 기존 데이터를 본다. --rebuild와 마찬가지로 같은 book_key의 도서는 기존 id를 유지한다.
+    """
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"CSV not found: {csv_path}")
+
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA cache_size=-262144")
+        conn.execute("PRAGMA temp_store=MEMORY")
 
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for kind, name in conn.execute(
+                "SELECT type, name FROM sqlite_master WHERE tbl_name = 'books' AND "
+                "((type = 'index' AND sql IS NOT NULL) OR type = 'trigger')"
+            ).fetchall():
+                conn.execute(f"DROP {kind.upper()} {name}")
+            existing = existing_book_ids(conn)
+            conn.execute("DELETE FROM books")
+            conn.execute("INSERT INTO books_fts(books_fts) VALUES ('delete-all')")
+            conn.execute("INSERT INTO books_bigram(books_bigram) VALUES ('delete-all')")
+
+            # executemany에 제너레이터를 넘겨 CSV 전체를 메모리에 올리지 않고 적재한다
+            kept = 0
+
+            def rows_with_ids():
+                nonlocal kept
+                for row in iter_csv_rows(csv_path, delimiter, field_map, encoding):
+                    book_id = existing.get(row[-2])
+                    kept += book_id is not None
+                    yield (book_id,) + row
+
+            conn.executemany(INSERT_WITH_ID_SQL, rows_with_ids())
+            total = conn.execute("SELECT COUNT(*) FROM books").fetchone()[0]
+            print(f"Inserted: {total} ({kept} kept their id, {total - kept} new)")
+
+            for statement in split_sql(SCHEMA_SQL + MIGRATION_INDEX_SQL + FTS_SCHEMA_SQL):
+                conn.execute(statement)
+            conn.execute("INSERT INTO books_fts(books_fts) VALUES ('rebuild')")
+            conn.execute("INSERT INTO books_bigram(books_bigram) VALUES ('rebuild')")
+            bump_data_version(conn)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        conn.execute("ANALYZE")
         print("Done.")
+        return total
+    finally:
+        conn.close()
+
+
+def load_csv_incremental(
+    csv_path: str,
+    delimiter: str,
+    field_map: Dict[str, str],
+    encoding: str = "utf-8-sig",
+    batch_size: int = 5000,
+    db_path: str = DB_PATH,
+) -> Dict[str, int]:
+    """바뀐 행만 반영하는 증분 적재. 전체를 한 트랜잭션으로 처리하므로 중간 상태가 노출되지 않는다"""
+    conn = sqlite3.connect(db_path)
+    try:
+        existing = {
+            key: (book_id, content_hash)
+            for book_id, key, content_hash in conn.execute(
+                "SELECT id, book_key, content_hash FROM books"
+            )
+        }
+        counts = {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+        seen = set()
+        inserts = []
+        updates = []
+
+        def flush():
+            if inserts:
+                conn.executemany(INSERT_SQL, inserts)
+                inserts.clear()
+            if updates:
+                conn.executemany(UPDATE_SQL, updates)
+                updates.clear()
+
+        for row in iter_csv_rows(csv_path, delimiter, field_map, encoding):
+            book_key, content_hash = row[-2], row[-1]
+            seen.add(book_key)
+            current = existing.get(book_key)
+            if current is None:
+                inserts.append(row)
+                counts["inserted"] += 1
+            elif current[1] != content_hash:
+                updates.append(row + (current[0],))
+                counts["updated"] += 1
+            else:
+                counts["unchanged"] += 1
+            if len(inserts) + len(updates) >= batch_size:
+                flush()
+        flush()
+
+        # CSV에서 사라진 행 삭제
+        stale_ids = [(book_id,) for key, (book_id, _) in existing.items() if key not in seen]
+        conn.executemany("DELETE FROM books WHERE id = ?", stale_ids)
+        counts["deleted"] = len(stale_ids)
+
+        if counts["inserted"] or counts["updated"] or counts["deleted"]:
+            bump_data_version(conn)
+        conn.commit()
+        print(
+            f"Inserted: {counts['inserted']}, Updated: {counts['updated']}, "
+            f"Deleted: {counts['deleted']}, Unchanged: {counts['unchanged']}"
+        )
+        return counts
+    finally:
+        conn.close()
+
+
+def load_csv_rebuild(
+    csv_path: str,
+    delimiter: str,
+    field_map: Dict[str, str],
+    encoding: str = "utf-8-sig",
+    batch_size: int = 5000,
+    db_path: str = DB_PATH,
+):
+    """그림자 테이블에 적재한 뒤 한 트랜잭션으로 교체. 적재 중에도 API는 기존 데이터를 그대로 제공한다"""
+    conn = sqlite3.connect(db_path)
+    try:
+        # 그림자 테이블은 인덱스/트리거 없이 채우고, 인덱스는 교체 트랜잭션에서 한 번에 만든다
+        conn.execute(f"DROP TABLE IF EXISTS {SHADOW_TABLE}")
+        conn.executescript(BOOKS_TABLE_SQL.format(table=SHADOW_TABLE))
+
+        # 새 도서의 id가 지금까지 쓴 적 있는 id(삭제된 도서 포함)와 겹치지 않도록 시퀀스를 이어받는다
+        existing = existing_book_ids(conn)
+        if table_exists(conn, "books"):
+            row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'books'").fetchone()
+            last_id = max(row[0] if row else 0, conn.execute("SELECT COALESCE(MAX(id), 0) FROM books").fetchone()[0])
+            conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (SHADOW_TABLE, last_id))
+            conn.commit()
+
+        buffer = []
+        total = 0
+        kept = 0
+        for row in iter_csv_rows(csv_path, delimiter, field_map, encoding):
+            book_id = existing.get(row[-2])
+            kept += book_id is not None
+            buffer.append((book_id,) + row)
+            if len(buffer) >= batch_size:
+                conn.executemany(SHADOW_INSERT_SQL, buffer)
+                conn.commit()
+                total += len(buffer)
+                print(f"Staged: {total}")
+                buffer.clear()
+
+        if buffer:
+            conn.executemany(SHADOW_INSERT_SQL, buffer)
+            conn.commit()
+            total += len(buffer)
+            print(f"Staged: {total}")
+
+        try:
+            conn.executescript(SWAP_SQL)
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        print(f"Swapped in {total} rows ({kept} kept their id, {total - kept} new).")
     finally:
         conn.close()
 
@@ -93,6 +540,22 @@ def main():
     parser.add_argument("--csv", required=True, help="Path to CSV file")
     parser.add_argument("--delimiter", default=",", help="CSV delimiter (default ',')")
     parser.add_argument("--encoding", default="utf-8-sig", help="CSV encoding (default utf-8-sig)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Upsert changed rows and delete removed rows instead of reloading everything",
+    )
+    mode.add_argument(
+        "--fast",
+        action="store_true",
+        help="Bulk load in one transaction with deferred index/FTS build and ANALYZE",
+    )
+    mode.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Load into a shadow table and swap it in atomically (no empty table for live readers)",
+    )
 
     # CSV 헤더명 매핑
     parser.add_argument("--title", default="title", help="CSV column name for title")
@@ -115,7 +578,15 @@ def main():
         "description": args.description,
     }
 
-    load_csv(
+    if args.incremental:
+        loader = load_csv_incremental
+    elif args.rebuild:
+        loader = load_csv_rebuild
+    elif args.fast:
+        loader = load_csv_fast
+    else:
+        loader = load_csv
+    loader(
         csv_path=args.csv,
         delimiter=args.delimiter,
         field_map=field_map,
@@ -0,0 +1,162 @@
+import bisect
+import contextvars
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# 요청 하나의 단계별 소요 시간. 미들웨어가 요청마다 새로 넣고, 조회 스레드에는 copy_context로 전달한다
+_request_timings: contextvars.ContextVar[Optional["RequestTimings"]] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+# 느린 조회, 벡터 검색 오류 등 운영 중 확인할 경고를 남기는 로거
+logger = logging.getLogger("book_search")
+
+# 초 단위 히스토그램 버킷 (Prometheus 관례)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestTimings:
+    """단계 이름 → 누적 소요 시간(초). 같은 단계를 여러 번 재면 더한다"""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def server_timing(self, total: Optional[float] = None) -> str:
+        """Server-Timing 헤더 값 (dur는 밀리초)"""
+        with self._lock:
+            items = list(self.phases.items())
+        if total is not None:
+            items.append(("total", total))
+        return ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in items)
+
+
+def start_request() -> Tuple[RequestTimings, contextvars.Token]:
+    timings = RequestTimings()
+    return timings, _request_timings.set(timings)
+
+
+def end_request(token: contextvars.Token) -> None:
+    _request_timings.reset(token)
+
+
+def record(phase: str, seconds: float) -> None:
+    """현재 요청의 단계 시간을 기록하고 단계별 히스토그램에 반영한다 (요청 밖에서는 히스토그램만)"""
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.add(phase, seconds)
+    PHASE_DURATION.observe(seconds, phase=phase)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
+
+
+class Histogram:
+    """레이블별 누적 버킷 히스토그램 (Prometheus text 형식으로 내보낸다)"""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str], buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # 레이블 값 → (버킷별 개수, 합계, 전체 개수)
+        self._series: Dict[tuple, List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+        for key, (counts, total, count) in sorted(series.items()):
+            labels = ",".join(f'{name}="{value}"' for name, value in zip(self.label_names, key))
+            prefix = labels + "," if labels else ""
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {count}')
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{self.name}_sum{suffix} {total}")
+            lines.append(f"{self.name}_count{suffix} {count}")
+        return lines
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "path", "status"]
+)
+PHASE_DURATION = Histogram(
+    "search_phase_duration_seconds",
+    "Time spent per request phase (connection, count, fetch, rows, serialize, embedding, vector, fuzzy)",
+    ["phase"],
+)
+
+
+def render_metrics(gauges: Optional[Dict[str, float]] = None) -> str:
+    lines = REQUEST_DURATION.render() + PHASE_DURATION.render()
+    for name, value in (gauges or {}).items():
+        # 누적 값은 이름을 _total로 끝내 counter로 내보낸다
+        kind = "counter" if name.endswith("_total") else "gauge"
+        lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+class SlowQueryLog:
+    """threshold_ms 이상 걸린 SQL을 EXPLAIN QUERY PLAN과 함께 JSON 한 줄씩 기록한다"""
+
+    def __init__(self, path: Optional[str], threshold_ms: float):
+        self.path = path
+        self.threshold_ms = threshold_ms
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def check(self, conn: sqlite3.Connection, phase_name: str, sql: str, params: Sequence, seconds: float) -> None:
+        if self.threshold_ms <= 0 or seconds * 1000 < self.threshold_ms:
+            return
+        try:
+            plan = [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", list(params)).fetchall()]
+        except sqlite3.Error as e:
+            plan = [f"EXPLAIN failed: {e}"]
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "phase": phase_name,
+            "ms": round(seconds * 1000, 2),
+            "sql": " ".join(sql.split()),
+            "params": [p if isinstance(p, (int, float, str)) or p is None else repr(p) for p in params],
+            "plan": plan,
+        }
+        with self._lock:
+            self.count += 1
+            if self.path:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        logger.warning(
+            "Slow query (%s, %sms): %s | plan: %s", phase_name, entry["ms"], entry["sql"][:200], " / ".join(plan)
+        )
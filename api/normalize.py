@@ -0,0 +1,119 @@
+import re
+import unicodedata
+from typing import List, Optional
+
+# 한글 음절 → 초성 (유니코드 음절 = 0xAC00 + (초성 * 21 + 중성) * 28 + 종성)
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+# 입력 중인 낱자(호환용 자모)를 첫소리 자모(NFD 결과에 쓰이는 문자)로 바꾼다
+COMPAT_TO_LEADING = str.maketrans({c: chr(0x1100 + i) for i, c in enumerate(CHOSEONG)})
+# 음절 → 초성 변환표 (str.translate로 한 번에 바꾼다)
+SYLLABLE_TO_CHOSEONG = {code: CHOSEONG[(code - HANGUL_BASE) // 588] for code in range(HANGUL_BASE, HANGUL_LAST + 1)}
+
+# 검색 키에서 지우는 문장 부호 ("셔기 베인 : 장편소설" → "셔기 베인 장편소설")
+PUNCTUATION_RE = re.compile(r"[^\w\s]+")
+# 저자 뒤에 붙는 역할 표시 ("(ED)", "지음", "옮김", "편" 등)
+AUTHOR_ROLE_RE = re.compile(r"\s*\((?:eds?|editors?)\.?\)\s*$|\s+(?:지음|글|엮음|옮김|편|편저|저|역)$", re.IGNORECASE)
+# "성, 이름" 으로 볼 수 있는 한쪽 부분 (숫자 없이 네 단어 이하)
+NAME_PART_RE = re.compile(r"^[^\d,()]+$")
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """NFC 정규화, 소문자, 공백 접기 ("파이썬  프로그래밍" → "파이썬 프로그래밍")"""
+    return " ".join(unicodedata.normalize("NFC", text or "").lower().split())
+
+
+def compact(text: Optional[str]) -> str:
+    """소문자로 바꾸고 공백을 없앤 비교용 문자열 ("해리 포터" → "해리포터")"""
+    return "".join(normalize_text(text).split())
+
+
+def search_form(text: Optional[str]) -> str:
+    """띄어쓰기와 문장 부호를 무시하고 비교하기 위한 문자열 ("셔기 베인 : 소설" → "셔기베인소설")"""
+    return compact(PUNCTUATION_RE.sub(" ", normalize_text(text)))
+
+
+def search_words(text: Optional[str]) -> List[str]:
+    """문장 부호를 지운 단어 목록"""
+    return PUNCTUATION_RE.sub(" ", normalize_text(text)).split()
+
+
+def to_jamo(text: str) -> str:
+    """음절을 자모로 풀어 쓴 문자열 (색인 키)"""
+    return unicodedata.normalize("NFD", compact(text))
+
+
+def query_jamo(q: str) -> str:
+    """질의의 자모 문자열. 입력 중인 낱자도 첫소리로 바꿔 "해리ㅍ" 가 "해리포터" 의 접두사가 되게 한다"""
+    return to_jamo(q).translate(COMPAT_TO_LEADING)
+
+
+def to_choseong(text: str) -> str:
+    """한글 음절을 초성으로 바꾼 문자열 ("해리포터" → "ㅎㄹㅍㅌ"). 한글이 아닌 글자는 그대로 둔다"""
+    return compact(text).translate(SYLLABLE_TO_CHOSEONG)
+
+
+def has_hangul(text: str) -> bool:
+    return any(HANGUL_BASE <= ord(c) <= HANGUL_LAST for c in text)
+
+
+def is_choseong_query(text: str) -> bool:
+    text = compact(text)
+    return bool(text) and all(c in CHOSEONG for c in text)
+
+
+def strip_author_role(author: Optional[str]) -> str:
+    """역할 표시("(ED)", "지음" 등)를 지운 저자 이름"""
+    return AUTHOR_ROLE_RE.sub("", normalize_text(author)).strip()
+
+
+def canonical_author(author: Optional[str]) -> str:
+    """저자 이름을 "이름 성" 순서로 맞춘다 ("Karunatilaka, Shehan" → "shehan karunatilaka")
+
+    역할 표시를 지우고, 쉼표 하나로 나뉜 "성, 이름" 만 뒤집는다. "성, 이름, Jr" 처럼 접미어가 붙은 경우는
+    접미어를 맨 뒤에 둔다. 단체명 등 그 밖의 형태는 그대로 둔다.
+    """
+    name = strip_author_role(author)
+    parts = [p.strip() for p in name.split(",")]
+    suffix = []
+    if len(parts) == 3 and parts[2].rstrip(".") in ("jr", "sr", "ii", "iii"):
+        suffix = [parts.pop()]
+    if len(parts) == 2 and all(p and NAME_PART_RE.match(p) and len(p.split()) <= 4 for p in parts):
+        name = " ".join([parts[1], parts[0]] + suffix)
+    return " ".join(PUNCTUATION_RE.sub(" ", name).split())
+
+
+def build_bigram_key(*texts: Optional[str]) -> str:
+    """두 글자 검색어용 바이그램 토큰 ("장편소설" → "장편 편소 소설"). books.bigram_key, books_bigram 색인 대상
+
+    단어마다 이웃한 두 글자를 공백으로 이어 붙인다 (중복 제거). 두 글자 검색어는 단어 안 부분 일치가
+    이 토큰 하나와 같아지므로 trigram 색인이 못 찾는 "소설", "역사" 같은 질의도 색인으로 찾는다.
+    """
+    grams = {}
+    for text in texts:
+        for word in search_words(text):
+            for i in range(len(word) - 1):
+                grams[word[i:i + 2]] = None
+    return " ".join(grams)
+
+
+def build_search_key(title: Optional[str], author: Optional[str]) -> str:
+    """적재 시 만드는 정규화 검색 키 (books.search_key, FTS 색인 대상)
+
+    띄어쓰기와 문장 부호를 없앤 제목, 두 가지 어순의 저자 이름, 한글 제목/저자의 초성을 공백으로 이어 붙인다.
+    질의도 search_form()으로 같은 모양으로 바꿔 찾으므로 띄어쓰기·이름 순서·초성 입력 차이를 흡수한다.
+    """
+    keys = []
+    title_form = search_form(title)
+    if title_form:
+        keys.append(title_form)
+    # "이름 성" 과 원래(목록) 순서 "성 이름" 을 모두 넣는다
+    canonical = compact(canonical_author(author))
+    for form in (canonical, search_form(strip_author_role(author))):
+        if form and form not in keys:
+            keys.append(form)
+    for form in (title_form, canonical):
+        if form and has_hangul(form):
+            keys.append(to_choseong(form))
+    return " ".join(keys)
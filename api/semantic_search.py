@@ -1,29 +1,138 @@
 import os
 import json
-from typing import List, Dict, Optional
+import argparse
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Iterator, List, Dict, Optional
 from sentence_transformers import SentenceTransformer
-import chromadb
-from chromadb.config import Settings
 import numpy as np
 import pandas as pd
 
+from .cache import TTLCache
+from .embedding_cache import EmbeddingCache
+from .metrics import phase
+from .vector_store import BOOK_COLUMNS, VectorStore, create_vector_store
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+BOOKS_DB_PATH = os.path.join(APP_DIR, "books.db")
+
+# 벡터 DB에 들어 있는 도서 id와 그때 맥락 텍스트의 지문. 재색인 때 바뀐 도서만 다시 저장하고 사라진 도서를 지운다
+MANIFEST_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS indexed (
+    id INTEGER PRIMARY KEY,
+    fingerprint TEXT NOT NULL
+);
+"""
+
+
+def iter_book_chunks(db_path: str, chunk_size: int, after_id: int = 0) -> Iterator[List[Dict]]:
+    """books 테이블을 id 순으로 chunk_size개씩 읽는다 (after_id 다음부터)"""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        sql = f"SELECT {', '.join(BOOK_COLUMNS)} FROM books WHERE id > ? ORDER BY id LIMIT ?"
+        while True:
+            rows = conn.execute(sql, (after_id, chunk_size)).fetchall()
+            if not rows:
+                break
+            yield [dict(row) for row in rows]
+            after_id = rows[-1]["id"]
+    finally:
+        conn.close()
+
+
+def count_books(db_path: str, after_id: int = 0) -> int:
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM books WHERE id > ?", (after_id,)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def catalog_version(db_path: str) -> str:
+    """books.db의 data_version.description_version (적재/재구축/설명 보강 때마다 바뀐다). 메타 테이블이 없으면 0"""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        versions = dict(
+            conn.execute("SELECT key, value FROM meta WHERE key IN ('data_version', 'description_version')")
+        )
+    except sqlite3.OperationalError:
+        return "0"
+    finally:
+        conn.close()
+    return f"{versions.get('data_version', '0')}.{versions.get('description_version', '0')}"
+
+
+def book_ids(db_path: str) -> set:
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        return {row[0] for row in conn.execute("SELECT id FROM books")}
+    finally:
+        conn.close()
+
+
 class SemanticSearchEngine:
-    def __init__(self, db_path: str = "chroma_db"):
+    def __init__(
+        self,
+        db_path: str = "chroma_db",
+        use_embedding_cache: bool = True,
+        vector_backend: Optional[str] = None,
+        books_db_path: str = BOOKS_DB_PATH,
+    ):
         self.db_path = db_path
         self.model_name = "jhgan/ko-sroberta-multitask"  # 한국어 최적화 모델
+        started = time.perf_counter()
         self.embedding_model = SentenceTransformer(self.model_name)
-        
-        # ChromaDB 클라이언트 초기화
-        self.client = chromadb.PersistentClient(
-            path=db_path,
-            settings=Settings(anonymized_telemetry=False)
-        )
-        
-        # 컬렉션 생성 또는 가져오기
-        self.collection = self.client.get_or_create_collection(
-            name="books",
-            metadata={"hnsw:space": "cosine"}
+        self.load_seconds = time.perf_counter() - started
+        self.warmup_seconds = None
+
+        # 정규화한 검색어 → 질의 임베딩. 임베딩은 결정적이므로 만료 없이 LRU로만 관리
+        self.query_cache = TTLCache(
+            maxsize=int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "4096")), ttl=float("inf")
         )
+
+        # 맥락 텍스트가 같은 도서는 다시 임베딩하지 않도록 디스크 캐시를 사용
+        self.use_embedding_cache = use_embedding_cache
+
+        # 벡터 저장소: chroma(기본) 또는 numpy(메모리 매핑 행렬, 메타데이터는 books.db에서 조회)
+        self.vector_backend = vector_backend or os.getenv("VECTOR_BACKEND", "chroma")
+        self.books_db_path = books_db_path
+
+        # 둘 다 SQLite 핸들을 가지므로 처음 쓸 때 연다. api/serve.py 마스터는 모델만 올려 두고 fork하며,
+        # 워커가 각자 연다 (fork를 넘어간 SQLite 연결은 쓰면 안 된다)
+        self._embedding_cache: Optional[EmbeddingCache] = None
+        self._collection: Optional[VectorStore] = None
+        self._stores_lock = threading.Lock()
+
+    @property
+    def embedding_cache(self) -> Optional[EmbeddingCache]:
+        if self._embedding_cache is None and self.use_embedding_cache:
+            with self._stores_lock:
+                if self._embedding_cache is None:
+                    self._embedding_cache = EmbeddingCache(
+                        os.path.join(self.db_path, "embedding_cache"), self.model_name
+                    )
+        return self._embedding_cache
+
+    @property
+    def collection(self) -> VectorStore:
+        if self._collection is None:
+            with self._stores_lock:
+                if self._collection is None:
+                    self._collection = create_vector_store(self.vector_backend, self.db_path, self.books_db_path)
+        return self._collection
+
+    def close_stores(self) -> None:
+        """벡터 저장소와 임베딩 캐시를 닫는다. 다음에 쓸 때 다시 연다 (fork 전에 호출)"""
+        with self._stores_lock:
+            cache, self._embedding_cache = self._embedding_cache, None
+            store, self._collection = self._collection, None
+        if cache is not None:
+            cache.close()
+        if store is not None:
+            store.close()
     
     def create_context(self, book: Dict) -> str:
         """도서 정보를 검색에 적합한 맥락 텍스트로 변환"""
@@ -49,79 +158,321 @@ class SemanticSearchEngine:
         
         return " | ".join(context_parts)
     
-    def add_books(self, books: List[Dict]) -> None:
-        """도서 목록을 벡터 DB에 추가"""
+    def encode(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        """정규화된 float32 임베딩 생성"""
+        embeddings = self.embedding_model.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+        return embeddings.astype(np.float32, copy=False)
+
+    def warm_up(self) -> float:
+        """더미 문장을 한 번 인코딩해 첫 요청의 지연(지연 초기화, 커널 컴파일 등)을 미리 치른다"""
+        started = time.perf_counter()
+        self.encode(["도서 검색 준비"], batch_size=1)
+        self.warmup_seconds = time.perf_counter() - started
+        return self.warmup_seconds
+
+    def encode_query(self, query: str) -> np.ndarray:
+        """질의 임베딩 (같은 검색어는 캐시에서 반환)"""
+        normalized = " ".join(query.split())
+        embedding = self.query_cache.get(normalized)
+        if embedding is None:
+            embedding = self.encode([normalized], batch_size=1)[0]
+            embedding.setflags(write=False)
+            self.query_cache.set(normalized, embedding)
+        return embedding
+
+    def encode_queries(self, queries: List[str], batch_size: int = 64) -> np.ndarray:
+        """여러 질의를 한 번의 배치 인코딩으로 임베딩 (캐시에 있는 질의는 다시 인코딩하지 않는다)"""
+        normalized = [" ".join(query.split()) for query in queries]
+        embeddings = [self.query_cache.get(text) for text in normalized]
+        # 같은 질의가 여러 번 들어와도 한 번만 인코딩한다
+        missing = list(dict.fromkeys(text for text, emb in zip(normalized, embeddings) if emb is None))
+        if missing:
+            encoded = dict(zip(missing, self.encode(missing, batch_size=batch_size)))
+            for text, embedding in encoded.items():
+                embedding.setflags(write=False)
+                self.query_cache.set(text, embedding)
+            embeddings = [encoded[text] if emb is None else emb for text, emb in zip(normalized, embeddings)]
+        return np.vstack(embeddings)
+
+    def stats(self) -> Dict:
+        return {
+            "model": self.model_name,
+            "load_seconds": round(self.load_seconds, 3),
+            "warmup_seconds": None if self.warmup_seconds is None else round(self.warmup_seconds, 3),
+            "query_cache": self.query_cache.stats(),
+        }
+
+    def encode_contexts(self, contexts: List[str], batch_size: int = 64) -> np.ndarray:
+        """캐시에 없는 맥락 텍스트만 임베딩하고, 캐시된 벡터와 합쳐 입력 순서대로 반환"""
+        if self.embedding_cache is None:
+            return self.encode(contexts, batch_size=batch_size)
+
+        keys = [self.embedding_cache.key(context) for context in contexts]
+        cached = self.embedding_cache.get_many(keys)
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+
+        # 같은 청크 안의 중복 텍스트는 한 번만 인코딩
+        missing_keys = list(dict.fromkeys(keys[i] for i in missing))
+        if missing_keys:
+            first_index = {}
+            for i in missing:
+                first_index.setdefault(keys[i], i)
+            new_vectors = self.encode([contexts[first_index[key]] for key in missing_keys], batch_size=batch_size)
+            self.embedding_cache.put_many(missing_keys, new_vectors)
+            cached.update(zip(missing_keys, new_vectors))
+
+        return np.stack([cached[key] for key in keys]).astype(np.float32, copy=False)
+
+    def add_books(self, books: List[Dict], batch_size: int = 64, chunk_size: int = 1000) -> None:
+        """도서 목록을 벡터 DB에 추가 (chunk_size개씩 임베딩 후 바로 저장)"""
         if not books:
             return
-            
-        contexts = []
-        metadatas = []
-        ids = []
-        
-        for book in books:
-            context = self.create_context(book)
-            contexts.append(context)
-            metadatas.append(book)
-            ids.append(str(book.get('id', len(ids))))
-        
-        # 임베딩 생성 및 저장
-        embeddings = self.embedding_model.encode(contexts).tolist()
-        
-        self.collection.add(
+
+        for start in range(0, len(books), chunk_size):
+            chunk = books[start:start + chunk_size]
+            ids = [str(book.get('id', start + i)) for i, book in enumerate(chunk)]
+            self._add_chunk(chunk, ids, batch_size)
+
+        print(f"Added {len(books)} books to vector database")
+
+    def _add_chunk(self, books: List[Dict], ids: List[str], batch_size: int, contexts: Optional[List[str]] = None) -> None:
+        if contexts is None:
+            contexts = [self.create_context(book) for book in books]
+        # ChromaDB 메타데이터는 None 값을 허용하지 않는다
+        metadatas = [{k: v for k, v in book.items() if v is not None} for book in books]
+        embeddings = self.encode_contexts(contexts, batch_size=batch_size)
+
+        # upsert는 같은 id를 덮어쓰므로 중단 후 재실행해도 중복이 생기지 않는다
+        self.collection.upsert(
             embeddings=embeddings,
             documents=contexts,
             metadatas=metadatas,
             ids=ids
         )
-        
-        print(f"Added {len(books)} books to vector database")
+
+    def _checkpoint_path(self) -> str:
+        return os.path.join(self.db_path, "index_checkpoint.json")
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.db_path, "index_manifest.db")
+
+    def open_manifest(self) -> sqlite3.Connection:
+        os.makedirs(self.db_path, exist_ok=True)
+        conn = sqlite3.connect(self._manifest_path())
+        conn.executescript(MANIFEST_SCHEMA_SQL)
+        return conn
+
+    @staticmethod
+    def fingerprint(context: str) -> str:
+        return hashlib.sha1(context.encode("utf-8")).hexdigest()
+
+    def _sync_chunk(self, manifest: sqlite3.Connection, books: List[Dict], batch_size: int) -> int:
+        """맥락 텍스트가 벡터 DB에 저장된 것과 다른 도서만 임베딩/저장하고 그 수를 반환"""
+        contexts = [self.create_context(book) for book in books]
+        fingerprints = [self.fingerprint(context) for context in contexts]
+        stored = dict(
+            manifest.execute(
+                "SELECT id, fingerprint FROM indexed WHERE id BETWEEN ? AND ?", (books[0]["id"], books[-1]["id"])
+            )
+        )
+        changed = [i for i, book in enumerate(books) if stored.get(book["id"]) != fingerprints[i]]
+        if not changed:
+            return 0
+        self._add_chunk(
+            [books[i] for i in changed], [str(books[i]["id"]) for i in changed], batch_size, [contexts[i] for i in changed]
+        )
+        # 벡터를 먼저 저장하고 목록을 기록한다. 그 사이 중단되면 다음 실행이 같은 도서를 다시 upsert할 뿐이다
+        with manifest:
+            manifest.executemany(
+                "INSERT OR REPLACE INTO indexed (id, fingerprint) VALUES (?, ?)",
+                [(books[i]["id"], fingerprints[i]) for i in changed],
+            )
+        return len(changed)
+
+    def _remove_deleted(self, manifest: sqlite3.Connection, books_db_path: str, chunk_size: int) -> int:
+        """books.db에서 사라진 도서를 벡터 DB와 목록에서 지우고 그 수를 반환"""
+        current = book_ids(books_db_path)
+        stale = [book_id for (book_id,) in manifest.execute("SELECT id FROM indexed") if book_id not in current]
+        for start in range(0, len(stale), chunk_size):
+            part = stale[start:start + chunk_size]
+            self.collection.delete([str(book_id) for book_id in part])
+            with manifest:
+                manifest.executemany("DELETE FROM indexed WHERE id = ?", [(book_id,) for book_id in part])
+        return len(stale)
+
+    def load_checkpoint(self) -> Dict:
+        try:
+            with open(self._checkpoint_path(), "r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        # 다른 모델로 만든 체크포인트는 이어서 쓸 수 없다
+        if checkpoint.get("model") != self.model_name:
+            return {}
+        return checkpoint
+
+    def save_checkpoint(self, checkpoint: Dict) -> None:
+        os.makedirs(self.db_path, exist_ok=True)
+        tmp_path = self._checkpoint_path() + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, self._checkpoint_path())
+
+    def index_books_from_db(
+        self,
+        books_db_path: str = BOOKS_DB_PATH,
+        chunk_size: int = 1000,
+        batch_size: int = 64,
+        resume: bool = True,
+    ) -> Dict:
+        """books.db 전체를 chunk 단위로 읽어 바뀐 도서만 임베딩/저장. 체크포인트로 중단된 지점부터 재개한다
+
+        도서 id는 증분 적재/--rebuild/--fast에서도 유지되므로, 벡터 DB는 비우지 않고 id별 맥락 텍스트 지문
+        (index_manifest.db)과 비교해 바뀐 도서만 upsert하고, 한 바퀴를 다 돈 뒤 books.db에서 사라진 id를 지운다.
+        체크포인트는 data_version이 같을 때만 이어 쓴다. 버전이 바뀌었으면 처음부터 다시 훑되 내용이 그대로인
+        도서는 지문이 같아 건너뛴다.
+        """
+        data_version = catalog_version(books_db_path)
+        checkpoint = self.load_checkpoint() if resume else {}
+        if checkpoint and checkpoint.get("data_version") != data_version:
+            print(
+                f"Catalog changed since the checkpoint (data_version {checkpoint.get('data_version')} -> "
+                f"{data_version}), checking every book for changes"
+            )
+            checkpoint = {}
+        if checkpoint.get("complete"):
+            print(f"Vector DB is up to date with data_version {data_version}")
+            return {"indexed": 0, "unchanged": 0, "deleted": 0, "seconds": 0.0, "books_per_sec": 0.0}
+        last_id = checkpoint.get("last_id", 0)
+        remaining = count_books(books_db_path, last_id)
+        if last_id:
+            print(f"Resuming after id {last_id}")
+
+        manifest = self.open_manifest()
+        cache_before = self.embedding_cache.stats() if self.embedding_cache is not None else None
+        started = time.perf_counter()
+        done = 0
+        indexed = 0
+        try:
+            for books in iter_book_chunks(books_db_path, chunk_size, last_id):
+                indexed += self._sync_chunk(manifest, books, batch_size)
+                done += len(books)
+                last_id = books[-1]["id"]
+                self.save_checkpoint({"model": self.model_name, "data_version": data_version, "last_id": last_id})
+
+                elapsed = time.perf_counter() - started
+                print(f"Checked {done}/{remaining} books, {indexed} changed ({done / elapsed:.1f} books/sec)")
+
+            deleted = self._remove_deleted(manifest, books_db_path, chunk_size)
+            self.save_checkpoint(
+                {"model": self.model_name, "data_version": data_version, "last_id": last_id, "complete": True}
+            )
+        finally:
+            manifest.close()
+
+        elapsed = time.perf_counter() - started
+        rate = done / elapsed if elapsed > 0 else 0.0
+        print(
+            f"Done: {done} books checked in {elapsed:.1f}s ({rate:.1f} books/sec), "
+            f"{indexed} indexed, {done - indexed} unchanged, {deleted} deleted"
+        )
+        if cache_before is not None:
+            stats = self.embedding_cache.stats()
+            reused = stats["hits"] - cache_before["hits"]
+            encoded = stats["misses"] - cache_before["misses"]
+            print(f"Embedding cache: {reused} reused, {encoded} encoded")
+        return {"indexed": indexed, "unchanged": done - indexed, "deleted": deleted, "seconds": elapsed, "books_per_sec": rate}
     
+    @staticmethod
+    def _format_results(results: Dict, index: int) -> List[Dict]:
+        """벡터 DB 질의 결과 중 index번째 질의의 도서 목록 (유사도 내림차순)"""
+        books = []
+        for metadata, distance in zip(results['metadatas'][index], results['distances'][index]):
+            book = metadata.copy()
+            book['similarity_score'] = 1 - distance  # 거리를 유사도로 변환
+            books.append(book)
+        
+        # 유사도 순으로 정렬
+        books.sort(key=lambda x: x['similarity_score'], reverse=True)
+        return books
+
     def semantic_search(
         self, 
         query: str, 
         n_results: int = 20,
-        use_llm_enhancement: bool = False
+        use_llm_enhancement: bool = False,
+        where: Optional[Dict] = None
     ) -> List[Dict]:
-        """시맨틱 검색 수행"""
+        """시맨틱 검색 수행 (where: ChromaDB 메타데이터 필터, 예: {"kdc_class": "8"})"""
         if not query.strip():
             return []
         
         # 기본 검색: 사용자 질의를 직접 임베딩
-        query_embedding = self.embedding_model.encode([query])
+        with phase("embedding"):
+            query_embedding = self.encode_query(query)
         
         # 벡터 DB에서 유사도 검색
-        results = self.collection.query(
-            query_embeddings=query_embedding.tolist(),
-            n_results=n_results,
-            include=['metadatas', 'distances']
-        )
-        
-        # 결과 정리
-        books = []
-        for i, metadata in enumerate(results['metadatas'][0]):
-            book = metadata.copy()
-            book['similarity_score'] = 1 - results['distances'][0][i]  # 거리를 유사도로 변환
-            books.append(book)
-        
-        # 유사도 순으로 정렬
-        books.sort(key=lambda x: x['similarity_score'], reverse=True)
+        with phase("vector"):
+            results = self.collection.query(
+                query_embeddings=[query_embedding.tolist()],
+                n_results=n_results,
+                include=['metadatas', 'distances'],
+                where=where
+            )
         
-        return books
+        return self._format_results(results, 0)
+
+    def semantic_search_batch(
+        self,
+        queries: List[str],
+        n_results: int = 20,
+        where: Optional[Dict] = None,
+        chunk_size: int = 256,
+        batch_size: int = 64,
+    ) -> List[List[Dict]]:
+        """여러 질의를 한꺼번에 검색. 질의마다 semantic_search와 같은 모양의 목록을 입력 순서대로 반환
+
+        chunk_size개씩 묶어 배치 인코딩 한 번, 다중 질의 벡터 조회 한 번으로 처리한다.
+        """
+        results: List[List[Dict]] = [[] for _ in queries]
+        # 빈 질의는 semantic_search와 마찬가지로 빈 결과
+        positions = [i for i, query in enumerate(queries) if query.strip()]
+        for start in range(0, len(positions), chunk_size):
+            chunk = positions[start:start + chunk_size]
+            with phase("embedding"):
+                embeddings = self.encode_queries([queries[i] for i in chunk], batch_size=batch_size)
+            with phase("vector"):
+                found = self.collection.query(
+                    query_embeddings=embeddings,
+                    n_results=n_results,
+                    include=['metadatas', 'distances'],
+                    where=where
+                )
+            for j, i in enumerate(chunk):
+                results[i] = self._format_results(found, j)
+        return results
     
-    def get_recommendation_reason(self, book: Dict, query: str) -> str:
+    @staticmethod
+    def get_recommendation_reason(book: Dict, query: str) -> str:
         """도서 추천 이유 생성 (간단한 규칙 기반)"""
         reasons = []
         
-        if query.lower() in book.get('title', '').lower():
+        if query.lower() in (book.get('title') or '').lower():
             reasons.append("검색어가 제목에 포함되어 있습니다")
             
-        if query.lower() in book.get('author', '').lower():
+        if query.lower() in (book.get('author') or '').lower():
             reasons.append("검색어가 저자명과 일치합니다")
             
-        if query.lower() in book.get('category', '').lower():
+        if query.lower() in (book.get('category') or '').lower():
             reasons.append("검색어가 해당 카테고리에 속합니다")
             
-        if query.lower() in book.get('description', '').lower():
+        if query.lower() in (book.get('description') or '').lower():
             reasons.append("검색어가 도서 설명에 포함되어 있습니다")
         
         if not reasons:
@@ -132,19 +483,61 @@ class SemanticSearchEngine:
     
     def clear_database(self) -> None:
         """벡터 DB 초기화"""
-        self.client.delete_collection("books")
-        self.collection = self.client.create_collection(
-            name="books",
-            metadata={"hnsw:space": "cosine"}
-        )
+        self.collection.clear()
+        for path in (self._checkpoint_path(), self._manifest_path()):
+            if os.path.exists(path):
+                os.remove(path)
         print("Vector database cleared")
 
 # 전역 인스턴스
 search_engine = None
+_search_engine_lock = threading.Lock()
 
-def get_search_engine() -> SemanticSearchEngine:
+def get_search_engine(warm_up: bool = False) -> SemanticSearchEngine:
     """검색 엔진 인스턴스 반환 (싱글톤)"""
     global search_engine
     if search_engine is None:
-        search_engine = SemanticSearchEngine()
-    return search_engine 
\ No newline at end of file
+        # 동시에 들어온 첫 요청들이 모델을 여러 번 읽지 않도록 한다
+        with _search_engine_lock:
+            if search_engine is None:
+                # numpy 저장소는 메타데이터를 books.db에서 읽으므로 API와 같은 DB(BOOKS_DB_PATH)를 넘긴다
+                search_engine = SemanticSearchEngine(
+                    db_path=os.getenv("CHROMA_DB_PATH", "chroma_db"),
+                    books_db_path=os.getenv("BOOKS_DB_PATH", BOOKS_DB_PATH),
+                )
+    if warm_up and search_engine.warmup_seconds is None:
+        search_engine.warm_up()
+    return search_engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index books.db into the semantic search vector DB")
+    parser.add_argument("--books-db", default=BOOKS_DB_PATH, help="Path to books.db")
+    parser.add_argument("--chroma-db", default=os.getenv("CHROMA_DB_PATH", "chroma_db"), help="Vector DB path")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Books read and stored per chunk")
+    parser.add_argument("--batch-size", type=int, default=64, help="Encoder batch size")
+    parser.add_argument("--reset", action="store_true", help="Clear the vector DB and start from scratch")
+    parser.add_argument("--no-embedding-cache", action="store_true", help="Re-encode every book")
+    parser.add_argument(
+        "--backend", choices=["chroma", "numpy"], default=None, help="Vector store backend (default: VECTOR_BACKEND or chroma)"
+    )
+    args = parser.parse_args()
+
+    engine = SemanticSearchEngine(
+        db_path=args.chroma_db,
+        use_embedding_cache=not args.no_embedding_cache,
+        vector_backend=args.backend,
+        books_db_path=args.books_db,
+    )
+    if args.reset:
+        engine.clear_database()
+    engine.index_books_from_db(
+        books_db_path=args.books_db,
+        chunk_size=args.chunk_size,
+        batch_size=args.batch_size,
+        resume=not args.reset,
+    )
+
+
+if __name__ == "__main__":
+    main()
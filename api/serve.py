@@ -0,0 +1,191 @@
+"""멀티 프로세스 서버 실행기 (pre-fork)
+
+    python -m api.serve --workers 4 --port 8000
+
+마스터 프로세스가 앱을 import 해 preload()로 스키마 적용, 자동완성 색인, (SEMANTIC_WARMUP=1 이면) 임베딩 모델과
+벡터 색인 로드를 한 번만 마친 뒤 listen 소켓을 열고 워커를 fork 한다. 워커는 마스터의 메모리를 copy-on-write로
+공유하므로 워커 수만큼 모델/색인 메모리가 늘지 않고, 각자 uvicorn 이벤트 루프로 같은 소켓에서 요청을 받는다.
+
+- books.db는 기본적으로 immutable 읽기 전용 URI로 연다. 카탈로그를 재적재한 뒤에는 SIGHUP을 보내면
+  마스터가 다시 preload 하고 워커를 하나씩 교체한다 (그동안에도 나머지 워커가 요청을 받는다)
+- 죽은 워커는 다시 띄우고, SIGTERM/SIGINT를 받으면 워커에 전달한 뒤 종료를 기다린다
+- 벡터 저장소는 VECTOR_BACKEND=numpy(메모리 매핑 파일)를 권장한다. 페이지 캐시를 워커가 함께 쓴다
+"""
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict
+
+# 워커가 끝나기를 기다리는 최대 시간(초). 넘으면 SIGKILL
+GRACEFUL_TIMEOUT = 30
+# 워커가 연달아 죽을 때 다시 띄우기 전 대기 시간(초)
+RESPAWN_DELAY = 1.0
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(search_app, sock: socket.socket, log_level: str) -> None:
+    """fork된 워커에서 실행. 마스터의 신호 처리를 되돌리고 uvicorn에 맡긴다"""
+    import uvicorn
+
+    for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGCHLD):
+        signal.signal(sig, signal.SIG_DFL)
+    config = uvicorn.Config(search_app.app, log_level=log_level, lifespan="on", access_log=False)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class Master:
+    def __init__(self, search_app, sock: socket.socket, workers: int, log_level: str):
+        self.search_app = search_app
+        self.sock = sock
+        self.size = workers
+        self.log_level = log_level
+        self.workers: Dict[int, int] = {}  # pid → 워커 번호
+        self.stopping = False
+        self.reload_requested = False
+
+    def preload(self) -> None:
+        # 추론 스레드 풀은 fork 뒤에 만들어야 하므로 모델 워밍업은 워커 기동 시에 한다
+        self.search_app.preload(warm_up_model=False)
+        # fork된 워커의 startup이 preload를 다시 하지 않고 연결만 새로 열게 한다
+        self.search_app.app.state.preloaded = True
+        # SQLite 연결은 fork 경계를 넘겨 쓰면 안 되므로 닫고, 워커가 새로 연다
+        self.search_app.db_pool.close()
+        if self.search_app.SEMANTIC_WARMUP:
+            # 임베딩 모델 가중치만 공유하고, 벡터 저장소(Chroma)/임베딩 캐시의 SQLite 핸들은 워커가 각자 연다
+            from .semantic_search import get_search_engine
+
+            get_search_engine().close_stores()
+        # 이후 객체를 GC 대상에서 빼 워커의 GC가 공유 페이지를 건드려 복사되지 않게 한다
+        gc.collect()
+        gc.freeze()
+
+    def spawn(self, index: int) -> int:
+        pid = os.fork()
+        if pid == 0:
+            status = 0
+            try:
+                run_worker(self.search_app, self.sock, self.log_level)
+            except BaseException as e:
+                print(f"Worker {index} failed: {e}", file=sys.stderr)
+                status = 1
+            finally:
+                os._exit(status)
+        self.workers[pid] = index
+        print(f"Started worker {index} (pid {pid})")
+        return pid
+
+    def stop_worker(self, pid: int) -> None:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            return
+        deadline = time.monotonic() + GRACEFUL_TIMEOUT
+        while time.monotonic() < deadline:
+            done, _ = os.waitpid(pid, os.WNOHANG)
+            if done:
+                break
+            time.sleep(0.1)
+        else:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        self.workers.pop(pid, None)
+
+    def reload(self) -> None:
+        """다시 preload 하고 워커를 하나씩 교체한다"""
+        self.reload_requested = False
+        print("Reloading: preloading the catalog again")
+        gc.unfreeze()
+        self.preload()
+        for pid, index in list(self.workers.items()):
+            self.spawn(index)
+            self.stop_worker(pid)
+
+    def reap(self) -> None:
+        """종료된 워커를 거두고 (종료 중이 아니면) 다시 띄운다"""
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            index = self.workers.pop(pid, None)
+            if index is None or self.stopping:
+                continue
+            print(
+                f"Worker {index} (pid {pid}) exited with code {os.waitstatus_to_exitcode(status)}, restarting",
+                file=sys.stderr,
+            )
+            time.sleep(RESPAWN_DELAY)
+            self.spawn(index)
+
+    def run(self) -> None:
+        def stop(signum, frame):
+            self.stopping = True
+
+        def request_reload(signum, frame):
+            self.reload_requested = True
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        signal.signal(signal.SIGHUP, request_reload)
+
+        for index in range(self.size):
+            self.spawn(index)
+        while not self.stopping:
+            if self.reload_requested:
+                self.reload()
+            self.reap()
+            time.sleep(0.5)
+
+        print("Shutting down workers")
+        for pid in list(self.workers):
+            self.stop_worker(pid)
+        self.sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the Book Search API with pre-forked workers")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument(
+        "--workers", type=int, default=int(os.getenv("WEB_WORKERS", str(os.cpu_count() or 1))),
+        help="Worker processes (default: WEB_WORKERS or CPU count)",
+    )
+    parser.add_argument(
+        "--mutable", action="store_true",
+        help="Open books.db without immutable=1 (workers see re-ingested data without SIGHUP)",
+    )
+    parser.add_argument("--log-level", default="warning")
+    args = parser.parse_args()
+
+    # 앱 모듈이 import 시점에 환경 변수를 읽으므로 먼저 설정한다
+    os.environ["SQLITE_IMMUTABLE"] = "0" if args.mutable else "1"
+    from . import app as search_app
+
+    started = time.perf_counter()
+    sock = bind_socket(args.host, args.port)
+    master = Master(search_app, sock, args.workers, args.log_level)
+    master.preload()
+    print(
+        f"Preloaded in {time.perf_counter() - started:.2f}s, serving http://{args.host}:{args.port} "
+        f"with {args.workers} workers (master pid {os.getpid()})"
+    )
+    master.run()
+
+
+if __name__ == "__main__":
+    main()
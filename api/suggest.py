@@ -0,0 +1,180 @@
+import bisect
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .normalize import canonical_author, compact, is_choseong_query, query_jamo, to_choseong, to_jamo
+
+# 한 제목에서 단어 시작 위치로 만드는 키의 최대 수 (첫 단어 포함)
+MAX_WORD_KEYS = 4
+
+
+def word_suffixes(text: str) -> List[str]:
+    """각 단어 위치부터 끝까지의 문자열 ("빛의 과거" → ["빛의 과거", "과거"])"""
+    words = text.split()
+    return [" ".join(words[i:]) for i in range(min(len(words), MAX_WORD_KEYS))]
+
+
+def author_forms(author: str) -> List[str]:
+    """저자 이름의 두 어순 ("Karunatilaka, Shehan" → 그대로, "shehan karunatilaka"). /search의 search_key와 같은 규칙"""
+    forms = [author]
+    canonical = canonical_author(author)
+    if canonical and compact(canonical) != compact(author):
+        forms.append(canonical)
+    return forms
+
+
+class SuggestIndex:
+    """제목/저자 자동완성용 접두사 색인
+
+    (키, 항목 번호)를 키 순으로 정렬한 배열 두 개를 만든다. 하나는 자모로 풀어 쓴 키, 다른 하나는 초성 키다.
+    질의는 bisect로 첫 위치를 찾고 접두사가 같은 동안만 훑는다. 자모 키는 제목의 단어 시작 위치마다 만들어
+    중간 단어로 시작하는 입력도 찾는다.
+    """
+
+    # 접두사가 같은 키를 이만큼까지만 훑어 후보를 모은다 (짧은 질의에서 전체를 훑지 않도록)
+    SCAN_LIMIT = 500
+
+    def __init__(self, rows, data_version: Optional[str] = None):
+        started = time.perf_counter()
+        self.data_version = data_version
+        # 항목: (표시 문자열, 종류) → 도서 수
+        counts: Dict[Tuple[str, str], int] = {}
+        for title, author in rows:
+            for text, kind in ((title, "title"), (author, "author")):
+                text = " ".join((text or "").split())
+                if text:
+                    counts[(text, kind)] = counts.get((text, kind), 0) + 1
+
+        self.entries = list(counts)
+        self.counts = [counts[e] for e in self.entries]
+
+        jamo_keys = []
+        choseong_keys = []
+        for i, (text, kind) in enumerate(self.entries):
+            if kind == "title":
+                for position, suffix in enumerate(word_suffixes(text)):
+                    jamo_keys.append((to_jamo(suffix), position, i))
+                # 초성 입력은 대개 제목/저자 첫머리부터 친다
+                choseong_keys.append((to_choseong(text), 0, i))
+            else:
+                # 저자는 "성, 이름" 과 "이름 성" 어느 쪽으로 시작해도 맨 앞 일치로 본다
+                for form in author_forms(text):
+                    jamo_keys.append((to_jamo(form), 0, i))
+                    choseong_keys.append((to_choseong(form), 0, i))
+        jamo_keys.sort()
+        choseong_keys.sort()
+        self.jamo_keys = [k for k, _, _ in jamo_keys]
+        self.jamo_refs = [(p, i) for _, p, i in jamo_keys]
+        self.choseong_keys = [k for k, _, _ in choseong_keys]
+        self.choseong_refs = [(p, i) for _, p, i in choseong_keys]
+        self.build_seconds = time.perf_counter() - started
+
+    @classmethod
+    def from_db(cls, conn: sqlite3.Connection, data_version: Optional[str] = None) -> "SuggestIndex":
+        return cls(conn.execute("SELECT title, author FROM books"), data_version)
+
+    def _scan(self, keys: List[str], refs: List[Tuple[int, int]], prefix: str) -> Dict[int, int]:
+        """접두사가 일치하는 항목 번호 → 가장 앞선 단어 위치"""
+        found: Dict[int, int] = {}
+        start = bisect.bisect_left(keys, prefix)
+        for pos in range(start, min(start + self.SCAN_LIMIT, len(keys))):
+            if not keys[pos].startswith(prefix):
+                break
+            word_position, index = refs[pos]
+            if word_position < found.get(index, MAX_WORD_KEYS):
+                found[index] = word_position
+        return found
+
+    def suggest(self, q: str, limit: int = 10, kind: Optional[str] = None) -> List[Dict]:
+        if not compact(q):
+            return []
+        if is_choseong_query(q):
+            found = self._scan(self.choseong_keys, self.choseong_refs, compact(q))
+        else:
+            found = self._scan(self.jamo_keys, self.jamo_refs, query_jamo(q))
+
+        # 제목 맨 앞에서 일치 → 도서 수가 많은 순 → 짧은 순
+        ranked = sorted(
+            (i for i in found if kind is None or self.entries[i][1] == kind),
+            key=lambda i: (found[i] > 0, -self.counts[i], len(self.entries[i][0]), self.entries[i][0]),
+        )
+        return [
+            {"text": self.entries[i][0], "type": self.entries[i][1], "count": self.counts[i]}
+            for i in ranked[:limit]
+        ]
+
+    def stats(self) -> Dict:
+        return {
+            "data_version": self.data_version,
+            "entries": len(self.entries),
+            "keys": len(self.jamo_keys) + len(self.choseong_keys),
+            "build_seconds": round(self.build_seconds, 3),
+        }
+
+
+class SuggestIndexHolder:
+    """data_version이 바뀌면 색인을 다시 만든다
+
+    이미 색인이 있으면 백그라운드 스레드가 connect()로 연 별도 연결에서 다시 만들고, 그동안 요청은 이전 색인으로
+    바로 응답한다 (요청 스레드가 풀 연결과 실행기 자리를 잡은 채 전체 목록을 훑지 않도록). 색인이 아직 없거나
+    wait=True(기동/preload)일 때만 호출한 스레드에서 만들고 기다린다.
+    하위 클래스는 index_class(from_db, stats, data_version을 갖는 색인)만 바꿔 같은 규칙을 쓴다.
+    """
+
+    name = "Suggest"
+    index_class = SuggestIndex
+
+    def __init__(self, connect: Optional[Callable[[], sqlite3.Connection]] = None):
+        self.index = None
+        self.connect = connect
+        # 색인을 만드는 스레드는 하나뿐이다 (백그라운드 스레드가 잡으면 끝날 때 그 스레드가 푼다)
+        self._lock = threading.Lock()
+
+    def get(self, conn: sqlite3.Connection, data_version: str, wait: bool = False):
+        index = self.index
+        if index is not None and index.data_version == data_version:
+            return index
+        if index is not None and not wait and self.connect is not None:
+            self._rebuild_in_background(data_version)
+            return index
+        # 색인이 아직 없거나, 기동 중이거나, 따로 열 연결이 없으면 이 스레드에서 만든다
+        if index is not None and not wait:
+            if not self._lock.acquire(blocking=False):
+                return index
+        else:
+            self._lock.acquire()
+        try:
+            if self.index is None or self.index.data_version != data_version:
+                self._build(conn, data_version)
+            return self.index
+        finally:
+            self._lock.release()
+
+    def _build(self, conn: sqlite3.Connection, data_version: str) -> None:
+        self.index = self.index_class.from_db(conn, data_version)
+        print(f"{self.name} index built: {self.index.stats()}")
+
+    def _rebuild_in_background(self, data_version: str) -> None:
+        if not self._lock.acquire(blocking=False):
+            return  # 이미 다른 스레드가 만드는 중
+
+        def build():
+            try:
+                conn = self.connect()
+                try:
+                    if self.index is None or self.index.data_version != data_version:
+                        self._build(conn, data_version)
+                finally:
+                    conn.close()
+            except Exception as e:
+                print(f"{self.name} index rebuild failed, keeping data_version {self.index.data_version}: {e}")
+            finally:
+                self._lock.release()
+
+        threading.Thread(target=build, name=f"{self.name.lower()}-index", daemon=True).start()
+
+    def stats(self) -> Optional[Dict]:
+        index = self.index
+        return index.stats() if index is not None else None
@@ -0,0 +1,285 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .db_pool import readonly_uri
+
+# 서빙 중 books.db가 바뀌지 않는다고 보고 immutable로 연다 (api/serve.py 멀티 프로세스 실행기의 기본값)
+SQLITE_IMMUTABLE = os.getenv("SQLITE_IMMUTABLE", "0").lower() in ("1", "true", "yes")
+
+# 벡터 DB에 메타데이터로 함께 저장하는 도서 컬럼 (kdc_*는 분류 필터용)
+BOOK_COLUMNS = [
+    "id", "title", "author", "publisher", "category", "publish_date", "description",
+    "kdc_class", "kdc_division",
+]
+
+
+class VectorStore:
+    """SemanticSearchEngine이 사용하는 벡터 저장소 인터페이스
+
+    ChromaDB 컬렉션 API의 일부(upsert/query/count)와 같은 모양을 따르므로, query 결과는
+    {'ids': [[...]], 'metadatas': [[...]], 'distances': [[...]]} (질의별 목록, 거리 = 1 - 코사인 유사도)이다.
+    """
+
+    def upsert(self, embeddings, documents: List[str], metadatas: List[Dict], ids: List[str]) -> None:
+        raise NotImplementedError
+
+    def query(self, query_embeddings, n_results: int, include=None, where: Optional[Dict] = None) -> Dict:
+        raise NotImplementedError
+
+    def delete(self, ids: List[str]) -> None:
+        raise NotImplementedError
+
+    def count(self) -> int:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """열어 둔 핸들을 닫는다 (기본: 닫을 것 없음)"""
+
+
+class ChromaVectorStore(VectorStore):
+    """ChromaDB PersistentClient 기반 저장소"""
+
+    def __init__(self, path: str):
+        import chromadb
+        from chromadb.config import Settings
+
+        # ChromaDB 클라이언트 초기화
+        self.client = chromadb.PersistentClient(
+            path=path,
+            settings=Settings(anonymized_telemetry=False)
+        )
+
+        # 컬렉션 생성 또는 가져오기
+        self.collection = self.client.get_or_create_collection(
+            name="books",
+            metadata={"hnsw:space": "cosine"}
+        )
+
+    def upsert(self, embeddings, documents, metadatas, ids) -> None:
+        self.collection.upsert(
+            embeddings=np.asarray(embeddings).tolist(), documents=documents, metadatas=metadatas, ids=ids
+        )
+
+    def query(self, query_embeddings, n_results, include=None, where=None) -> Dict:
+        kwargs = {"where": where} if where else {}
+        return self.collection.query(
+            query_embeddings=np.asarray(query_embeddings, dtype=np.float32).tolist(),
+            n_results=n_results,
+            include=include or ['metadatas', 'distances'],
+            **kwargs
+        )
+
+    def delete(self, ids) -> None:
+        if ids:
+            self.collection.delete(ids=list(ids))
+
+    def count(self) -> int:
+        return self.collection.count()
+
+    def clear(self) -> None:
+        self.client.delete_collection("books")
+        self.collection = self.client.create_collection(
+            name="books",
+            metadata={"hnsw:space": "cosine"}
+        )
+
+    def close(self) -> None:
+        # PersistentClient는 경로별 시스템(SQLite 연결 포함)을 프로세스 전역에 캐시하므로, 그 캐시도 비워야
+        # 같은 경로로 다시 만들 때 새 연결을 연다
+        clear_system_cache = getattr(self.client, "clear_system_cache", None)
+        if clear_system_cache is not None:
+            clear_system_cache()
+        self.collection = None
+        self.client = None
+
+
+class NumpyVectorStore(VectorStore):
+    """메모리 매핑한 float16 행렬 기반의 가벼운 저장소
+
+    vectors.f16(N x dim)과 ids.i64(N)를 끝에 이어 쓰는 방식으로 저장하고 np.memmap으로 읽으므로,
+    여러 워커 프로세스가 같은 파일을 페이지 캐시로 공유한다. 같은 id가 다시 upsert되면 마지막 행이 유효하다.
+    삭제는 -(id + 1)을 id로 하는 0 벡터 행(묘비)을 덧붙여 기록하고, 마지막 행이 묘비인 id는 조회에서 뺀다.
+    메타데이터는 저장하지 않고 books.db에서 id로 다시 읽어 온다.
+    """
+
+    # 행렬 곱을 이 행 수 단위로 나눠 float32 변환에 드는 메모리를 제한한다
+    BLOCK_ROWS = 32768
+    # where 필터로 쓸 수 있는 books 컬럼
+    FILTER_COLUMNS = {"category", "kdc_class", "kdc_division", "publisher", "author"}
+
+    def __init__(self, path: str, books_db_path: str):
+        self.path = path
+        self.books_db_path = books_db_path
+        os.makedirs(path, exist_ok=True)
+        self.vectors_path = os.path.join(path, "vectors.f16")
+        self.ids_path = os.path.join(path, "ids.i64")
+        self.meta_path = os.path.join(path, "meta.json")
+        self._lock = threading.Lock()
+        self._loaded_rows = -1
+        # (ids, vectors, valid) — 다시 매핑할 때 한 번에 바꿔 끼워 조회 중인 스레드가 섞인 상태를 보지 않게 한다
+        self._data = None
+        self.dim = None
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                self.dim = json.load(f)["dim"]
+
+    def _rows_on_disk(self) -> int:
+        if not os.path.exists(self.ids_path):
+            return 0
+        return os.path.getsize(self.ids_path) // 8
+
+    def _load(self):
+        """파일이 커졌으면 다시 매핑하고 (ids, vectors, valid)를 반환"""
+        rows = self._rows_on_disk()
+        if rows == self._loaded_rows:
+            return self._data
+        with self._lock:
+            if rows == self._loaded_rows:
+                return self._data
+            if rows == 0 or self.dim is None:
+                ids = np.zeros(0, dtype=np.int64)
+                vectors = np.zeros((0, self.dim or 0), dtype=np.float16)
+                valid = np.zeros(0, dtype=bool)
+            else:
+                ids = np.memmap(self.ids_path, dtype=np.int64, mode="r", shape=(rows,))
+                vectors = np.memmap(self.vectors_path, dtype=np.float16, mode="r", shape=(rows, self.dim))
+                # id별 마지막 행만 유효 (묘비 행은 원래 id로 묶어 보고, 마지막 행이 묘비면 삭제된 것)
+                keys = np.where(ids < 0, -ids - 1, ids)
+                _, last_from_end = np.unique(keys[::-1], return_index=True)
+                valid = np.zeros(rows, dtype=bool)
+                valid[rows - 1 - last_from_end] = True
+                valid &= ids >= 0
+            self._data = (ids, vectors, valid)
+            self._loaded_rows = rows
+            return self._data
+
+    def upsert(self, embeddings, documents, metadatas, ids) -> None:
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if self.dim is None:
+            self.dim = int(vectors.shape[1])
+            with open(self.meta_path, "w", encoding="utf-8") as f:
+                json.dump({"dim": self.dim, "dtype": "float16"}, f)
+        # 벡터를 먼저 쓰고 id를 나중에 써서, 중단되더라도 id 수만큼의 행은 항상 완전하다
+        rows = self._rows_on_disk()
+        with open(self.vectors_path, "ab") as f:
+            f.truncate(rows * self.dim * 2)
+            f.write(vectors.astype(np.float16).tobytes())
+        with open(self.ids_path, "ab") as f:
+            f.write(np.asarray([int(i) for i in ids], dtype=np.int64).tobytes())
+
+    def delete(self, ids) -> None:
+        if not ids or self.dim is None:
+            return
+        tombstones = [-int(i) - 1 for i in ids]
+        self.upsert(np.zeros((len(tombstones), self.dim), dtype=np.float32), None, None, tombstones)
+
+    def count(self) -> int:
+        _, _, valid = self._load()
+        return int(valid.sum())
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in (self.vectors_path, self.ids_path, self.meta_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self.dim = None
+            self._loaded_rows = -1
+
+    def _allowed_mask(self, ids: np.ndarray, where: Optional[Dict]) -> Optional[np.ndarray]:
+        if not where:
+            return None
+        clauses = []
+        params = []
+        for column, value in where.items():
+            if column not in self.FILTER_COLUMNS:
+                raise ValueError(f"Unsupported filter column: {column}")
+            clauses.append(f"{column} = ?")
+            params.append(value)
+        conn = sqlite3.connect(readonly_uri(self.books_db_path, SQLITE_IMMUTABLE), uri=True)
+        try:
+            allowed = np.fromiter(
+                (row[0] for row in conn.execute(f"SELECT id FROM books WHERE {' AND '.join(clauses)}", params)),
+                dtype=np.int64,
+            )
+        finally:
+            conn.close()
+        return np.isin(ids, allowed)
+
+    def top_k(self, queries: np.ndarray, k: int, where: Optional[Dict] = None):
+        """질의 행렬(Q x dim)에 대해 (id 배열 목록, 유사도 배열 목록)을 반환"""
+        ids, vectors, valid = self._load()
+        queries = np.asarray(queries, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries[None, :]
+        queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+
+        mask = valid
+        allowed = self._allowed_mask(ids, where)
+        if allowed is not None:
+            mask = mask & allowed
+
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+        for start in range(0, len(ids), self.BLOCK_ROWS):
+            block_mask = mask[start:start + self.BLOCK_ROWS]
+            if not block_mask.any():
+                continue
+            rows = np.nonzero(block_mask)[0] + start
+            scores = queries @ np.asarray(vectors[rows], dtype=np.float32).T
+            # 블록 후보와 지금까지의 상위 k를 합쳐 다시 상위 k만 남긴다
+            scores = np.concatenate([best_scores, scores], axis=1)
+            candidates = np.concatenate([best_rows, np.broadcast_to(rows, (len(queries), len(rows)))], axis=1)
+            keep = min(k, scores.shape[1])
+            part = np.argpartition(-scores, keep - 1, axis=1)[:, :keep]
+            best_scores = np.take_along_axis(scores, part, axis=1)
+            best_rows = np.take_along_axis(candidates, part, axis=1)
+
+        order = np.argsort(-best_scores, axis=1, kind="stable")
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_rows = np.take_along_axis(best_rows, order, axis=1)
+        return [ids[r] for r in best_rows], list(best_scores)
+
+    def _fetch_books(self, ids) -> Dict[int, Dict]:
+        ids = [int(i) for i in ids]
+        if not ids:
+            return {}
+        conn = sqlite3.connect(readonly_uri(self.books_db_path, SQLITE_IMMUTABLE), uri=True)
+        conn.row_factory = sqlite3.Row
+        try:
+            books = {}
+            for start in range(0, len(ids), 500):
+                part = ids[start:start + 500]
+                sql = f"SELECT {', '.join(BOOK_COLUMNS)} FROM books WHERE id IN ({','.join('?' * len(part))})"
+                for row in conn.execute(sql, part):
+                    books[row["id"]] = {k: v for k, v in dict(row).items() if v is not None}
+            return books
+        finally:
+            conn.close()
+
+    def query(self, query_embeddings, n_results, include=None, where=None) -> Dict:
+        id_lists, score_lists = self.top_k(np.asarray(query_embeddings), n_results, where)
+        books = self._fetch_books(np.unique(np.concatenate(id_lists)) if id_lists else [])
+        result = {"ids": [], "metadatas": [], "distances": []}
+        for ids, scores in zip(id_lists, score_lists):
+            # books.db에서 사라진 도서는 건너뛴다
+            hits = [(int(i), float(s)) for i, s in zip(ids, scores) if int(i) in books]
+            result["ids"].append([str(i) for i, _ in hits])
+            result["metadatas"].append([books[i] for i, _ in hits])
+            result["distances"].append([1.0 - s for _, s in hits])
+        return result
+
+
+def create_vector_store(backend: str, path: str, books_db_path: str) -> VectorStore:
+    if backend == "chroma":
+        return ChromaVectorStore(path)
+    if backend == "numpy":
+        return NumpyVectorStore(path, books_db_path)
+    raise ValueError(f"Unknown vector backend: {backend}")
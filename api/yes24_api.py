@@ -1,13 +1,23 @@
 import requests
 from bs4 import BeautifulSoup
+import os
 import re
 import time
 from typing import Dict, List, Optional
 from urllib.parse import quote_plus, urljoin
 import json
 
+try:
+    from . import yes24_parser
+except ImportError:  # lxml이 없거나 패키지 밖에서 직접 실행한 경우
+    yes24_parser = None
+
 class Yes24BookAPI:
-    def __init__(self):
+    def __init__(self, html_parser: Optional[str] = None):
+        # 'lxml'(yes24_parser, 설치되어 있으면 기본) 또는 'html.parser'(BeautifulSoup). 결과 모양은 같다
+        self.html_parser = html_parser or os.getenv("YES24_PARSER") or ("lxml" if yes24_parser else "html.parser")
+        if self.html_parser == "lxml" and yes24_parser is None:
+            raise ImportError("lxml parser backend is not available")
         self.base_url = "https://www.yes24.com"
         self.search_url = "https://www.yes24.com/24/Goods/Search"
         self.headers = {
@@ -18,6 +28,9 @@ class Yes24BookAPI:
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         }
+        # 같은 호스트로의 연결(TCP/TLS)을 재사용한다
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
     
     def search_books(self, query: str, page: int = 1, max_results: int = 20) -> Dict:
         """도서 검색"""
@@ -31,16 +44,14 @@ class Yes24BookAPI:
                 'Sort': 'ACCURACY'  # 정확도순
             }
             
-            response = requests.get(
+            response = self.session.get(
                 self.search_url, 
                 params=params, 
-                headers=self.headers,
                 timeout=10
             )
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            books = self._parse_search_results(soup, max_results)
+            books = self.parse_search_page(response.content, max_results)
             
             return {
                 'success': True,
@@ -58,6 +69,18 @@ class Yes24BookAPI:
                 'items': []
             }
     
+    def parse_search_page(self, body: bytes, max_results: int) -> List[Dict]:
+        """검색/베스트셀러 결과 페이지 본문 파싱"""
+        if self.html_parser == "lxml":
+            return yes24_parser.parse_search_results(body, self.base_url, max_results)
+        return self._parse_search_results(BeautifulSoup(body, 'html.parser'), max_results)
+
+    def parse_detail_page(self, body: bytes) -> Dict:
+        """도서 상세 페이지 본문 파싱"""
+        if self.html_parser == "lxml":
+            return yes24_parser.parse_book_detail(body)
+        return self._parse_book_detail(BeautifulSoup(body, 'html.parser'))
+
     def _parse_search_results(self, soup: BeautifulSoup, max_results: int) -> List[Dict]:
         """검색 결과 파싱"""
         books = []
@@ -133,13 +156,11 @@ class Yes24BookAPI:
     def get_book_detail(self, book_url: str) -> Dict:
         """도서 상세 정보 조회"""
         try:
-            response = requests.get(book_url, headers=self.headers, timeout=10)
+            response = self.session.get(book_url, timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
             # 상세 정보 추출
-            detail = self._parse_book_detail(soup)
+            detail = self.parse_detail_page(response.content)
             
             return {
                 'success': True,
@@ -200,11 +221,10 @@ class Yes24BookAPI:
                 'Page': page
             }
             
-            response = requests.get(url, params=params, headers=self.headers, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            books = self._parse_search_results(soup, 20)
+            books = self.parse_search_page(response.content, 20)
             
             return {
                 'success': True,
@@ -0,0 +1,321 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+import httpx
+
+from .yes24_api import Yes24BookAPI
+
+# 재시도할 HTTP 상태 (과부하, 일시적 서버 오류)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RateLimiter:
+    """초당 요청 수를 제한하는 토큰 버킷 (burst만큼은 연달아 보낼 수 있다)"""
+
+    def __init__(self, rate_per_sec: float, burst: int = 1):
+        self.rate = rate_per_sec
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class ResponseCache:
+    """(URL, 파라미터) → 응답 본문을 SQLite 파일에 TTL과 함께 저장하는 캐시"""
+
+    def __init__(self, path: str, ttl: float):
+        self.ttl = ttl
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, url TEXT, fetched_at REAL, body BLOB)"
+        )
+        self.conn.commit()
+
+    @staticmethod
+    def key(url: str, params: Optional[Dict]) -> str:
+        query = urlencode(sorted((params or {}).items()))
+        return hashlib.sha1(f"{url}?{query}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self.conn.execute("SELECT fetched_at, body FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None or time.time() - row[0] > self.ttl:
+            return None
+        return row[1]
+
+    def set(self, key: str, url: str, body: bytes) -> None:
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, url, fetched_at, body) VALUES (?, ?, ?, ?)",
+                (key, url, time.time(), body),
+            )
+            self.conn.commit()
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            deleted = self.conn.execute(
+                "DELETE FROM responses WHERE fetched_at < ?", (time.time() - self.ttl,)
+            ).rowcount
+            self.conn.commit()
+        return deleted
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+
+class AsyncYes24Client:
+    """Yes24BookAPI의 비동기 버전
+
+    httpx.AsyncClient 하나로 연결을 재사용하고, 동시 요청 수(concurrency)와 초당 요청 수(rate_per_sec)를
+    제한하며, 네트워크 오류/429/5xx는 지터를 둔 지수 백오프로 재시도한다. 성공한 응답은 디스크 캐시에
+    cache_ttl초 동안 보관한다. 파싱은 Yes24BookAPI의 것을 그대로 쓰므로 결과 모양이 같다.
+
+    transport에 httpx.MockTransport(예: fixture_transport)를 넘기거나 base_url을 로컬 스텁 서버로
+    바꾸면 네트워크 없이 동작을 확인할 수 있다.
+    """
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        rate_per_sec: Optional[float] = None,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        timeout: float = 10.0,
+        cache_path: Optional[str] = None,
+        cache_ttl: Optional[float] = None,
+        base_url: str = "https://www.yes24.com",
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.parser = Yes24BookAPI()
+        self.base_url = base_url.rstrip("/")
+        self.parser.base_url = self.base_url
+        self.concurrency = concurrency or int(os.getenv("YES24_CONCURRENCY", "4"))
+        self.max_retries = max_retries
+        self.backoff = backoff
+        # 재시도 한 번을 기다리는 최대 시간(초). 서버가 Retry-After: 86400 을 보내도 작업이 하루 멈추지 않게 한다
+        self.max_backoff = max_backoff
+
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.rate_limiter = RateLimiter(
+            rate_per_sec if rate_per_sec is not None else float(os.getenv("YES24_RATE_PER_SEC", "2")),
+            burst=self.concurrency,
+        )
+
+        cache_path = cache_path if cache_path is not None else os.getenv("YES24_CACHE_PATH", "yes24_cache.db")
+        cache_ttl = cache_ttl if cache_ttl is not None else float(os.getenv("YES24_CACHE_TTL", "86400"))
+        # cache_path를 빈 문자열로 주면 캐시를 쓰지 않는다
+        self.cache = ResponseCache(cache_path, cache_ttl) if cache_path else None
+
+        headers = dict(self.parser.headers)
+        # httpx가 br 디코딩을 지원하지 않는 환경도 있으므로 gzip/deflate만 요청한다
+        headers["Accept-Encoding"] = "gzip, deflate"
+        self.client = httpx.AsyncClient(
+            headers=headers,
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+            transport=transport,
+        )
+        self._stats = {"requests": 0, "cache_hits": 0, "coalesced": 0, "retries": 0, "errors": 0}
+        # 캐시 키 → 진행 중인 요청. 같은 URL을 동시에 요청하면 한 번만 보낸다
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def __aenter__(self) -> "AsyncYes24Client":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+        if self.cache is not None:
+            self.cache.close()
+
+    def stats(self) -> Dict:
+        return dict(self._stats)
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        if response is not None and response.headers.get("Retry-After", "").isdigit():
+            return min(float(response.headers["Retry-After"]), self.max_backoff)
+        # full jitter: 0 ~ backoff * 2^attempt 사이에서 무작위로 기다려 재시도가 한꺼번에 몰리지 않게 한다
+        return random.uniform(0, min(self.backoff * (2 ** attempt), self.max_backoff))
+
+    async def fetch(self, url: str, params: Optional[Dict] = None) -> bytes:
+        """URL 본문을 가져온다 (캐시 → 동시성/속도 제한 → 재시도). 실패하면 httpx 예외"""
+        key = ResponseCache.key(url, params)
+        if self.cache is not None:
+            body = self.cache.get(key)
+            if body is not None:
+                self._stats["cache_hits"] += 1
+                return body
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._stats["coalesced"] += 1
+            return await asyncio.shield(inflight)
+        # 호출한 쪽이 취소되어도 같은 요청을 기다리는 다른 쪽을 위해 작업은 계속 진행한다
+        task = asyncio.ensure_future(self._fetch_remote(key, url, params))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _fetch_remote(self, key: str, url: str, params: Optional[Dict]) -> bytes:
+        attempt = 0
+        while True:
+            response = None
+            async with self.semaphore:
+                await self.rate_limiter.acquire()
+                self._stats["requests"] += 1
+                try:
+                    response = await self.client.get(url, params=params)
+                    if response.status_code not in RETRY_STATUSES:
+                        response.raise_for_status()
+                        break
+                    error = httpx.HTTPStatusError(
+                        f"HTTP {response.status_code}", request=response.request, response=response
+                    )
+                except httpx.TransportError as e:
+                    error = e
+                except httpx.HTTPStatusError:
+                    self._stats["errors"] += 1
+                    raise
+
+            if attempt >= self.max_retries:
+                self._stats["errors"] += 1
+                raise error
+            self._stats["retries"] += 1
+            # 세마포어를 놓은 상태에서 기다려 다른 요청을 막지 않는다
+            await asyncio.sleep(self._retry_delay(attempt, response))
+            attempt += 1
+
+        body = response.content
+        if self.cache is not None:
+            self.cache.set(key, url, body)
+        return body
+
+    def search_request(self, query: str, page: int = 1) -> Tuple[str, Dict]:
+        """도서 검색 요청의 (URL, 파라미터)"""
+        params = {
+            'Query': query,
+            'QueryType': 'GOODS',
+            'SearchTarget': 'BOOK',
+            'Page': page,
+            'Sort': 'ACCURACY'  # 정확도순
+        }
+        return f"{self.base_url}/24/Goods/Search", params
+
+    async def search_books(self, query: str, page: int = 1, max_results: int = 20) -> Dict:
+        """도서 검색"""
+        try:
+            body = await self.fetch(*self.search_request(query, page))
+            books = self.parser.parse_search_page(body, max_results)
+            return {
+                'success': True,
+                'query': query,
+                'total': len(books),
+                'page': page,
+                'items': books
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'query': query,
+                'items': []
+            }
+
+    async def search_by_isbn(self, isbn: str) -> Dict:
+        """ISBN으로 도서 검색"""
+        return await self.search_books(isbn, page=1, max_results=5)
+
+    async def get_book_detail(self, book_url: str) -> Dict:
+        """도서 상세 정보 조회"""
+        try:
+            body = await self.fetch(book_url)
+            return {
+                'success': True,
+                'detail': self.parser.parse_detail_page(body)
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+
+    async def get_bestsellers(self, category: str = 'BOOK', page: int = 1) -> Dict:
+        """베스트셀러 조회"""
+        params = {
+            'CategoryNumber': '001',
+            'Page': page
+        }
+        try:
+            body = await self.fetch(f"{self.base_url}/24/Category/BestSeller", params)
+            return {
+                'success': True,
+                'category': category,
+                'page': page,
+                'items': self.parser.parse_search_page(body, 20)
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'items': []
+            }
+
+    async def search_many(self, queries: List[str], max_results: int = 20) -> List[Dict]:
+        """여러 검색어를 동시에 검색 (동시성/속도 제한은 fetch에서 적용)"""
+        return await asyncio.gather(*(self.search_books(q, max_results=max_results) for q in queries))
+
+
+def fixture_transport(routes: Dict[str, str]) -> httpx.MockTransport:
+    """경로 → 저장해 둔 HTML 파일로 응답하는 오프라인용 transport (예: {"/24/Goods/Search": "search.html"})"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = routes.get(request.url.path)
+        if path is None:
+            return httpx.Response(404)
+        with open(path, "rb") as f:
+            return httpx.Response(200, content=f.read(), headers={"Content-Type": "text/html; charset=utf-8"})
+
+    return httpx.MockTransport(handler)
+
+
+async def _main(queries: List[str]) -> None:
+    async with AsyncYes24Client() as client:
+        started = time.perf_counter()
+        results = await client.search_many(queries, max_results=5)
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        print(f"{len(queries)} queries in {time.perf_counter() - started:.2f}s, stats: {client.stats()}")
+
+
+# 사용 예시: python -m api.yes24_client 파이썬 데이터과학 소설
+if __name__ == "__main__":
+    import sys
+
+    asyncio.run(_main(sys.argv[1:] or ["파이썬 프로그래밍"]))
@@ -0,0 +1,158 @@
+"""lxml 기반 Yes24 페이지 파서
+
+Yes24BookAPI._parse_search_results / _parse_book_detail(BeautifulSoup html.parser)과 같은 결과를 만든다.
+트리를 lxml(C)로 만들고 문서를 한 번만 훑으며 필요한 요소를 모으므로, 항목마다 find_previous로
+문서를 거꾸로 훑던 비용이 없다.
+"""
+import re
+from typing import Dict, List, Optional, Union
+from urllib.parse import urljoin
+
+import lxml.html
+
+# BeautifulSoup get_text()가 건너뛰는 요소
+SKIP_TEXT_TAGS = {"script", "style"}
+
+# 상세 페이지에서 찾는 (태그, 클래스) → 결과 키
+DETAIL_FIELDS = {
+    ("div", "gd_detail"): "description",
+    ("div", "gd_toc"): "table_of_contents",
+    ("span", "gd_date"): "publication_date",
+    ("span", "gd_pages"): "pages",
+    ("span", "gd_size"): "size",
+}
+
+
+def _parse(body: Union[bytes, str]):
+    if isinstance(body, bytes):
+        try:
+            body = body.decode("utf-8")
+        except UnicodeDecodeError:
+            body = body.decode("cp949", errors="replace")
+    if not body.strip():
+        return None
+    return lxml.html.document_fromstring(body)
+
+
+def _classes(el) -> List[str]:
+    return (el.get("class") or "").split()
+
+
+def _collect_text(el, parts: List[str]) -> None:
+    if el.text:
+        parts.append(el.text)
+    for child in el:
+        # 주석/처리 명령은 tag가 문자열이 아니다
+        if isinstance(child.tag, str) and child.tag not in SKIP_TEXT_TAGS:
+            _collect_text(child, parts)
+        if child.tail:
+            parts.append(child.tail)
+
+
+def _text(el) -> str:
+    """BeautifulSoup get_text(strip=True)와 같은 결과 (텍스트 조각마다 strip 후 이어 붙임)"""
+    if el is None:
+        return ""
+    parts: List[str] = []
+    _collect_text(el, parts)
+    return "".join(part.strip() for part in parts)
+
+
+def _find(el, tag: str, class_name: str):
+    for child in el.iter(tag):
+        if child is not el and class_name in _classes(child):
+            return child
+    return None
+
+
+def _extract_book_info(item, cover_box, base_url: str) -> Optional[Dict]:
+    # 제목
+    title_elem = _find(item, "a", "gd_name")
+    title = _text(title_elem)
+
+    # 링크
+    link = title_elem.get("href") if title_elem is not None else ""
+    if link and not link.startswith("http"):
+        link = urljoin(base_url, link)
+
+    # 저자, 출판사, 가격
+    author = _text(_find(item, "span", "authPub"))
+    publisher = _text(_find(item, "span", "pub"))
+    price = _text(_find(item, "span", "price"))
+
+    # 표지 이미지: 항목 앞에 나온 가장 가까운 item_img. 앞에 표지 영역이 하나도 없는 항목은
+    # BeautifulSoup 백엔드(find_previous가 None)와 같이 결과에서 뺀다
+    if cover_box is None:
+        print(f"도서 정보 추출 건너뜀: 앞에 표지 영역(item_img)이 없는 항목 ({title or link or '제목 없음'})")
+        return None
+    cover_elem = next(cover_box.iter("img"), None)
+    cover_image = ""
+    if cover_elem is not None:
+        cover_image = cover_elem.get("src") or cover_elem.get("data-original", "")
+        if cover_image and not cover_image.startswith("http"):
+            cover_image = urljoin(base_url, cover_image)
+
+    # ISBN (링크에서 추출)
+    isbn = ""
+    if link:
+        isbn_match = re.search(r"/(\d+)$", link)
+        if isbn_match:
+            isbn = isbn_match.group(1)
+
+    return {
+        "title": title,
+        "author": author,
+        "publisher": publisher,
+        "price": price,
+        "cover_image": cover_image,
+        "link": link,
+        "isbn": isbn,
+        "source": "yes24",
+    }
+
+
+def parse_search_results(body: Union[bytes, str], base_url: str, max_results: int) -> List[Dict]:
+    """검색/베스트셀러 결과 페이지 파싱"""
+    root = _parse(body)
+    if root is None or max_results <= 0:
+        return []
+
+    # 문서 순서대로 훑으며 각 item_info 직전에 나온 item_img를 짝지어 둔다
+    items = []
+    cover_box = None
+    for el in root.iter("div"):
+        classes = _classes(el)
+        if "item_info" in classes:
+            items.append((el, cover_box))
+            if len(items) >= max_results:
+                break
+        if "item_img" in classes:
+            cover_box = el
+
+    books = []
+    for item, box in items:
+        try:
+            book = _extract_book_info(item, box, base_url)
+            if book:
+                books.append(book)
+        except Exception as e:
+            print(f"도서 정보 추출 오류: {e}")
+    return books
+
+
+def parse_book_detail(body: Union[bytes, str]) -> Dict:
+    """도서 상세 페이지 파싱"""
+    root = _parse(body)
+    if root is None:
+        return {}
+
+    found = {}
+    for el in root.iter("div", "span"):
+        for class_name in _classes(el):
+            key = DETAIL_FIELDS.get((el.tag, class_name))
+            if key is not None and key not in found:
+                found[key] = el
+        if len(found) == len(DETAIL_FIELDS):
+            break
+    # 원래 파서와 같은 키 순서
+    return {key: _text(found[key]) for key in DETAIL_FIELDS.values() if key in found}
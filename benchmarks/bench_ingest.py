@@ -0,0 +1,90 @@
+"""ingest_csv 적재 속도 벤치마크
+
+your_books.csv를 원하는 행 수까지 반복해 확장한 CSV를 만들고, 적재 방식별 소요 시간을 비교한다.
+
+    python -m benchmarks.bench_ingest --rows 1000000
+"""
+import argparse
+import csv
+import os
+import sqlite3
+import tempfile
+import time
+
+from api import ingest_csv
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_CSV = os.path.join(REPO_DIR, "your_books.csv")
+
+LOADERS = {
+    "default": ingest_csv.load_csv,
+    "fast": ingest_csv.load_csv_fast,
+    "rebuild": ingest_csv.load_csv_rebuild,
+}
+
+
+def make_scaled_csv(path: str, rows: int, source: str = SOURCE_CSV) -> None:
+    """원본 행을 반복하되, 반복 회차를 제목에 붙여 서로 다른 도서로 만든다"""
+    with open(source, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        base = list(reader)
+    title_pos = header.index("title")
+
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        written = 0
+        round_no = 0
+        while written < rows:
+            chunk = base[: rows - written]
+            for row in chunk:
+                if round_no:
+                    row = list(row)
+                    row[title_pos] = f"{row[title_pos]} ({round_no})"
+                writer.writerow(row)
+            written += len(chunk)
+            round_no += 1
+
+
+def run(mode: str, csv_path: str, work_dir: str) -> float:
+    db_path = os.path.join(work_dir, f"{mode}.db")
+    ingest_csv.ensure_db(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.close()
+
+    field_map = {name: name for name in ingest_csv.BOOK_FIELDS}
+    started = time.perf_counter()
+    LOADERS[mode](csv_path=csv_path, delimiter=",", field_map=field_map, encoding="utf-8", db_path=db_path)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ingest_csv load modes")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows in the scaled CSV")
+    parser.add_argument(
+        "--modes", nargs="+", default=["default", "fast"], choices=sorted(LOADERS), help="Load modes to compare"
+    )
+    parser.add_argument("--work-dir", default=None, help="Directory for the scaled CSV and DBs (default: temp)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.work_dir) as work_dir:
+        csv_path = os.path.join(work_dir, "scaled_books.csv")
+        make_scaled_csv(csv_path, args.rows)
+        print(f"Scaled CSV: {args.rows} rows")
+
+        results = {}
+        for mode in args.modes:
+            results[mode] = run(mode, csv_path, work_dir)
+
+        print()
+        print(f"{'mode':<10}{'seconds':>10}{'rows/sec':>12}{'speedup':>10}")
+        baseline = results.get("default")
+        for mode, seconds in results.items():
+            speedup = f"{baseline / seconds:.2f}x" if baseline else "-"
+            print(f"{mode:<10}{seconds:>10.2f}{args.rows / seconds:>12.0f}{speedup:>10}")
+
+
+if __name__ == "__main__":
+    main()
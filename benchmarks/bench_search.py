@@ -0,0 +1,410 @@
+"""검색 API 벤치마크 / 부하 테스트
+
+your_books.csv의 제목 단어, 저자, 출판사, 청구기호 분포를 따라 원하는 규모의 합성 카탈로그를 만들고,
+적재(ingest_csv) 시간과 실제 사용과 비슷한 질의 조합을 FastAPI 앱에 프로세스 안에서 동시에 보냈을 때의
+지연 시간(p50/p95/p99), QPS, 최대 RSS를 측정해 JSON으로 남긴다. 규모별 단계는 별도 프로세스에서 실행해
+RSS가 섞이지 않게 한다.
+
+    python -m benchmarks.bench_search --rows 30000 300000 3000000 --output results.json
+    python -m benchmarks.bench_search --rows 30000 --compare results.json   # 이전 결과와 비교
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import platform
+import random
+import resource
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_CSV = os.path.join(REPO_DIR, "your_books.csv")
+
+# 질의 종류별 비중
+QUERY_MIX = {
+    "short_term": 20,   # 2글자 한국어 검색어 (trigram 대신 바이그램 색인 books_bigram으로 처리)
+    "term": 25,         # 3글자 이상 제목 단어 (FTS)
+    "multi_term": 10,   # 제목 단어 두 개
+    "author": 15,       # 저자 이름
+    "browse": 10,       # 검색어 없이 목록 보기
+    "category": 12,     # KDC 주류/강목 필터 (검색어 유무 섞음)
+    "deep_page": 8,     # OFFSET이 큰 깊은 페이지
+}
+
+HANGUL_SYLLABLES = [chr(c) for c in range(0xAC00, 0xD7A4)]
+
+
+def load_source(source: str = SOURCE_CSV) -> Dict[str, list]:
+    with open(source, "r", encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.DictReader(f))
+    titles = [r["title"].split() for r in rows if r["title"].strip()]
+    authors = [r["author"] for r in rows if r["author"].strip()]
+    # 한국어 이름(2~4음절)에서 성과 이름 음절 분포를 얻는다
+    korean_names = [a for a in authors if 2 <= len(a) <= 4 and all("가" <= c <= "힣" for c in a)]
+    return {
+        "title_words": [w for t in titles for w in t],
+        "title_lengths": [len(t) for t in titles],
+        "authors": authors,
+        "surnames": [n[0] for n in korean_names] or ["김"],
+        "given_syllables": [c for n in korean_names for c in n[1:]] or HANGUL_SYLLABLES,
+        "publishers": [r["publisher"] for r in rows],
+        "categories": [r["category"] for r in rows],
+        "dates": [r["publish_date"] for r in rows],
+        "descriptions": [r["description"] for r in rows],
+    }
+
+
+def make_catalog(path: str, rows: int, seed: int = 42, source: str = SOURCE_CSV) -> None:
+    """원본 분포에서 뽑아 만든 합성 카탈로그 CSV (원본과 같은 헤더)"""
+    rng = random.Random(seed)
+    src = load_source(source)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["title", "author", "publisher", "category", "publish_date", "description"])
+        for _ in range(rows):
+            title = " ".join(rng.choices(src["title_words"], k=rng.choice(src["title_lengths"])))
+            if rng.random() < 0.6:
+                author = rng.choice(src["authors"])
+            else:
+                author = rng.choice(src["surnames"]) + "".join(rng.choices(src["given_syllables"], k=2))
+            writer.writerow([
+                title,
+                author,
+                rng.choice(src["publishers"]),
+                rng.choice(src["categories"]),
+                rng.choice(src["dates"]),
+                rng.choice(src["descriptions"]),
+            ])
+
+
+def percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"count": 0, "p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+    ordered = sorted(values)
+
+    def pick(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 3)
+
+    return {"count": len(values), "p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99), "max_ms": pick(1.0)}
+
+
+def peak_rss_mb() -> float:
+    # Linux에서 ru_maxrss는 KiB 단위
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def stage_ingest(args) -> Dict:
+    from api import ingest_csv
+
+    loaders = {"default": ingest_csv.load_csv, "fast": ingest_csv.load_csv_fast}
+    ingest_csv.ensure_db(args.db)
+    conn = sqlite3.connect(args.db)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.close()
+    field_map = {name: name for name in ingest_csv.BOOK_FIELDS}
+    started = time.perf_counter()
+    loaders[args.loader](csv_path=args.csv, delimiter=",", field_map=field_map, encoding="utf-8", db_path=args.db)
+    seconds = time.perf_counter() - started
+    return {
+        "loader": args.loader,
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(args.rows / seconds, 1),
+        "db_mb": round(os.path.getsize(args.db) / 1024 / 1024, 1),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def build_queries(db_path: str, count: int, seed: int) -> List[tuple]:
+    """(종류, 파라미터) 목록. 검색어는 카탈로그에 실제로 있는 제목 단어/저자에서 뽑는다"""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    max_id = conn.execute("SELECT MAX(id) FROM books").fetchone()[0] or 1
+    sample_ids = [rng.randint(1, max_id) for _ in range(2000)]
+    placeholders = ",".join("?" * len(sample_ids))
+    sample = conn.execute(f"SELECT title, author FROM books WHERE id IN ({placeholders})", sample_ids).fetchall()
+    total = conn.execute("SELECT COUNT(*) FROM books").fetchone()[0]
+    conn.close()
+
+    words = [w for title, _ in sample for w in (title or "").split()]
+    short_words = [w[:2] for w in words if len(w) >= 2] or ["소설"]
+    long_words = [w for w in words if len(w) >= 3] or ["대한민국"]
+    authors = [a for _, a in sample if a] or ["김"]
+    max_page = max(1, min(500, total // 20))
+
+    kinds = list(QUERY_MIX)
+    weights = [QUERY_MIX[k] for k in kinds]
+    queries = []
+    for _ in range(count):
+        kind = rng.choices(kinds, weights)[0]
+        params = {"size": 20}
+        if kind == "short_term":
+            params["q"] = rng.choice(short_words)
+        elif kind == "term":
+            params["q"] = rng.choice(long_words)
+        elif kind == "multi_term":
+            params["q"] = f"{rng.choice(long_words)} {rng.choice(long_words)}"
+        elif kind == "author":
+            params["q"] = rng.choice(authors)
+        elif kind == "browse":
+            params["sort"] = rng.choice(["relevance", "title", "date"])
+        elif kind == "category":
+            params["category"] = str(rng.randint(0, 9)) if rng.random() < 0.6 else f"{rng.randint(0, 9)}{rng.randint(0, 9)}"
+            if rng.random() < 0.5:
+                params["q"] = rng.choice(long_words)
+        elif kind == "deep_page":
+            params["page"] = rng.randint(max(1, max_page // 2), max_page)
+            params["sort"] = rng.choice(["title", "date"])
+        # 프런트엔드처럼 첫 페이지는 절반쯤 패싯과 함께 요청한다
+        if params.get("page", 1) == 1 and rng.random() < 0.5:
+            params["facets"] = "true"
+        queries.append((kind, params))
+    return queries
+
+
+def stage_replay(args) -> Dict:
+    os.environ["BOOKS_DB_PATH"] = args.db
+    import httpx
+    from api import app as search_app
+
+    if not args.cache:
+        # 응답/건수 캐시를 끄고 매번 SQLite를 거치게 한다
+        search_app.search_cache.maxsize = 0
+        search_app.count_cache.maxsize = 0
+    search_app.startup()
+
+    queries = build_queries(args.db, args.requests + args.warmup, args.seed)
+    latencies: Dict[str, List[float]] = {kind: [] for kind in QUERY_MIX}
+    statuses: Dict[str, int] = {}
+
+    async def replay(batch: List[tuple], record: bool) -> float:
+        transport = httpx.ASGITransport(app=search_app.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            position = 0
+
+            async def worker():
+                nonlocal position
+                while position < len(batch):
+                    kind, params = batch[position]
+                    position += 1
+                    started = time.perf_counter()
+                    response = await client.get("/search", params=params)
+                    elapsed = time.perf_counter() - started
+                    if record:
+                        statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+                        if response.status_code == 200:
+                            latencies[kind].append(elapsed)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+            return time.perf_counter() - started
+
+    asyncio.run(replay(queries[:args.warmup], record=False))
+    wall = asyncio.run(replay(queries[args.warmup:], record=True))
+    search_app.shutdown()
+
+    all_latencies = [v for values in latencies.values() for v in values]
+    return {
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "cache": args.cache,
+        "seconds": round(wall, 3),
+        "qps": round(args.requests / wall, 1),
+        "statuses": statuses,
+        "overall": percentiles(all_latencies),
+        "by_kind": {kind: percentiles(values) for kind, values in latencies.items()},
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def stage_semantic(args) -> Dict:
+    """numpy 벡터 저장소로 앞쪽 semantic_rows권을 색인한 뒤 semantic_search 지연 시간을 잰다"""
+    try:
+        from api.semantic_search import SemanticSearchEngine
+    except ImportError as e:
+        return {"skipped": f"semantic dependencies unavailable: {e}"}
+
+    conn = sqlite3.connect(args.db)
+    rows = conn.execute("SELECT title FROM books ORDER BY id LIMIT ?", (args.semantic_rows,)).fetchall()
+    conn.close()
+    small_db = os.path.join(os.path.dirname(args.db), "semantic_books.db")
+    src = sqlite3.connect(args.db)
+    src.execute("ATTACH DATABASE ? AS small", (small_db,))
+    src.execute("DROP TABLE IF EXISTS small.books")
+    src.execute("CREATE TABLE small.books AS SELECT * FROM books ORDER BY id LIMIT ?", (args.semantic_rows,))
+    src.execute("CREATE UNIQUE INDEX small.idx_books_id ON books(id)")
+    src.commit()
+    src.close()
+
+    with tempfile.TemporaryDirectory() as vector_dir:
+        engine = SemanticSearchEngine(
+            db_path=vector_dir, use_embedding_cache=False, vector_backend="numpy", books_db_path=small_db
+        )
+        started = time.perf_counter()
+        engine.index_books_from_db(small_db, resume=False)
+        index_seconds = time.perf_counter() - started
+
+        rng = random.Random(args.seed)
+        queries = [" ".join(rng.choice(rows)[0].split()[:2]) for _ in range(args.semantic_queries)]
+        engine.semantic_search(queries[0], n_results=20)
+        latencies = []
+        for q in queries:
+            started = time.perf_counter()
+            engine.semantic_search(q, n_results=20)
+            latencies.append(time.perf_counter() - started)
+    return {
+        "indexed_rows": len(rows),
+        "index_seconds": round(index_seconds, 3),
+        "queries": percentiles(latencies),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+STAGES = {"ingest": stage_ingest, "replay": stage_replay, "semantic": stage_semantic}
+
+
+def run_stage(stage: str, args, db: str, csv_path: str, rows: int) -> Dict:
+    cmd = [
+        sys.executable, "-m", "benchmarks.bench_search", "--stage", stage,
+        "--db", db, "--csv", csv_path, "--rows", str(rows),
+        "--loader", args.loader, "--requests", str(args.requests), "--warmup", str(args.warmup),
+        "--concurrency", str(args.concurrency), "--seed", str(args.seed),
+        "--semantic-rows", str(args.semantic_rows), "--semantic-queries", str(args.semantic_queries),
+    ]
+    if args.cache:
+        cmd.append("--cache")
+    proc = subprocess.run(cmd, cwd=REPO_DIR, capture_output=True, text=True)
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr)
+        raise RuntimeError(f"stage {stage} failed for {rows} rows")
+    # 단계 출력 중 마지막 줄이 결과 JSON
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def compare(previous: Dict, current: Dict) -> None:
+    before = {r["rows"]: r for r in previous.get("results", [])}
+    print()
+    print(f"{'rows':>10}{'metric':>14}{'before':>12}{'after':>12}{'change':>10}")
+    for result in current["results"]:
+        old = before.get(result["rows"])
+        if old is None:
+            continue
+        metrics = [
+            ("qps", old["search"]["qps"], result["search"]["qps"]),
+            ("p50_ms", old["search"]["overall"]["p50_ms"], result["search"]["overall"]["p50_ms"]),
+            ("p95_ms", old["search"]["overall"]["p95_ms"], result["search"]["overall"]["p95_ms"]),
+            ("p99_ms", old["search"]["overall"]["p99_ms"], result["search"]["overall"]["p99_ms"]),
+            ("ingest_s", old["ingest"]["seconds"], result["ingest"]["seconds"]),
+        ]
+        for name, a, b in metrics:
+            change = f"{(b - a) / a * 100:+.1f}%" if a else "-"
+            print(f"{result['rows']:>10}{name:>14}{a:>12}{b:>12}{change:>10}")
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /search, ingest and semantic search on synthetic catalogs")
+    parser.add_argument("--rows", type=int, nargs="+", default=[30_000], help="Catalog sizes (e.g. 30000 300000 3000000)")
+    parser.add_argument("--loader", choices=["default", "fast"], default="fast", help="ingest_csv loader")
+    parser.add_argument("--requests", type=int, default=2000, help="Measured /search requests per catalog")
+    parser.add_argument("--warmup", type=int, default=200, help="Unmeasured warm-up requests")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent in-process clients")
+    parser.add_argument("--cache", action="store_true", help="Keep the API result/count caches enabled")
+    parser.add_argument("--semantic", action="store_true", help="Also benchmark semantic_search (numpy backend)")
+    parser.add_argument("--semantic-rows", type=int, default=10_000, help="Books embedded for the semantic stage")
+    parser.add_argument("--semantic-queries", type=int, default=200, help="Semantic queries to time")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--work-dir", default=None, help="Keep generated catalogs/DBs here (default: temp)")
+    parser.add_argument("--output", default=None, help="Write results JSON to this path")
+    parser.add_argument("--compare", default=None, help="Previous results JSON to compare against")
+    # 내부용: 한 단계만 실행하고 결과 JSON을 출력
+    parser.add_argument("--stage", choices=sorted(STAGES), help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    parser.add_argument("--csv", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.stage:
+        args.rows = args.rows[0]
+        print(json.dumps(STAGES[args.stage](args)))
+        return
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": {k: v for k, v in vars(args).items() if k not in ("stage", "db", "csv")},
+        },
+        "results": [],
+    }
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="bench_search_")
+    os.makedirs(work_dir, exist_ok=True)
+    try:
+        for rows in args.rows:
+            csv_path = os.path.join(work_dir, f"catalog_{rows}.csv")
+            db = os.path.join(work_dir, f"catalog_{rows}.db")
+            if not os.path.exists(csv_path):
+                started = time.perf_counter()
+                make_catalog(csv_path, rows, args.seed)
+                print(f"Generated {rows} rows in {time.perf_counter() - started:.1f}s")
+            for path in (db, db + "-wal", db + "-shm"):
+                if os.path.exists(path):
+                    os.remove(path)
+
+            result = {"rows": rows}
+            result["ingest"] = run_stage("ingest", args, db, csv_path, rows)
+            print(f"[{rows}] ingest: {result['ingest']}")
+            result["search"] = run_stage("replay", args, db, csv_path, rows)
+            search = result["search"]
+            print(
+                f"[{rows}] search: {search['qps']} qps, p50 {search['overall']['p50_ms']}ms, "
+                f"p95 {search['overall']['p95_ms']}ms, p99 {search['overall']['p99_ms']}ms, "
+                f"peak RSS {search['peak_rss_mb']}MB"
+            )
+            if args.semantic:
+                result["semantic"] = run_stage("semantic", args, db, csv_path, rows)
+                print(f"[{rows}] semantic: {result['semantic']}")
+            report["results"].append(result)
+    finally:
+        if args.work_dir is None:
+            for name in os.listdir(work_dir):
+                os.remove(os.path.join(work_dir, name))
+            os.rmdir(work_dir)
+
+    print()
+    print(f"{'rows':>10}{'kind':>12}{'count':>8}{'p50_ms':>10}{'p95_ms':>10}{'p99_ms':>10}")
+    for result in report["results"]:
+        for kind, stats in result["search"]["by_kind"].items():
+            print(
+                f"{result['rows']:>10}{kind:>12}{stats['count']:>8}"
+                f"{stats['p50_ms'] or '-':>10}{stats['p95_ms'] or '-':>10}{stats['p99_ms'] or '-':>10}"
+            )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Results written to {args.output}")
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""멀티 프로세스 실행기(api/serve.py) 워커별 메모리와 처리량 측정
+
+워커 수를 바꿔 가며 서버를 띄우고, 별도 클라이언트 프로세스들로 /search 부하를 준 뒤 각 프로세스의
+RSS/PSS(공유 페이지를 나눠 가진 실제 몫)/USS(그 프로세스만 쓰는 페이지)를 /proc/<pid>/smaps_rollup에서 읽는다.
+copy-on-write 공유가 잘 되면 워커를 늘려도 워커당 USS만 늘고 RSS 합계만큼 메모리가 늘지 않는다. Linux 전용.
+
+    python -m benchmarks.bench_workers --rows 300000 --workers 1 2 4 --output workers.json
+    python -m benchmarks.bench_workers --db api/books.db --workers 1 4 --semantic   # 임베딩 모델까지 preload
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+from urllib.parse import urlencode
+
+from .bench_search import REPO_DIR, build_queries, git_commit, make_catalog, percentiles
+
+
+def smaps_rollup(pid: int) -> Dict[str, float]:
+    """프로세스 메모리 요약(MB): rss, pss, uss(private), shared"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 3 and parts[2] == "kB":
+                values[parts[0].rstrip(":")] = int(parts[1])
+    mb = lambda kb: round(kb / 1024, 1)
+    return {
+        "rss_mb": mb(values.get("Rss", 0)),
+        "pss_mb": mb(values.get("Pss", 0)),
+        "uss_mb": mb(values.get("Private_Clean", 0) + values.get("Private_Dirty", 0)),
+        "shared_mb": mb(values.get("Shared_Clean", 0) + values.get("Shared_Dirty", 0)),
+    }
+
+
+def child_pids(pid: int) -> List[int]:
+    children = []
+    for task in os.listdir(f"/proc/{pid}/task"):
+        with open(f"/proc/{pid}/task/{task}/children") as f:
+            children.extend(int(p) for p in f.read().split())
+    return sorted(children)
+
+
+def memory_report(master: int) -> Dict:
+    workers = {pid: smaps_rollup(pid) for pid in child_pids(master)}
+    total = lambda key: round(sum(w[key] for w in workers.values()), 1)
+    return {
+        "master": smaps_rollup(master),
+        "workers": list(workers.values()),
+        "workers_rss_sum_mb": total("rss_mb"),
+        "workers_pss_sum_mb": total("pss_mb"),
+        "workers_uss_sum_mb": total("uss_mb"),
+    }
+
+
+def wait_ready(port: int, workers: int, timeout: float = 120) -> None:
+    """/health가 응답하고 워커가 모두 뜰 때까지 기다린다"""
+    deadline = time.monotonic() + timeout
+    seen = set()
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", "/health")
+            seen.add(json.loads(conn.getresponse().read())["pid"])
+            conn.close()
+            if len(seen) >= workers:
+                return
+        except (OSError, ValueError, KeyError):
+            time.sleep(0.2)
+    if not seen:
+        raise RuntimeError("server did not become ready")
+
+
+def client(args) -> Dict:
+    """한 클라이언트 프로세스: keep-alive 연결 하나로 duration초 동안 순서대로 요청한다"""
+    port, paths, duration, seed = args
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        path = rng.choice(paths)
+        started = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            response.read()
+            if response.status == 200:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    conn.close()
+    return {"latencies": latencies, "errors": errors}
+
+
+def run_load(port: int, paths: List[str], clients: int, duration: float, seed: int) -> Dict:
+    with multiprocessing.Pool(clients) as pool:
+        results = pool.map(client, [(port, paths, duration, seed + i) for i in range(clients)])
+    latencies = [v for r in results for v in r["latencies"]]
+    return {
+        "clients": clients,
+        "seconds": duration,
+        "qps": round(len(latencies) / duration, 1),
+        "errors": sum(r["errors"] for r in results),
+        "latency": percentiles(latencies),
+    }
+
+
+def measure(args, db: str, workers: int, port: int, paths: List[str]) -> Dict:
+    env = dict(os.environ, BOOKS_DB_PATH=db)
+    if not args.cache:
+        # 응답 캐시를 끄고 매번 SQLite를 거치게 한다
+        env["SEARCH_CACHE_SIZE"] = "0"
+    if args.semantic:
+        env["SEMANTIC_WARMUP"] = "1"
+    cmd = [sys.executable, "-m", "api.serve", "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers)]
+    server = subprocess.Popen(cmd, cwd=REPO_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    try:
+        started = time.perf_counter()
+        wait_ready(port, workers)
+        result = {"workers": workers, "ready_seconds": round(time.perf_counter() - started, 2)}
+        result["idle_memory"] = memory_report(server.pid)
+        # 워밍업 후 측정
+        run_load(port, paths, args.clients, min(2.0, args.duration), args.seed)
+        result["load"] = run_load(port, paths, args.clients, args.duration, args.seed)
+        result["loaded_memory"] = memory_report(server.pid)
+        return result
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=60)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-worker memory and throughput of api.serve")
+    parser.add_argument("--db", default=None, help="Existing books.db (default: generate a synthetic catalog)")
+    parser.add_argument("--rows", type=int, default=300_000, help="Synthetic catalog size when --db is not given")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Worker counts to compare")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent client processes")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per worker count")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--cache", action="store_true", help="Keep the API result cache enabled")
+    parser.add_argument("--semantic", action="store_true", help="Preload the embedding model (SEMANTIC_WARMUP=1)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Write results JSON to this path")
+    args = parser.parse_args()
+
+    work_dir = None
+    db = args.db
+    if db is None:
+        from api import ingest_csv
+
+        work_dir = tempfile.mkdtemp(prefix="bench_workers_")
+        csv_path = os.path.join(work_dir, "catalog.csv")
+        db = os.path.join(work_dir, "catalog.db")
+        make_catalog(csv_path, args.rows, args.seed)
+        ingest_csv.ensure_db(db)
+        field_map = {name: name for name in ingest_csv.BOOK_FIELDS}
+        ingest_csv.load_csv_fast(csv_path=csv_path, delimiter=",", field_map=field_map, encoding="utf-8", db_path=db)
+        print(f"Generated and ingested {args.rows} rows")
+
+    paths = ["/search?" + urlencode(params) for _, params in build_queries(db, 2000, args.seed)]
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "db_mb": round(os.path.getsize(db) / 1024 / 1024, 1),
+            "args": vars(args),
+        },
+        "results": [],
+    }
+    try:
+        for workers in args.workers:
+            result = measure(args, db, workers, args.port, paths)
+            report["results"].append(result)
+            memory, load = result["loaded_memory"], result["load"]
+            print(
+                f"[{workers} workers] {load['qps']} qps, p50 {load['latency']['p50_ms']}ms, "
+                f"p95 {load['latency']['p95_ms']}ms, master RSS {memory['master']['rss_mb']}MB, "
+                f"workers RSS sum {memory['workers_rss_sum_mb']}MB, PSS sum {memory['workers_pss_sum_mb']}MB, "
+                f"USS sum {memory['workers_uss_sum_mb']}MB"
+            )
+    finally:
+        if work_dir is not None:
+            for name in os.listdir(work_dir):
+                os.remove(os.path.join(work_dir, name))
+            os.rmdir(work_dir)
+
+    print()
+    print(f"{'workers':>8}{'qps':>9}{'p95_ms':>9}{'RSS/worker':>12}{'PSS/worker':>12}{'USS/worker':>12}{'PSS total':>11}")
+    for result in report["results"]:
+        memory = result["loaded_memory"]
+        n = max(1, len(memory["workers"]))
+        pss_total = memory["workers_pss_sum_mb"] + memory["master"]["pss_mb"]
+        print(
+            f"{result['workers']:>8}{result['load']['qps']:>9}{result['load']['latency']['p95_ms']:>9}"
+            f"{memory['workers_rss_sum_mb'] / n:>12.1f}{memory['workers_pss_sum_mb'] / n:>12.1f}"
+            f"{memory['workers_uss_sum_mb'] / n:>12.1f}{pss_total:>11.1f}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Yes24 페이지 파서 벤치마크
+
+저장해 둔 Yes24 검색/상세 페이지(HTML)를 파서 백엔드별로 반복 파싱해 페이지당 처리량을 비교하고,
+두 백엔드의 결과가 같은지 확인한다. 파일 이름이 detail로 시작하면 상세 페이지, 나머지는 검색 결과로 본다.
+--pages를 주지 않으면 실제 페이지와 비슷한 크기의 합성 페이지를 만들어 쓴다.
+
+    python -m benchmarks.bench_yes24_parse --pages tests/fixtures/yes24/ --repeat 20
+"""
+import argparse
+import glob
+import os
+import time
+from typing import Dict, List, Tuple
+
+from api.yes24_api import Yes24BookAPI
+
+BACKENDS = ["html.parser", "lxml"]
+
+
+def make_search_page(items: int = 20, seed: int = 0) -> bytes:
+    """검색 결과 페이지 모양의 합성 HTML (헤더/메뉴/스크립트 등 주변 마크업 포함)"""
+    nav = "".join(f'<li class="menu"><a href="/24/Category/{i:03d}">분류 {i}</a></li>' for i in range(300))
+    rows = []
+    for i in range(items):
+        n = seed * 1000 + i
+        rows.append(
+            f"""
+            <li data-goods-no="{n}"><div class="itemUnit">
+              <div class="item_img"><div class="img_canvas"><span class="img_item">
+                <a href="/Product/Goods/{n}"><img class="lazy" data-original="//image.yes24.com/goods/{n}/L" src="/img/blank.gif" alt="표지"></a>
+              </span></div></div>
+              <div class="item_info">
+                <div class="info_row info_name"><span class="gd_res">[도서]</span>
+                  <a class="gd_name" href="/Product/Goods/{n}">검색된 도서 제목 {n}</a>
+                  <span class="gd_nameE">부제 {n}</span></div>
+                <div class="info_row info_pubGrp">
+                  <span class="authPub info_auth"><a href="#">저자{n}</a> 저 / <a href="#">역자{n}</a> 역</span>
+                  <span class="authPub info_pub"><a href="#">출판사{n % 37}</a></span>
+                  <span class="authPub info_date">2024년 0{1 + n % 9}월</span></div>
+                <div class="info_row info_price"><strong class="txt_num"><em class="yes_b">{12000 + n}</em>원</strong>
+                  <span class="price">{15000 + n}원</span></div>
+                <div class="info_row info_read">{"도서 소개 문장입니다. " * 20}</div>
+                <script>window.goodsData = window.goodsData || []; window.goodsData.push({n});</script>
+              </div>
+            </div></li>"""
+        )
+    html = f"""<!DOCTYPE html><html><head><meta charset="utf-8"><title>YES24 검색</title>
+    <style>{".c{color:red}" * 500}</style><script>{"var a=1;" * 2000}</script></head>
+    <body><div id="yesHeader"><ul>{nav}</ul></div>
+    <div id="yesSchList"><ul>{"".join(rows)}</ul></div>
+    <div id="yesFooter">{"<p>회사 정보</p>" * 100}</div></body></html>"""
+    return html.encode("utf-8")
+
+
+def make_detail_page(seed: int = 0) -> bytes:
+    html = f"""<!DOCTYPE html><html><head><meta charset="utf-8"><script>{"var b=2;" * 3000}</script></head>
+    <body><div id="yDetailTopWrap">{"<div class='gd_infoTop'><span>정보</span></div>" * 200}
+    <span class="gd_date">2024년 01월 {1 + seed % 28:02d}일</span><span class="gd_pages">{200 + seed}쪽</span>
+    <span class="gd_size">152*225*20mm</span></div>
+    <div class="gd_detail"><div class="infoWrap_txt">{"책 소개 본문입니다. <br/>" * 200}</div></div>
+    <div class="gd_toc"><div class="infoWrap_txt">{"".join(f"<p>{i}장 목차</p>" for i in range(40))}</div></div>
+    {"<div class='review'><p>리뷰</p></div>" * 300}</body></html>"""
+    return html.encode("utf-8")
+
+
+def load_pages(pages_dir: str) -> Tuple[List[str], List[Tuple[str, bytes]]]:
+    """(파일 이름 목록, (종류, 본문) 목록)"""
+    names, pages = [], []
+    for path in sorted(glob.glob(os.path.join(pages_dir, "*.htm*"))):
+        kind = "detail" if os.path.basename(path).startswith("detail") else "search"
+        with open(path, "rb") as f:
+            pages.append((kind, f.read()))
+        names.append(os.path.basename(path))
+    return names, pages
+
+
+def parse_all(api: Yes24BookAPI, pages: List[Tuple[str, bytes]]) -> List:
+    return [
+        api.parse_detail_page(body) if kind == "detail" else api.parse_search_page(body, 20)
+        for kind, body in pages
+    ]
+
+
+def run(backend: str, pages: List[Tuple[str, bytes]], repeat: int) -> Tuple[float, List]:
+    api = Yes24BookAPI(html_parser=backend)
+    results = parse_all(api, pages)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        parse_all(api, pages)
+    return time.perf_counter() - started, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Yes24 HTML parser backends")
+    parser.add_argument("--pages", default=None, help="Directory of saved pages (default: synthetic pages)")
+    parser.add_argument("--synthetic", type=int, default=10, help="Synthetic search/detail pages each")
+    parser.add_argument("--repeat", type=int, default=10, help="Passes over all pages per backend")
+    parser.add_argument("--backends", nargs="+", default=BACKENDS, choices=BACKENDS, help="Backends to compare")
+    args = parser.parse_args()
+
+    if args.pages:
+        names, pages = load_pages(args.pages)
+    else:
+        pages = [("search", make_search_page(seed=i)) for i in range(args.synthetic)]
+        pages += [("detail", make_detail_page(seed=i)) for i in range(args.synthetic)]
+        names = [f"synthetic_{kind}_{i}" for i, (kind, _) in enumerate(pages)]
+    size_kb = sum(len(body) for _, body in pages) / len(pages) / 1024
+    print(f"Pages: {len(pages)} (avg {size_kb:.0f} KB), repeat: {args.repeat}")
+
+    timings: Dict[str, float] = {}
+    outputs = {}
+    for backend in args.backends:
+        timings[backend], outputs[backend] = run(backend, pages, args.repeat)
+
+    parsed = len(pages) * args.repeat
+    print()
+    print(f"{'backend':<14}{'seconds':>10}{'pages/sec':>12}{'ms/page':>10}{'speedup':>10}")
+    baseline = timings.get("html.parser")
+    for backend, seconds in timings.items():
+        speedup = f"{baseline / seconds:.2f}x" if baseline else "-"
+        print(f"{backend:<14}{seconds:>10.2f}{parsed / seconds:>12.1f}{seconds / parsed * 1000:>10.2f}{speedup:>10}")
+
+    if len(outputs) > 1:
+        # 로그 출력이 아니라 페이지별 파싱 결과(dict/list)를 비교한다
+        (reference_backend, reference), *others = outputs.items()
+        differing = [
+            (backend, name)
+            for backend, results in others
+            for name, expected, actual in zip(names, reference, results)
+            if expected != actual
+        ]
+        print()
+        if not differing:
+            print("Parsed results identical")
+        for backend, name in differing:
+            print(f"WARNING: {backend} result differs from {reference_backend} on {name}")
+
+
+if __name__ == "__main__":
+    main()
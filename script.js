@@ -3,6 +3,7 @@ const API_BASE = 'https://book-search-app-ol4f.onrender.com';
 let currentPage = 1;
 const pageSize = 20; // 한 페이지에 표시할 항목 수
 let lastTotal = 0;
+let pageCursors = {}; // 페이지 번호 → 해당 페이지를 가져올 cursor (키셋 페이지네이션)
 
 // DOM 요소들
 const searchInput = document.getElementById('searchInput');
@@ -17,6 +18,7 @@ const paginationEl = document.getElementById('pagination');
 const prevPageBtn = document.getElementById('prevPage');
 const nextPageBtn = document.getElementById('nextPage');
 const pageInfoEl = document.getElementById('pageInfo');
+const suggestionList = document.getElementById('searchSuggestions');
 
 // KDC 분류 매핑 객체
 const kdcMap = {
@@ -48,6 +50,7 @@ async function searchBooks(page = 1) {
     const selectedCategory = categoryFilter.value; // '0', '1' 등의 숫자가 들어옴
     const selectedSort = sortFilter.value;
 
+    if (page === 1) pageCursors = {};
     currentPage = page;
     showLoading();
 
@@ -61,13 +64,21 @@ async function searchBooks(page = 1) {
         }
         url.searchParams.set('page', String(currentPage));
         url.searchParams.set('size', String(pageSize));
+        // 이미 지나온 페이지는 cursor로 요청해 깊은 페이지도 OFFSET 없이 조회한다
+        if (pageCursors[currentPage]) url.searchParams.set('cursor', pageCursors[currentPage]);
+        // 첫 페이지에서 분류별 건수를 함께 받아 분류 선택 상자에 표시한다
+        if (currentPage === 1) url.searchParams.set('facets', 'true');
+        // 결과 표에 쓰는 필드만 받는다 (설명은 표시하지 않으므로 제외)
+        url.searchParams.set('fields', 'title,author,publisher,category,publish_date');
 
         const resp = await fetch(url.toString());
         if (!resp.ok) throw new Error('API 오류');
         const data = await resp.json();
 
         lastTotal = data.total || 0;
-        displayResults(data.items.map(normalizeBook), lastTotal);
+        if (data.next_cursor) pageCursors[currentPage + 1] = data.next_cursor;
+        if (data.facets) updateCategoryCounts(data.facets);
+        displayResults(data.items.map(normalizeBook), lastTotal, data.corrected_query);
         updatePagination();
     } catch (e) {
         console.error("API 호출 실패:", e);
@@ -76,8 +87,21 @@ async function searchBooks(page = 1) {
     }
 }
 
+// 분류 선택 상자에 검색어 기준 분류별 건수 표시
+function updateCategoryCounts(facets) {
+    const counts = {};
+    facets.forEach(f => {
+        if (f.kdc_class !== null) counts[f.kdc_class] = f.count;
+    });
+    Array.from(categoryFilter.options).forEach(option => {
+        if (!option.value) return;
+        if (!option.dataset.label) option.dataset.label = option.textContent;
+        option.textContent = `${option.dataset.label} (${counts[option.value] || 0})`;
+    });
+}
+
 // 결과 표시
-function displayResults(books, total = 0) {
+function displayResults(books, total = 0, correctedQuery = null) {
     hideLoading();
     bookResults.innerHTML = ''; // 이전 결과 비우기
 
@@ -86,7 +110,10 @@ function displayResults(books, total = 0) {
         return;
     }
 
-    resultsCount.textContent = `총 ${total}건의 검색 결과`;
+    // 결과가 없어 오타를 고쳐 다시 찾은 경우 바꾼 검색어를 알려준다
+    resultsCount.textContent = correctedQuery
+        ? `'${correctedQuery}'(으)로 찾은 총 ${total}건의 검색 결과`
+        : `총 ${total}건의 검색 결과`;
     resultsCount.style.display = 'block';
 
     const tableRows = books.map(createBookTableRow).join('');
@@ -170,7 +197,41 @@ function showError(message) {
     noResults.style.display = 'block';
 }
 
+// 입력 중 자동완성: 입력이 멈춘 뒤 /suggest 를 호출하고, 이전 요청은 취소한다
+let suggestTimer = null;
+let suggestController = null;
+function requestSuggestions() {
+    clearTimeout(suggestTimer);
+    suggestTimer = setTimeout(async () => {
+        const term = searchInput.value.trim();
+        if (suggestController) suggestController.abort();
+        if (!term) {
+            suggestionList.innerHTML = '';
+            return;
+        }
+        suggestController = new AbortController();
+        try {
+            const url = new URL(`${API_BASE}/suggest`);
+            url.searchParams.set('q', term);
+            url.searchParams.set('size', '8');
+            const resp = await fetch(url.toString(), { signal: suggestController.signal });
+            if (!resp.ok) return;
+            const data = await resp.json();
+            suggestionList.innerHTML = '';
+            data.items.forEach(item => {
+                const option = document.createElement('option');
+                option.value = item.text;
+                option.label = item.type === 'author' ? '저자' : '제목';
+                suggestionList.appendChild(option);
+            });
+        } catch (e) {
+            // 취소되었거나 실패한 자동완성은 무시한다
+        }
+    }, 150);
+}
+
 // 이벤트 리스너 연결
+searchInput.addEventListener('input', requestSuggestions);
 searchBtn.addEventListener('click', () => searchBooks(1));
 searchInput.addEventListener('keypress', (e) => {
     if (e.key === 'Enter') searchBooks(1);
@@ -1,40 +1,29 @@
-import pandas as pd
-import sqlite3
 import os
 
-# 새 데이터베이스 파일 이름
-DB_FILE = "books.db"
-# 읽어올 CSV 파일 이름
-CSV_FILE = "lawlib.csv" 
-# 데이터베이스에 생성할 테이블 이름
-TABLE_NAME = "books"
+from api.ingest_csv import BOOK_FIELDS, DB_PATH, ensure_db, load_csv_rebuild
 
-# --- 스크립트 시작 ---
+# 읽어올 CSV 파일 이름 (이 스크립트와 같은 폴더)
+CSV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lawlib.csv")
 
-# 1. 기존 DB 파일이 있다면 삭제 (새로운 데이터로 완전히 교체하기 위함)
-if os.path.exists(DB_FILE):
-    os.remove(DB_FILE)
-    print(f"기존 '{DB_FILE}' 파일을 삭제했습니다.")
+# --- 스크립트 시작 ---
 
-# 2. lawlib.csv 파일을 pandas로 읽기
-try:
-    df = pd.read_csv(CSV_FILE)
-    print(f"'{CSV_FILE}' 파일을 성공적으로 읽었습니다.")
-except FileNotFoundError:
+# 1. lawlib.csv 파일이 있는지 확인
+if not os.path.exists(CSV_FILE):
     print(f"오류: '{CSV_FILE}' 파일을 찾을 수 없습니다. 파일이 올바른 위치에 있는지 확인하세요.")
     exit()
 
-# 3. SQLite 데이터베이스에 연결하고 데이터 넣기
-conn = sqlite3.connect(DB_FILE)
-print(f"'{DB_FILE}' 데이터베이스에 연결했습니다.")
-
-# pandas 데이터프레임을 SQL 테이블로 저장
-# to_sql 함수는 데이터를 테이블에 삽입하는 역할을 합니다.
-# if_exists='replace'는 테이블이 이미 존재하면 기존 내용을 지우고 새로 만듭니다.
-df.to_sql(TABLE_NAME, conn, if_exists='replace', index=False)
-
-print(f"'{TABLE_NAME}' 테이블에 데이터를 성공적으로 저장했습니다.")
-
-# 4. 연결 종료
-conn.close()
-print(f"'{DB_FILE}' 파일이 성공적으로 생성되었고, 데이터베이스 연결을 닫았습니다.")
+# 2. API가 쓰는 DB(api/books.db)의 스키마를 최신으로 맞춘다
+ensure_db(DB_PATH)
+print(f"'{DB_PATH}' 데이터베이스를 준비했습니다.")
+
+# 3. `python -m api.ingest_csv --rebuild` 와 같은 방식으로 적재한다.
+#    그림자 테이블에 채운 뒤 한 트랜잭션으로 교체하므로 파일을 바꾸거나 WAL 파일을 지우지 않고,
+#    실행 중인 서버도 적재하는 동안 기존 데이터를 그대로 제공한다. 같은 도서는 기존 id를 유지한다.
+#    (SQLITE_IMMUTABLE=1 이나 api/serve.py 로 띄운 서버는 교체를 보지 못하므로 다시 시작하거나 마스터에 HUP을 보낸다)
+load_csv_rebuild(
+    csv_path=CSV_FILE,
+    delimiter=",",
+    field_map={name: name for name in BOOK_FIELDS},
+    db_path=DB_PATH,
+)
+print(f"'{CSV_FILE}' 파일을 '{DB_PATH}' 에 적재했습니다.")
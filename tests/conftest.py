@@ -0,0 +1,52 @@
+import csv
+import os
+import random
+import sys
+
+import pytest
+
+# 저장소 루트에서 api 패키지를 import 할 수 있게 한다
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.ingest_csv import BOOK_FIELDS, ensure_db, load_csv  # noqa: E402
+
+TITLE_WORDS = ["파이썬", "자바", "데이터", "분석", "소설", "역사", "경제", "프로그래밍", "입문", "심리학", "철학", "Python", "알고리즘"]
+AUTHORS = ["김철수", "이영희", "박민수", "최지우", "Karunatilaka, Shehan", "Orwell, George"]
+PUBLISHERS = ["한빛미디어", "민음사", "길벗", "Penguin"]
+CATEGORIES = ["005.133 ㄱ12", "813.7 ㄴ34", "911.05 ㄷ56", "320.1 ㄹ78", "100 ㅁ90"]
+
+
+def make_books(count: int, seed: int = 7) -> list:
+    """검색 테스트용 가상 도서 목록. 제목/출간일이 겹치는 도서를 섞어 동순위 정렬도 확인한다"""
+    rng = random.Random(seed)
+    books = []
+    for i in range(count):
+        title = " ".join(rng.sample(TITLE_WORDS, rng.randint(1, 3)))
+        books.append({
+            "title": title,
+            "author": rng.choice(AUTHORS),
+            "publisher": rng.choice(PUBLISHERS),
+            "category": rng.choice(CATEGORIES),
+            "publish_date": f"20{rng.randint(10, 24)}-0{rng.randint(1, 9)}-01",
+            "description": f"{rng.choice(TITLE_WORDS)} 공부를 위한 책 {i}",
+        })
+    return books
+
+
+def write_csv(path: str, books: list) -> str:
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=BOOK_FIELDS)
+        writer.writeheader()
+        writer.writerows(books)
+    return path
+
+
+@pytest.fixture(scope="session")
+def catalog_db(tmp_path_factory):
+    """가상 도서 300권을 적재한 books.db 경로 (세션 동안 읽기 전용으로 공유)"""
+    directory = tmp_path_factory.mktemp("catalog")
+    db_path = str(directory / "books.db")
+    csv_path = write_csv(str(directory / "books.csv"), make_books(300))
+    ensure_db(db_path)
+    load_csv(csv_path, ",", {name: name for name in BOOK_FIELDS}, db_path=db_path)
+    return db_path
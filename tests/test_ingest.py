@@ -0,0 +1,45 @@
+import sqlite3
+
+from api.ingest_csv import BOOK_FIELDS, ensure_db, load_csv, load_csv_fast, load_csv_rebuild
+
+from conftest import make_books, write_csv
+
+FIELD_MAP = {name: name for name in BOOK_FIELDS}
+
+
+def ids_by_book(db_path: str) -> dict:
+    conn = sqlite3.connect(db_path)
+    try:
+        return {(title, author, publisher, publish_date): book_id for book_id, title, author, publisher, publish_date in conn.execute(
+            "SELECT id, title, author, publisher, publish_date FROM books"
+        )}
+    finally:
+        conn.close()
+
+
+def test_ids_stay_stable_across_full_reloads(tmp_path):
+    db_path = str(tmp_path / "books.db")
+    books = make_books(40, seed=11)
+    csv_path = write_csv(str(tmp_path / "books.csv"), books)
+    ensure_db(db_path)
+    load_csv(csv_path, ",", FIELD_MAP, db_path=db_path)
+    original = ids_by_book(db_path)
+    assert len(original) == 40
+
+    # 같은 파일을 --fast, --rebuild로 다시 적재해도 id가 바뀌지 않는다
+    load_csv_fast(csv_path, ",", FIELD_MAP, db_path=db_path)
+    assert ids_by_book(db_path) == original
+    load_csv_rebuild(csv_path, ",", FIELD_MAP, db_path=db_path)
+    assert ids_by_book(db_path) == original
+
+    # 순서를 바꾸고 한 권을 빼고 한 권을 더한 파일: 남은 도서는 id 유지, 새 도서는 쓴 적 없는 id
+    removed, added = books[0], dict(books[1], title="새로 들어온 책")
+    changed = list(reversed(books[1:])) + [added]
+    write_csv(csv_path, changed)
+    for load in (load_csv_rebuild, load_csv_fast, load_csv):
+        load(csv_path, ",", FIELD_MAP, db_path=db_path)
+        ids = ids_by_book(db_path)
+        key = lambda book: (book["title"], book["author"], book["publisher"], book["publish_date"])  # noqa: E731
+        assert {key(book): ids[key(book)] for book in books[1:]} == {key(book): original[key(book)] for book in books[1:]}
+        assert key(removed) not in ids
+        assert ids[key(added)] > max(original.values())
@@ -0,0 +1,116 @@
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import app as app_module
+from api.db_pool import ConnectionPool
+from api.executor import BoundedExecutor
+
+
+@pytest.fixture(scope="module")
+def client(catalog_db):
+    # 모듈 import 시점에 정해진 DB 경로 대신 테스트 카탈로그를 읽게 한다
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(app_module, "DB_PATH", catalog_db)
+        mp.setattr(app_module, "db_pool", ConnectionPool(catalog_db, max_size=2))
+        mp.setattr(app_module, "SEMANTIC_WARMUP", False)
+        # 느린 CI에서도 오타 교정이 시간 한도에 걸려 끊기지 않게 넉넉히 준다
+        mp.setattr(app_module, "FUZZY_BUDGET_MS", 1000.0)
+        with TestClient(app_module.app) as test_client:
+            yield test_client
+
+
+def search(client, **params) -> dict:
+    response = client.get("/search", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def like_count(db_path: str, q: str, category: str = None) -> int:
+    """색인 없이 LIKE로 센 건수: 모든 단어가 제목/저자/출판사/설명 중 하나에 들어 있는 도서"""
+    where = []
+    params = []
+    for term in q.split():
+        where.append("(title LIKE ? OR author LIKE ? OR publisher LIKE ? OR description LIKE ?)")
+        params.extend([f"%{term}%"] * 4)
+    if category:
+        where.append("kdc_class = ?")
+        params.append(category)
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM books WHERE {' AND '.join(where)}", params).fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize(
+    "q, category",
+    [
+        ("파이썬", None),        # trigram
+        ("소설", None),          # 두 글자: 바이그램 색인
+        ("python", None),        # 대소문자 무시
+        ("데이터 분석", "0"),    # trigram + 바이그램, KDC 주류 필터
+        ("알고리즘 자바", None),
+        ("심리학 공부", None),
+    ],
+)
+def test_fts_count_matches_like_count(client, catalog_db, q, category):
+    params = {"q": q, "size": 5}
+    if category:
+        params["category"] = category
+    result = search(client, **params)
+    expected = like_count(catalog_db, q, category)
+    assert expected > 0
+    assert result["total"] == expected
+    assert "corrected_query" not in result
+
+
+@pytest.mark.parametrize("sort", ["relevance", "title", "author", "date"])
+@pytest.mark.parametrize("q", ["", "소설", "데이터 분석", "Python"])
+def test_cursor_paging_matches_offset_paging(client, sort, q):
+    size = 7
+    by_offset = []
+    page = 1
+    while True:
+        result = search(client, q=q, sort=sort, page=page, size=size)
+        by_offset.extend(item["id"] for item in result["items"])
+        if len(result["items"]) < size or len(by_offset) >= result["total"]:
+            break
+        page += 1
+
+    by_cursor = []
+    cursor = None
+    while True:
+        params = {"q": q, "sort": sort, "size": size}
+        if cursor:
+            params["cursor"] = cursor
+        result = search(client, **params)
+        by_cursor.extend(item["id"] for item in result["items"])
+        cursor = result["next_cursor"]
+        if not cursor:
+            break
+
+    assert len(by_offset) == result["total"] > size
+    assert by_cursor == by_offset
+
+
+@pytest.mark.parametrize("typo, expected", [("파이선", "파이썬"), ("프로그레밍", "프로그래밍")])
+def test_typo_returns_corrected_query(client, typo, expected):
+    result = search(client, q=typo)
+    assert result["corrected_query"] == expected
+    assert result["items"]
+    assert result["total"] == search(client, q=expected)["total"]
+
+
+def test_overloaded_search_returns_503(client, monkeypatch):
+    # 대기 한도 0: 어떤 요청도 받지 않는 실행기
+    overloaded = BoundedExecutor(max_workers=1, max_pending=0)
+    monkeypatch.setattr(app_module, "search_executor", overloaded)
+    try:
+        response = client.get("/search", params={"q": "파이썬"})
+    finally:
+        overloaded.shutdown()
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert overloaded.stats()["rejected"] == 1
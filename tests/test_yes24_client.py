@@ -0,0 +1,103 @@
+import asyncio
+import os
+import time
+
+import httpx
+
+from api.yes24_client import AsyncYes24Client, fixture_transport
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "yes24")
+SEARCH_PAGE = os.path.join(FIXTURES, "search.html")
+DETAIL_PAGE = os.path.join(FIXTURES, "detail.html")
+
+
+def read_fixture(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_retry_after_is_clamped_and_request_retried():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            # 하루를 기다리라는 응답도 max_backoff까지만 기다린다
+            return httpx.Response(429, headers={"Retry-After": "86400"})
+        return httpx.Response(200, content=read_fixture(SEARCH_PAGE))
+
+    async def run():
+        async with AsyncYes24Client(
+            rate_per_sec=0, cache_path="", max_backoff=0.2, transport=httpx.MockTransport(handler)
+        ) as client:
+            result = await client.search_books("파이썬")
+            return result, client.stats()
+
+    started = time.monotonic()
+    result, stats = asyncio.run(run())
+    assert time.monotonic() - started < 5
+    assert len(calls) == 2 and calls[1] - calls[0] >= 0.2
+    assert result["success"] and [b["title"] for b in result["items"]] == ["혼자 공부하는 파이썬", "파이썬 코딩의 기술(개정2판)"]
+    assert stats["retries"] == 1 and stats["errors"] == 0
+
+
+def test_gives_up_after_max_retries():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(503)
+
+    async def run():
+        async with AsyncYes24Client(
+            rate_per_sec=0, cache_path="", max_retries=2, backoff=0.01, transport=httpx.MockTransport(handler)
+        ) as client:
+            return await client.search_books("파이썬"), client.stats()
+
+    result, stats = asyncio.run(run())
+    assert not result["success"] and "503" in result["error"]
+    assert stats["requests"] == 3 and stats["retries"] == 2 and stats["errors"] == 1
+
+
+def test_responses_are_served_from_disk_cache(tmp_path):
+    cache_path = str(tmp_path / "yes24_cache.db")
+    routes = {"/24/Goods/Search": SEARCH_PAGE, "/Product/Goods/123482631": DETAIL_PAGE}
+
+    async def first():
+        async with AsyncYes24Client(rate_per_sec=0, cache_path=cache_path, transport=fixture_transport(routes)) as client:
+            search = await client.search_books("파이썬")
+            detail = await client.get_book_detail(search["items"][0]["link"])
+            again = await client.search_books("파이썬")
+            return search, detail, again, client.stats()
+
+    search, detail, again, stats = asyncio.run(first())
+    assert search["items"][0]["link"] == "https://www.yes24.com/Product/Goods/123482631"
+    assert detail["detail"]["pages"] == "536쪽"
+    assert again == search
+    assert stats["requests"] == 2 and stats["cache_hits"] == 1
+
+    async def second():
+        # 경로가 없는 transport: 캐시에 있는 응답만 돌려줄 수 있다
+        async with AsyncYes24Client(rate_per_sec=0, cache_path=cache_path, transport=fixture_transport({})) as client:
+            return await client.search_books("파이썬"), await client.search_books("자바"), client.stats()
+
+    cached, missing, stats = asyncio.run(second())
+    assert cached == search
+    assert not missing["success"] and "404" in missing["error"]
+    assert stats["cache_hits"] == 1 and stats["requests"] == 1
+
+
+def test_rate_limit_spaces_requests():
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(time.monotonic())
+        return httpx.Response(200, content=read_fixture(SEARCH_PAGE))
+
+    async def run():
+        async with AsyncYes24Client(
+            concurrency=2, rate_per_sec=20, cache_path="", transport=httpx.MockTransport(handler)
+        ) as client:
+            return await client.search_many([f"파이썬 {i}" for i in range(8)])
+
+    results = asyncio.run(run())
+    assert all(r["success"] for r in results)
+    # burst(=concurrency) 2건 뒤로는 초당 20건: 나머지 6건은 최소 0.3초에 걸쳐 나간다
+    assert sent[-1] - sent[0] >= 6 / 20 * 0.9
@@ -0,0 +1,53 @@
+import glob
+import os
+
+import pytest
+
+from api.yes24_api import Yes24BookAPI
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "yes24")
+PAGES = sorted(glob.glob(os.path.join(FIXTURES, "*.html")))
+
+
+def parse(backend: str, path: str):
+    api = Yes24BookAPI(html_parser=backend)
+    with open(path, "rb") as f:
+        body = f.read()
+    if os.path.basename(path).startswith("detail"):
+        return api.parse_detail_page(body)
+    return api.parse_search_page(body, 20)
+
+
+@pytest.mark.parametrize("path", PAGES, ids=os.path.basename)
+def test_lxml_backend_matches_beautifulsoup(path):
+    # 로그 출력이 아니라 파싱 결과를 비교한다
+    assert parse("lxml", path) == parse("html.parser", path)
+
+
+def test_search_page_fields():
+    books = parse("lxml", os.path.join(FIXTURES, "search.html"))
+    expected = {
+        "title": "혼자 공부하는 파이썬",
+        "author": "윤인성저",
+        "price": "22,000원",
+        "cover_image": "https://image.yes24.com/sysimage/renew/gnb/blank.gif",
+        "link": "https://www.yes24.com/Product/Goods/123482631",
+        "isbn": "123482631",
+        "source": "yes24",
+    }
+    assert {key: books[0][key] for key in expected} == expected
+    assert books[1]["cover_image"] == "https://image.yes24.com/goods/117484474/XL"
+
+
+def test_items_without_a_preceding_cover_are_skipped(capsys):
+    books = parse("lxml", os.path.join(FIXTURES, "search_no_cover.html"))
+    # 첫 항목(앞에 표지 영역 없음)만 빠지고, 세 번째 항목은 앞 항목의 표지 영역과 짝지어진다
+    assert [b["isbn"] for b in books] == ["89465436", "89465437"]
+    assert "[광고] 데이터 사이언스 강의" in capsys.readouterr().out
+
+
+def test_detail_page_fields():
+    detail = parse("lxml", os.path.join(FIXTURES, "detail_no_toc.html"))
+    assert set(detail) == {"description", "publication_date"}
+    assert detail["description"].startswith("2022년 부커상 수상작.스리랑카 내전의")
+    assert "font-weight" not in detail["description"] and "주석" not in detail["description"]